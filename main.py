@@ -6,7 +6,8 @@ Roguelike игра с элементами головоломок
 """
 import sys
 import argparse
-from src.core.game import Game
+from src.core.startup import StartupProfiler
+from src.core.display import parse_resolution
 
 
 def main():
@@ -19,8 +20,22 @@ def main():
                        help="Ширина окна (по умолчанию: 1200)")
     parser.add_argument("--height", type=int, default=800,
                        help="Высота окна (по умолчанию: 800)")
+    parser.add_argument("--render-resolution", type=parse_resolution, default=None, metavar="WxH",
+                       help="Фиксированное внутреннее разрешение рендера, например 1280x720")
+    parser.add_argument("--render-scale", type=float, default=None,
+                       help="Внутреннее разрешение как доля разрешения монитора (например 0.5)")
+    parser.add_argument("--hw-scale", action="store_true",
+                       help="Масштабировать кадр средствами SDL (pygame.SCALED) вместо программного")
+    parser.add_argument("--profile-startup", action="store_true",
+                       help="Показать время импорта и инициализации подсистем")
     args = parser.parse_args()
     
+    # Профайлер запуска ставим до импорта игры, чтобы замерить импорты модулей
+    profiler = StartupProfiler(enabled=args.profile_startup)
+    profiler.install_import_hook()
+    with profiler.measure("import src.core.game"):
+        from src.core.game import Game
+    
     print("=" * 50)
     print("ПОДЗЕМЕЛЬЕ НИИЧАВО")
     print("=" * 50)
@@ -33,12 +48,25 @@ def main():
         print("🖥️  Режим: Полноэкранный")
     else:
         print(f"🪟 Режим: Оконный ({args.width}x{args.height})")
+    if args.render_resolution or args.render_scale:
+        resolution = args.render_resolution or f"{args.render_scale:g} экрана"
+        if isinstance(resolution, tuple):
+            resolution = f"{resolution[0]}x{resolution[1]}"
+        print(f"🔍 Разрешение рендера: {resolution} ({'SDL' if args.hw_scale else 'программное'} масштабирование)")
     print("💡 Подсказка: Нажмите F11 для переключения режима")
     print()
     
     try:
         # Создаём и запускаем игру
-        game = Game(width=args.width, height=args.height, fullscreen=args.fullscreen)
+        game = Game(
+            width=args.width,
+            height=args.height,
+            fullscreen=args.fullscreen,
+            profiler=profiler,
+            render_size=args.render_resolution,
+            render_scale=args.render_scale,
+            hardware_scaling=args.hw_scale
+        )
         game.run()
     except Exception as e:
         print(f"\n❌ Ошибка: {e}")
@@ -0,0 +1,212 @@
+"""
+Фоновая предзагрузка музыки биомов
+
+Поиск файла темы и декодирование MP3/WAV выполняются в фоновом потоке,
+главный поток только забирает готовые звуки в update(). Готовые темы
+хранятся в LRU-кэше с лимитом по памяти (размер декодированного PCM).
+Биом без файла тоже кэшируется (значение None - играет процедурная
+музыка), чтобы не искать файлы повторно.
+"""
+import queue
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Iterable
+import pygame
+
+
+# Соответствие локаций/биомов файлам (в порядке приоритета)
+MUSIC_FILES: Dict[str, List[str]] = {
+    # Системные темы
+    "splash": ["theme_splash.mp3", "theme_splash.wav"],           # Заставка при запуске
+    "menu": ["theme_menu.mp3", "Menu.mp3"],                       # Главное меню
+
+    # Игровые локации
+    "attic": ["theme_attic.mp3", "theme_laboratory.mp3"],        # Чердак/Лаборатория (база)
+
+    # Биомы по этажам (уровни сложности)
+    "dungeon": ["theme_dungeon.mp3", "theme_main.mp3"],          # Этажи 1-5: Старые лаборатории
+    "catacombs": ["theme_catacombs.mp3"],                         # Этажи 6-10: Архивы и хранилища
+    "caves": ["theme_caves.mp3", "theme_experimental.mp3"],      # Этажи 11-15: Экспериментальные зоны
+    "abyss": ["theme_abyss.mp3", "theme_catastrophe.mp3"],       # Этажи 16-20+: Зона катастрофы/Бездна
+}
+
+DEFAULT_MUSIC_FILES = ["theme_main.mp3", "theme_main.wav"]
+
+
+class MusicCache:
+    """Кэш музыки биомов с загрузкой в фоновом потоке"""
+
+    DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024  # 64 МБ декодированного звука
+
+    def __init__(self, music_dir: Path, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        """
+        Инициализация кэша
+
+        Args:
+            music_dir: Папка с музыкой
+            memory_limit: Лимит памяти на декодированные темы (байт)
+        """
+        self.music_dir = music_dir
+        self.memory_limit = memory_limit
+
+        # Биом -> звук (None - файла нет, процедурная музыка), порядок = LRU
+        self.sounds: "OrderedDict[str, Optional[pygame.mixer.Sound]]" = OrderedDict()
+        self.sizes: Dict[str, int] = {}
+        self.memory_used = 0
+
+        # Биомы, которые нельзя вытеснять (текущий и соседние)
+        self.pinned: Set[str] = set()
+
+        self.pending: Set[str] = set()
+        self.requests: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.results: "queue.Queue[tuple]" = queue.Queue()
+        self.worker: Optional[threading.Thread] = None
+
+    def request(self, biome: str) -> None:
+        """
+        Запросить фоновую загрузку темы (повторные запросы игнорируются)
+
+        Args:
+            biome: Биом/локация
+        """
+        if biome in self.sounds or biome in self.pending:
+            return
+
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._worker_loop, name="music-preload", daemon=True)
+            self.worker.start()
+
+        self.pending.add(biome)
+        self.requests.put(biome)
+
+    def preload(self, biomes: Iterable[str]) -> None:
+        """
+        Предзагрузить темы и закрепить их в кэше
+
+        Args:
+            biomes: Биомы (текущий и соседние)
+        """
+        self.pinned = set(biomes)
+        for biome in self.pinned:
+            self.request(biome)
+
+    def is_ready(self, biome: str) -> bool:
+        """Загружена ли тема (или выяснено, что файла нет)"""
+        return biome in self.sounds
+
+    def get(self, biome: str) -> Optional[pygame.mixer.Sound]:
+        """
+        Получить загруженную тему
+
+        Args:
+            biome: Биом/локация
+
+        Returns:
+            Звук или None (нет файла / ещё не загружен)
+        """
+        if biome not in self.sounds:
+            return None
+        self.sounds.move_to_end(biome)
+        return self.sounds[biome]
+
+    def poll(self, playing: Optional[str] = None) -> List[str]:
+        """
+        Забрать результаты фонового потока (вызывается каждый кадр)
+
+        Args:
+            playing: Играющий биом (не вытесняется)
+
+        Returns:
+            Биомы, загрузка которых завершилась
+        """
+        loaded = []
+        while True:
+            try:
+                biome, sound, filename = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            self.pending.discard(biome)
+            size = self._sound_size(sound)
+            self.sounds[biome] = sound
+            self.sizes[biome] = size
+            self.memory_used += size
+            loaded.append(biome)
+
+            if filename:
+                print(f"   🎵 Музыка загружена: {filename} ({size / 1024 / 1024:.1f} МБ)")
+
+        if loaded:
+            self._evict(playing)
+        return loaded
+
+    def _evict(self, playing: Optional[str]) -> None:
+        """
+        Вытеснить давно не использованные темы сверх лимита памяти
+
+        Args:
+            playing: Играющий биом (не вытесняется)
+        """
+        for biome in list(self.sounds):
+            if self.memory_used <= self.memory_limit:
+                break
+            if biome == playing or biome in self.pinned or not self.sizes[biome]:
+                continue
+
+            del self.sounds[biome]
+            self.memory_used -= self.sizes.pop(biome)
+            print(f"   🎵 Музыка выгружена из кэша: {biome}")
+
+    @staticmethod
+    def _sound_size(sound: Optional[pygame.mixer.Sound]) -> int:
+        """Размер декодированного звука в байтах (без копирования буфера)"""
+        if sound is None:
+            return 0
+        frequency, size, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+    def _worker_loop(self) -> None:
+        """Фоновый поток: поиск файла и декодирование темы"""
+        while True:
+            biome = self.requests.get()
+            if biome is None:
+                return
+
+            sound, loaded_file = None, None
+            for filename in MUSIC_FILES.get(biome, DEFAULT_MUSIC_FILES):
+                filepath = self.music_dir / filename
+                if not filepath.exists():
+                    continue
+                try:
+                    sound = pygame.mixer.Sound(str(filepath))
+                    loaded_file = filename
+                    break
+                except Exception as e:
+                    print(f"⚠️ Ошибка загрузки музыки {filename}: {e}")
+
+            self.results.put((biome, sound, loaded_file))
+
+    def shutdown(self) -> None:
+        """Остановить фоновый поток"""
+        if self.worker is not None:
+            self.requests.put(None)
+            self.worker = None
+
+
+if __name__ == "__main__":
+    # Тест предзагрузки: главный поток не блокируется
+    import time
+
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    cache = MusicCache(Path("assets/music"))
+    cache.preload(["attic", "dungeon", "catacombs"])
+
+    frames = 0
+    while cache.pending:
+        cache.poll()
+        frames += 1
+        time.sleep(1 / 60)
+
+    print(f"Кадров во время загрузки: {frames}, память: {cache.memory_used / 1024 / 1024:.1f} МБ")
+    cache.shutdown()
@@ -0,0 +1,332 @@
+"""
+Потоковая процедурная музыка
+
+Вместо одного длинного буфера музыка синтезируется небольшими блоками
+(по такту векторизованно) и подаётся в выделенный канал микшера через
+Channel.queue. В памяти одновременно живут только играющий и следующий
+блоки, поэтому расход памяти не зависит от длины трека.
+
+Каждая тема бесконечно варьирует свой мотив (транспозиция по ладу,
+обращение, ретроград, паузы), так что музыка не повторяется. При смене биома
+старая и новая темы плавно смешиваются (кроссфейд).
+"""
+from typing import Dict, Any, Optional
+import numpy as np
+import pygame
+
+
+# Музыкальные темы: лад (Гц), базовый мотив (индексы лада), длительность ноты (сек)
+THEMES: Dict[str, Dict[str, Any]] = {
+    "main": {
+        "notes": [262, 294, 330, 392, 440],  # C, D, E, G, A
+        "pattern": [0, 2, 4, 2, 3, 1, 0, 4, 2, 0, 3, 1, 4, 2, 0, 1],
+        "tempo": 0.5
+    },
+    "catacombs": {
+        "notes": [220, 247, 262, 294, 330],  # A, B, C, D, E (минор)
+        "pattern": [0, 1, 0, 2, 1, 0, 3, 2, 0, 1, 4, 3, 2, 1, 0, 0],
+        "tempo": 0.6
+    },
+    "flooded": {
+        "notes": [196, 220, 247, 294, 330],  # G, A, B, D, E
+        "pattern": [0, 2, 1, 3, 2, 4, 3, 1, 0, 2, 4, 3, 1, 2, 0, 1],
+        "tempo": 0.55
+    },
+    "fire": {
+        "notes": [294, 330, 349, 392, 440],  # D, E, F, G, A
+        "pattern": [0, 1, 2, 3, 4, 3, 2, 1, 0, 2, 4, 2, 3, 1, 0, 4],
+        "tempo": 0.45
+    },
+    "abyss": {
+        "notes": [174, 196, 220, 247, 262],  # F, G, A, B, C (низкие)
+        "pattern": [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 3, 2, 1, 0, 0, 0],
+        "tempo": 0.7
+    }
+}
+
+# Локации/биомы SoundManager -> музыкальная тема
+BIOME_THEMES = {
+    "splash": "main",
+    "menu": "main",
+    "attic": "main",
+    "dungeon": "main",
+    "catacombs": "catacombs",
+    "caves": "flooded",
+    "abyss": "abyss",
+}
+
+
+class ThemeGenerator:
+    """Бесконечный генератор одной темы"""
+
+    BAR_LENGTH = 4          # Нот в такте (такт синтезируется одним вызовом)
+    HARMONIC = 0.3          # Громкость второй гармоники
+    REST_CHANCE = 0.08      # Вероятность паузы вместо ноты
+    VOLUME = 0.12           # Тихая фоновая музыка
+
+    def __init__(self, theme: str, sample_rate: int, seed: Optional[int] = None):
+        """
+        Инициализация генератора
+
+        Args:
+            theme: Название темы (ключ THEMES)
+            sample_rate: Частота дискретизации
+            seed: Seed вариаций (None - каждый раз новая музыка)
+        """
+        theme_data = THEMES.get(theme, THEMES["main"])
+        self.theme = theme
+        self.sample_rate = sample_rate
+        self.notes = np.array(theme_data["notes"], dtype=np.float64)
+        self.pattern = np.array(theme_data["pattern"], dtype=np.int64)
+        self.rng = np.random.default_rng(seed)
+
+        # Длина ноты в сэмплах и огибающая ноты (атака 1/10, затухание 1/5)
+        self.note_samples = int(theme_data["tempo"] * sample_rate)
+        attack = self.note_samples // 10
+        release = self.note_samples // 5
+        self.envelope = np.concatenate([
+            np.linspace(0, 1, attack),
+            np.ones(self.note_samples - attack - release),
+            np.linspace(1, 0, release)
+        ])
+        self.note_t = np.arange(self.note_samples) / sample_rate
+
+        # Позиция в мотиве и остаток уже синтезированного такта
+        self.position = 0
+        self.buffer = np.zeros(0)
+
+    def _next_degrees(self) -> np.ndarray:
+        """
+        Следующий такт мотива с вариацией
+
+        Returns:
+            Ступени лада для нот такта (могут выходить за пределы лада -
+            это октавные переносы)
+        """
+        indices = (self.position + np.arange(self.BAR_LENGTH)) % len(self.pattern)
+        self.position = (self.position + self.BAR_LENGTH) % len(self.pattern)
+        degrees = self.pattern[indices]
+
+        variation = self.rng.integers(0, 4)
+        if variation == 1:
+            # Транспозиция по ладу
+            degrees = degrees + self.rng.integers(-2, 3)
+        elif variation == 2:
+            # Обращение относительно первой ноты
+            degrees = 2 * degrees[0] - degrees
+        elif variation == 3:
+            # Ретроград
+            degrees = degrees[::-1]
+
+        return degrees
+
+    def _render_bar(self) -> np.ndarray:
+        """
+        Синтезировать один такт
+
+        Returns:
+            Моно-сигнал такта (float)
+        """
+        degrees = self._next_degrees()
+        octave, step = np.divmod(degrees, len(self.notes))
+        freqs = self.notes[step] * (2.0 ** octave)
+
+        # Все ноты такта одной операцией: (нот, сэмплов)
+        phase = 2 * np.pi * freqs[:, None] * self.note_t[None, :]
+        bar = np.sin(phase) + np.sin(2 * phase) * self.HARMONIC
+        bar *= self.envelope
+
+        rests = self.rng.random(len(freqs)) < self.REST_CHANCE
+        bar[rests] = 0.0
+
+        return bar.reshape(-1) * self.VOLUME
+
+    def read(self, samples: int) -> np.ndarray:
+        """
+        Получить следующие сэмплы темы
+
+        Args:
+            samples: Количество сэмплов
+
+        Returns:
+            Моно-сигнал длиной samples
+        """
+        while len(self.buffer) < samples:
+            self.buffer = np.concatenate([self.buffer, self._render_bar()])
+
+        block, self.buffer = self.buffer[:samples], self.buffer[samples:]
+        return block
+
+    def render(self, duration: float) -> np.ndarray:
+        """
+        Синтезировать фрагмент заданной длины (для записи в файл)
+
+        Args:
+            duration: Длительность в секундах
+
+        Returns:
+            Массив int16 формы (samples, 2)
+        """
+        return to_stereo(self.read(int(duration * self.sample_rate)))
+
+
+def to_stereo(wave: np.ndarray) -> np.ndarray:
+    """
+    Конвертация моно float в 16-бит стерео
+
+    Args:
+        wave: Моно-сигнал в диапазоне [-1, 1]
+
+    Returns:
+        Массив int16 формы (samples, 2)
+    """
+    wave = np.int16(np.clip(wave, -1.0, 1.0) * 32767)
+    return np.column_stack((wave, wave))
+
+
+class MusicStream:
+    """Потоковое воспроизведение процедурной музыки в выделенном канале"""
+
+    BLOCK_DURATION = 0.5      # Длина блока в секундах
+    CROSSFADE_DURATION = 2.0  # Длина кроссфейда при смене биома
+
+    def __init__(self, channel: pygame.mixer.Channel, sample_rate: int):
+        """
+        Инициализация потока
+
+        Args:
+            channel: Канал микшера (зарезервированный под музыку)
+            sample_rate: Частота дискретизации микшера
+        """
+        self.channel = channel
+        self.sample_rate = sample_rate
+        self.block_samples = int(self.BLOCK_DURATION * sample_rate)
+        self.crossfade_samples = int(self.CROSSFADE_DURATION * sample_rate)
+
+        # Текущая и уходящая темы (None - тишина)
+        self.current: Optional[ThemeGenerator] = None
+        self.previous: Optional[ThemeGenerator] = None
+        self.fading = False
+        self.fade_position = 0  # Сколько сэмплов кроссфейда уже прошло
+
+        self.volume = 1.0
+        self.playing = False
+
+    def play(self, biome: str, crossfade: bool = True) -> None:
+        """
+        Начать (или сменить) тему
+
+        Args:
+            biome: Биом/локация (ключ BIOME_THEMES или название темы)
+            crossfade: Плавно смешать с текущей темой (или проявить из тишины)
+        """
+        theme = BIOME_THEMES.get(biome, biome if biome in THEMES else "main")
+
+        if self.playing and self.current is not None and self.current.theme == theme:
+            return
+
+        if not self.playing:
+            self.previous = None
+        elif self.current is not None:
+            self.previous = self.current
+        # Иначе previous - тема, которая сейчас затухает: смешиваем с ней
+
+        self.fading = crossfade
+        self.fade_position = 0
+
+        self.current = ThemeGenerator(theme, self.sample_rate)
+        self.playing = True
+        self.channel.set_volume(self.volume)
+
+        # Заполняем канал: один блок играет, второй в очереди
+        if not self.channel.get_busy():
+            self.channel.play(self._next_sound())
+        self.update()
+
+    def fade_out(self) -> None:
+        """Плавно увести текущую тему в тишину и остановиться"""
+        if not self.playing or self.current is None:
+            return
+
+        self.previous = self.current
+        self.current = None
+        self.fading = True
+        self.fade_position = 0
+
+    def stop(self) -> None:
+        """Остановить поток"""
+        self.playing = False
+        self.current = None
+        self.previous = None
+        self.fading = False
+        self.channel.stop()
+
+    def set_volume(self, volume: float) -> None:
+        """
+        Установить громкость
+
+        Args:
+            volume: Громкость (0.0 - 1.0)
+        """
+        self.volume = volume
+        self.channel.set_volume(volume)
+
+    def update(self) -> None:
+        """Досинтезировать блок, если очередь канала опустела (вызывать раз в кадр)"""
+        if not self.playing:
+            return
+
+        if self.current is None and not self.fading:
+            # Затухание закончилось - последний блок доигрывает сам
+            self.playing = False
+            return
+
+        if not self.channel.get_busy():
+            # Канал успел опустеть (долгий кадр) - перезапускаем
+            self.channel.play(self._next_sound())
+
+        if self.channel.get_queue() is None:
+            self.channel.queue(self._next_sound())
+
+    def _read(self, generator: Optional[ThemeGenerator]) -> np.ndarray:
+        """Следующий блок генератора (или тишина)"""
+        if generator is None:
+            return np.zeros(self.block_samples)
+        return generator.read(self.block_samples)
+
+    def _next_sound(self) -> pygame.mixer.Sound:
+        """
+        Синтезировать следующий блок (со смешиванием при кроссфейде)
+
+        Returns:
+            Звук для очереди канала
+        """
+        block = self._read(self.current)
+
+        if self.fading:
+            fade = (self.fade_position + np.arange(self.block_samples)) / self.crossfade_samples
+            fade = np.clip(fade, 0.0, 1.0)
+            block = block * fade + self._read(self.previous) * (1.0 - fade)
+
+            self.fade_position += self.block_samples
+            if self.fade_position >= self.crossfade_samples:
+                self.previous = None
+                self.fading = False
+
+        return pygame.sndarray.make_sound(to_stereo(block))
+
+
+if __name__ == "__main__":
+    # Тест потоковой музыки: каждая тема по 4 секунды с кроссфейдом
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    pygame.mixer.set_reserved(1)
+    stream = MusicStream(pygame.mixer.Channel(0), pygame.mixer.get_init()[0])
+
+    for theme_name in THEMES:
+        print(f"🎵 Тема: {theme_name}")
+        stream.play(theme_name)
+        for _ in range(400):
+            stream.update()
+            pygame.time.wait(10)
+
+    stream.stop()
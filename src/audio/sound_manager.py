@@ -6,15 +6,25 @@ import numpy as np
 import os
 from pathlib import Path
 from typing import Dict, Optional
+from .sound_synth import EFFECTS, load_or_synthesize
+from .music_stream import MusicStream
+from .music_cache import MusicCache
+from .voice_manager import VoiceManager
 
 
 class SoundManager:
     """Менеджер звуков"""
     
+    CROSSFADE_MS = 2000  # Длительность кроссфейда при смене биома
+    
     def __init__(self):
         """Инициализация менеджера звуков"""
         pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
         
+        # Реальная частота микшера (ключ кэша синтезированных звуков)
+        mixer_info = pygame.mixer.get_init()
+        self.sample_rate = mixer_info[0] if mixer_info else 22050
+        
         self.sounds: Dict[str, pygame.mixer.Sound] = {}
         self.music_playing = False
         self.sfx_enabled = True
@@ -30,6 +40,20 @@ class SoundManager:
         self.current_biome = None
         self.current_music = None
         
+        # Биом, чья тема ещё грузится в фоне (старая музыка пока играет)
+        self.pending_biome = None
+        
+        # Зарезервированные каналы: 0 - процедурная музыка (поток),
+        # 1 и 2 - две "деки" файловой музыки для кроссфейда
+        pygame.mixer.set_reserved(3)
+        self.music_stream = MusicStream(pygame.mixer.Channel(0), self.sample_rate)
+        self.music_decks = [pygame.mixer.Channel(1), pygame.mixer.Channel(2)]
+        self.active_deck = None  # Индекс играющей деки
+        self.music_cache = MusicCache(self.music_dir)
+        
+        # Эффекты играют в пуле каналов с приоритетами (после каналов музыки)
+        self.voices = VoiceManager(first_channel=3)
+        
         # Загружаем или генерируем звуки
         self._load_or_generate_sounds()
         
@@ -77,7 +101,7 @@ class SoundManager:
     
     def _generate_sound(self, sound_name: str) -> pygame.mixer.Sound:
         """
-        Генерация конкретного звука
+        Генерация конкретного звука (через кэш синтезированных эффектов)
         
         Args:
             sound_name: Название звука
@@ -85,224 +109,19 @@ class SoundManager:
         Returns:
             Сгенерированный звук
         """
-        generators = {
-            "step": self._generate_step_sound,
-            "chest_open": self._generate_chest_sound,
-            "pickup": self._generate_pickup_sound,
-            "damage": self._generate_damage_sound,
-            "heal": self._generate_heal_sound,
-            "discover": self._generate_discover_sound,
-            "trap": self._generate_trap_sound,
-        }
-        
-        generator = generators.get(sound_name)
-        if generator:
-            return generator()
-        else:
+        if sound_name not in EFFECTS:
             # Возвращаем пустой звук если генератор не найден
-            return pygame.mixer.Sound(buffer=np.zeros((100, 2), dtype=np.int16))
+            return pygame.sndarray.make_sound(np.zeros((100, 2), dtype=np.int16))
+        
+        return pygame.sndarray.make_sound(load_or_synthesize(sound_name, self.sample_rate))
     
     def _generate_sounds(self) -> None:
         """Генерация 8-битных звуков"""
-        # Шаги
-        self.sounds["step"] = self._generate_step_sound()
-        
-        # Открытие сундука
-        self.sounds["chest_open"] = self._generate_chest_sound()
-        
-        # Подбор предмета
-        self.sounds["pickup"] = self._generate_pickup_sound()
-        
-        # Урон
-        self.sounds["damage"] = self._generate_damage_sound()
-        
-        # Лечение
-        self.sounds["heal"] = self._generate_heal_sound()
-        
-        # Обнаружение
-        self.sounds["discover"] = self._generate_discover_sound()
-        
-        # Ловушка
-        self.sounds["trap"] = self._generate_trap_sound()
+        for sound_name in EFFECTS:
+            self.sounds[sound_name] = self._generate_sound(sound_name)
         
         print(f"   🎵 Сгенерировано звуков: {len(self.sounds)}")
     
-    def _generate_step_sound(self) -> pygame.mixer.Sound:
-        """Генерация звука шага"""
-        sample_rate = 22050
-        duration = 0.1
-        frequency = 150
-        
-        samples = int(sample_rate * duration)
-        wave = np.sin(2 * np.pi * frequency * np.linspace(0, duration, samples))
-        
-        # Затухание
-        envelope = np.linspace(1, 0, samples)
-        wave = wave * envelope * 0.3
-        
-        # Конвертация в 16-бит
-        wave = np.int16(wave * 32767)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
-    
-    def _generate_chest_sound(self) -> pygame.mixer.Sound:
-        """Генерация звука открытия сундука"""
-        sample_rate = 22050
-        duration = 0.4
-        
-        # Две ноты (открытие)
-        freq1 = 200
-        freq2 = 400
-        
-        samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, samples)
-        
-        # Первая нота
-        wave1 = np.sin(2 * np.pi * freq1 * t[:samples//2])
-        # Вторая нота
-        wave2 = np.sin(2 * np.pi * freq2 * t[samples//2:])
-        
-        wave = np.concatenate([wave1, wave2])
-        
-        # Затухание
-        envelope = np.linspace(1, 0, samples)
-        wave = wave * envelope * 0.4
-        
-        wave = np.int16(wave * 32767)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
-    
-    def _generate_pickup_sound(self) -> pygame.mixer.Sound:
-        """Генерация звука подбора предмета"""
-        sample_rate = 22050
-        duration = 0.2
-        
-        # Восходящая арпеджио
-        freqs = [400, 500, 600]
-        samples_per_note = int(sample_rate * duration / len(freqs))
-        
-        wave = np.array([])
-        for freq in freqs:
-            t = np.linspace(0, duration / len(freqs), samples_per_note)
-            note = np.sin(2 * np.pi * freq * t)
-            wave = np.concatenate([wave, note])
-        
-        # Затухание
-        envelope = np.linspace(1, 0, len(wave))
-        wave = wave * envelope * 0.3
-        
-        wave = np.int16(wave * 32767)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
-    
-    def _generate_damage_sound(self) -> pygame.mixer.Sound:
-        """Генерация звука урона"""
-        sample_rate = 22050
-        duration = 0.3
-        
-        samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, samples)
-        
-        # Нисходящий тон с шумом
-        freq_start = 400
-        freq_end = 100
-        freq = np.linspace(freq_start, freq_end, samples)
-        
-        wave = np.sin(2 * np.pi * freq * t)
-        
-        # Добавляем шум
-        noise = np.random.uniform(-0.2, 0.2, samples)
-        wave = wave * 0.7 + noise * 0.3
-        
-        # Затухание
-        envelope = np.linspace(1, 0, samples)
-        wave = wave * envelope * 0.5
-        
-        wave = np.int16(wave * 32767)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
-    
-    def _generate_heal_sound(self) -> pygame.mixer.Sound:
-        """Генерация звука лечения"""
-        sample_rate = 22050
-        duration = 0.3
-        
-        # Восходящий тон
-        samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, samples)
-        
-        freq_start = 300
-        freq_end = 600
-        freq = np.linspace(freq_start, freq_end, samples)
-        
-        wave = np.sin(2 * np.pi * freq * t)
-        
-        # Затухание
-        envelope = np.linspace(0.5, 1, samples)
-        wave = wave * envelope * 0.3
-        
-        wave = np.int16(wave * 32767)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
-    
-    def _generate_discover_sound(self) -> pygame.mixer.Sound:
-        """Генерация звука обнаружения"""
-        sample_rate = 22050
-        duration = 0.25
-        
-        # Быстрая арпеджио вверх
-        freqs = [500, 700, 900, 1100]
-        samples_per_note = int(sample_rate * duration / len(freqs))
-        
-        wave = np.array([])
-        for freq in freqs:
-            t = np.linspace(0, duration / len(freqs), samples_per_note)
-            note = np.sin(2 * np.pi * freq * t)
-            wave = np.concatenate([wave, note])
-        
-        # Затухание
-        envelope = np.linspace(1, 0, len(wave))
-        wave = wave * envelope * 0.25
-        
-        wave = np.int16(wave * 32767)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
-    
-    def _generate_trap_sound(self) -> pygame.mixer.Sound:
-        """Генерация звука ловушки"""
-        sample_rate = 22050
-        duration = 0.4
-        
-        samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, samples)
-        
-        # Резкий звук с вибрацией
-        freq = 200
-        wave = np.sin(2 * np.pi * freq * t)
-        
-        # Добавляем вибрацию
-        vibrato = np.sin(2 * np.pi * 10 * t) * 0.3
-        wave = wave * (1 + vibrato)
-        
-        # Добавляем шум
-        noise = np.random.uniform(-0.3, 0.3, samples)
-        wave = wave * 0.6 + noise * 0.4
-        
-        # Затухание
-        envelope = np.linspace(1, 0, samples)
-        wave = wave * envelope * 0.6
-        
-        wave = np.int16(wave * 32767)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
-    
     def play_sound(self, sound_name: str) -> None:
         """
         Воспроизвести звук
@@ -314,9 +133,7 @@ class SoundManager:
             return
         
         if sound_name in self.sounds:
-            sound = self.sounds[sound_name]
-            sound.set_volume(self.sfx_volume)
-            sound.play()
+            self.voices.play(sound_name, self.sounds[sound_name], self.sfx_volume)
     
     def start_music(self, biome: str = "dungeon") -> None:
         """
@@ -339,106 +156,82 @@ class SoundManager:
         if self.music_playing and self.current_biome == biome:
             return
         
-        # Останавливаем текущую музыку
-        if self.music_playing:
-            self.stop_music()
-        
-        # Загружаем или генерируем музыку для биома
-        self._load_and_play_music(biome)
         self.music_playing = True
         self.current_biome = biome
+        
+        # Тема грузится в фоне, переключимся в update() когда будет готова
+        self.music_cache.request(biome)
+        if self.music_cache.is_ready(biome):
+            self._switch_music(biome)
+        else:
+            self.pending_biome = biome
     
-    def _load_and_play_music(self, biome: str) -> None:
+    def preload_music(self, biomes) -> None:
         """
-        Загрузка и воспроизведение музыки для биома
+        Предзагрузить в фоне темы текущего и соседних биомов
         
         Args:
-            biome: Биом (attic, main, catacombs, flooded, fire, abyss)
+            biomes: Список биомов/локаций
         """
-        # Соответствие локаций/биомов файлам (приоритет mp3, fallback на wav)
-        music_files = {
-            # Системные темы
-            "splash": ["theme_splash.mp3", "theme_splash.wav"],           # Заставка при запуске
-            "menu": ["theme_menu.mp3", "Menu.mp3"],                       # Главное меню
-            
-            # Игровые локации
-            "attic": ["theme_attic.mp3", "theme_laboratory.mp3"],        # Чердак/Лаборатория (база)
-            
-            # Биомы по этажам (уровни сложности)
-            "dungeon": ["theme_dungeon.mp3", "theme_main.mp3"],          # Этажи 1-5: Старые лаборатории
-            "catacombs": ["theme_catacombs.mp3"],                         # Этажи 6-10: Архивы и хранилища
-            "caves": ["theme_caves.mp3", "theme_experimental.mp3"],      # Этажи 11-15: Экспериментальные зоны
-            "abyss": ["theme_abyss.mp3", "theme_catastrophe.mp3"],       # Этажи 16-20+: Зона катастрофы/Бездна
-        }
-        
-        # Получаем список возможных файлов для биома
-        possible_files = music_files.get(biome, ["theme_main.mp3", "theme_main.wav"])
-        
-        # Пытаемся загрузить первый существующий файл
-        for filename in possible_files:
-            filepath = self.music_dir / filename
-            
-            if filepath.exists():
-                try:
-                    # Используем pygame.mixer.music для фоновой музыки
-                    pygame.mixer.music.load(str(filepath))
-                    pygame.mixer.music.set_volume(self.music_volume)
-                    pygame.mixer.music.play(loops=-1)  # Бесконечный цикл
-                    print(f"   🎵 Музыка: {filename}")
-                    return
-                except Exception as e:
-                    print(f"⚠️ Ошибка загрузки музыки {filename}: {e}")
-                    continue  # Пробуем следующий файл
-        
-        # Если не удалось загрузить - генерируем
-        print(f"   🎵 Генерация музыки для биома: {biome}")
-        self._generate_and_play_music()
+        self.music_cache.preload(biomes)
     
-    def _generate_and_play_music(self) -> None:
-        """Генерация и воспроизведение фоновой музыки"""
-        sample_rate = 22050
-        duration = 8.0  # 8 секунд, будет зацикливаться
-        
-        samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, samples)
-        
-        # Простая мелодия (пентатоника)
-        notes = [262, 294, 330, 392, 440]  # C, D, E, G, A
-        pattern = [0, 2, 4, 2, 3, 1, 0, 4]  # Паттерн нот
+    def _switch_music(self, biome: str) -> None:
+        """
+        Переключить музыку на загруженную тему с кроссфейдом
         
-        wave = np.zeros(samples)
-        note_duration = duration / len(pattern)
+        Args:
+            biome: Биом (тема уже в кэше)
+        """
+        self.pending_biome = None
+        sound = self.music_cache.get(biome)
+        
+        # Уводим текущую файловую музыку
+        if self.active_deck is not None:
+            self.music_decks[self.active_deck].fadeout(self.CROSSFADE_MS)
+        
+        if sound is None:
+            # Файла нет - процедурная музыка потоком
+            print(f"   🎵 Генерация музыки для биома: {biome}")
+            self.active_deck = None
+            self.music_stream.set_volume(self.music_volume)
+            self.music_stream.play(biome)
+            return
         
-        for i, note_idx in enumerate(pattern):
-            start = int(i * note_duration * sample_rate)
-            end = int((i + 1) * note_duration * sample_rate)
-            
-            freq = notes[note_idx]
-            note_t = t[start:end] - t[start]
-            note_wave = np.sin(2 * np.pi * freq * note_t)
-            
-            # Огибающая для каждой ноты
-            envelope = np.concatenate([
-                np.linspace(0, 1, len(note_wave) // 10),
-                np.ones(len(note_wave) - len(note_wave) // 10 - len(note_wave) // 5),
-                np.linspace(1, 0, len(note_wave) // 5)
-            ])
-            
-            wave[start:end] = note_wave * envelope
+        self.music_stream.fade_out()
+        self.active_deck = 1 if self.active_deck == 0 else 0
+        deck = self.music_decks[self.active_deck]
+        deck.set_volume(self.music_volume)
+        deck.play(sound, loops=-1, fade_ms=self.CROSSFADE_MS)
+    
+    def update(self) -> None:
+        """Начать новый кадр звука: слияние эффектов, подкачка и смена музыки (каждый кадр)"""
+        self.voices.begin_frame()
         
-        # Нормализация
-        wave = wave * 0.15  # Тихая фоновая музыка
+        self.music_cache.poll(self.current_biome)
+        if self.pending_biome and self.music_cache.is_ready(self.pending_biome):
+            self._switch_music(self.pending_biome)
         
-        wave = np.int16(wave * 32767)
-        stereo_wave = np.column_stack((wave, wave))
+        self.music_stream.update()
+    
+    def set_music_volume(self, volume: float) -> None:
+        """
+        Установить громкость музыки
         
-        music = pygame.sndarray.make_sound(stereo_wave)
-        music.set_volume(self.music_volume)
-        music.play(loops=-1)  # Бесконечный цикл
+        Args:
+            volume: Громкость (0.0 - 1.0)
+        """
+        self.music_volume = volume
+        self.music_stream.set_volume(volume)
+        if self.active_deck is not None:
+            self.music_decks[self.active_deck].set_volume(volume)
     
     def stop_music(self) -> None:
         """Остановить музыку"""
-        pygame.mixer.music.stop()
+        for deck in self.music_decks:
+            deck.stop()
+        self.active_deck = None
+        self.pending_biome = None
+        self.music_stream.stop()
         self.music_playing = False
         self.current_biome = None
     
@@ -0,0 +1,211 @@
+"""
+Процедурный синтез звуковых эффектов с кэшем на диске
+
+Каждый эффект описан набором параметров (EFFECTS). Готовый буфер
+int16 стерео сохраняется в пользовательский кэш как .npy, имя файла
+содержит хэш параметров и частоты дискретизации. При следующих
+запусках эффект загружается одним чтением вместо синтеза.
+
+Используется и игрой (SoundManager), и скриптом generate_sounds.py.
+"""
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional
+import numpy as np
+from ..core.cache import get_cache_root
+
+
+# Версия алгоритма синтеза (меняется при изменении _render - сбрасывает кэш)
+SYNTH_VERSION = 1
+
+# Частота дискретизации по умолчанию (как у pygame.mixer.init в SoundManager)
+DEFAULT_SAMPLE_RATE = 22050
+
+# Параметры звуковых эффектов
+#   mode: tone - одна нота, sweep - глиссандо, split - две половины
+#         на общей оси времени, arpeggio - ноты подряд
+#   envelope: громкость в начале и в конце (линейно)
+#   vibrato: (частота, глубина), noise: (амплитуда, доля в миксе)
+EFFECTS: Dict[str, Dict[str, Any]] = {
+    "step": {
+        "mode": "tone", "duration": 0.1, "freqs": [150],
+        "envelope": [1.0, 0.0], "gain": 0.3
+    },
+    "chest_open": {
+        "mode": "split", "duration": 0.4, "freqs": [200, 400],
+        "envelope": [1.0, 0.0], "gain": 0.4
+    },
+    "pickup": {
+        "mode": "arpeggio", "duration": 0.2, "freqs": [400, 500, 600],
+        "envelope": [1.0, 0.0], "gain": 0.3
+    },
+    "damage": {
+        "mode": "sweep", "duration": 0.3, "freqs": [400, 100],
+        "noise": [0.2, 0.3], "seed": 1,
+        "envelope": [1.0, 0.0], "gain": 0.5
+    },
+    "heal": {
+        "mode": "sweep", "duration": 0.3, "freqs": [300, 600],
+        "envelope": [0.5, 1.0], "gain": 0.3
+    },
+    "discover": {
+        "mode": "arpeggio", "duration": 0.25, "freqs": [500, 700, 900, 1100],
+        "envelope": [1.0, 0.0], "gain": 0.25
+    },
+    "trap": {
+        "mode": "tone", "duration": 0.4, "freqs": [200],
+        "vibrato": [10, 0.3], "noise": [0.3, 0.4], "seed": 2,
+        "envelope": [1.0, 0.0], "gain": 0.6
+    },
+}
+
+
+def get_cache_dir() -> Path:
+    """
+    Папка кэша синтезированных звуков
+
+    Returns:
+        Путь к папке кэша звуков
+    """
+    return get_cache_root() / "sounds"
+
+
+def effect_key(name: str, sample_rate: int) -> str:
+    """
+    Ключ кэша эффекта (хэш параметров, частоты и версии синтеза)
+
+    Args:
+        name: Название эффекта
+        sample_rate: Частота дискретизации
+
+    Returns:
+        Шестнадцатеричный хэш
+    """
+    payload = json.dumps(
+        {"name": name, "params": EFFECTS[name], "sample_rate": sample_rate, "version": SYNTH_VERSION},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def synthesize(name: str, sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """
+    Синтезировать эффект без кэша
+
+    Args:
+        name: Название эффекта (ключ EFFECTS)
+        sample_rate: Частота дискретизации
+
+    Returns:
+        Массив int16 формы (samples, 2)
+    """
+    params = EFFECTS[name]
+    duration = params["duration"]
+    freqs = params["freqs"]
+    mode = params["mode"]
+
+    if mode == "arpeggio":
+        # Каждая нота со своей осью времени
+        samples_per_note = int(sample_rate * duration / len(freqs))
+        note_t = np.linspace(0, duration / len(freqs), samples_per_note)
+        wave = np.concatenate([np.sin(2 * np.pi * freq * note_t) for freq in freqs])
+        t = np.linspace(0, duration, len(wave))
+    else:
+        samples = int(sample_rate * duration)
+        t = np.linspace(0, duration, samples)
+
+        if mode == "sweep":
+            freq = np.linspace(freqs[0], freqs[1], samples)
+            wave = np.sin(2 * np.pi * freq * t)
+        elif mode == "split":
+            half = samples // 2
+            wave = np.concatenate([
+                np.sin(2 * np.pi * freqs[0] * t[:half]),
+                np.sin(2 * np.pi * freqs[1] * t[half:])
+            ])
+        else:
+            wave = np.sin(2 * np.pi * freqs[0] * t)
+
+    # Вибрация
+    if "vibrato" in params:
+        rate, depth = params["vibrato"]
+        wave = wave * (1 + np.sin(2 * np.pi * rate * t) * depth)
+
+    # Шум (детерминированный, чтобы кэш совпадал с синтезом)
+    if "noise" in params:
+        amplitude, mix = params["noise"]
+        rng = np.random.default_rng(params.get("seed", 0))
+        noise = rng.uniform(-amplitude, amplitude, len(wave))
+        wave = wave * (1 - mix) + noise * mix
+
+    # Затухание и громкость
+    envelope = np.linspace(params["envelope"][0], params["envelope"][1], len(wave))
+    wave = wave * envelope * params["gain"]
+
+    # Конвертация в 16-бит стерео
+    wave = np.int16(wave * 32767)
+    return np.column_stack((wave, wave))
+
+
+def load_or_synthesize(
+    name: str,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    cache_dir: Optional[Path] = None
+) -> np.ndarray:
+    """
+    Получить эффект из кэша или синтезировать и положить в кэш
+
+    Args:
+        name: Название эффекта
+        sample_rate: Частота дискретизации
+        cache_dir: Папка кэша (по умолчанию get_cache_dir())
+
+    Returns:
+        Массив int16 формы (samples, 2)
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    cache_file = cache_dir / f"{name}-{effect_key(name, sample_rate)}.npy"
+
+    try:
+        return np.load(cache_file, allow_pickle=False)
+    except (OSError, ValueError):
+        pass
+
+    samples = synthesize(name, sample_rate)
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(tmp_file, 'wb') as f:
+            np.save(f, samples, allow_pickle=False)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"⚠️ Не удалось записать кэш звука {name}: {e}")
+
+    return samples
+
+
+def warm_cache(sample_rate: int = DEFAULT_SAMPLE_RATE, cache_dir: Optional[Path] = None) -> int:
+    """
+    Заполнить кэш всеми эффектами
+
+    Args:
+        sample_rate: Частота дискретизации
+        cache_dir: Папка кэша
+
+    Returns:
+        Количество эффектов в кэше
+    """
+    for name in EFFECTS:
+        load_or_synthesize(name, sample_rate, cache_dir)
+    return len(EFFECTS)
+
+
+if __name__ == "__main__":
+    # Прогрев кэша: python -m src.audio.sound_synth [частота]
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SAMPLE_RATE
+    count = warm_cache(rate)
+    print(f"✅ Кэш звуков прогрет: {count} эффектов ({rate} Гц) в {get_cache_dir()}")
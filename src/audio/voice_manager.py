@@ -0,0 +1,188 @@
+"""
+Менеджер голосов (каналов) для звуковых эффектов
+
+Эффекты играют только в фиксированном пуле каналов микшера. У каждого
+звука есть приоритет и лимит одновременных голосов:
+- одинаковые звуки, запрошенные в одном кадре, сливаются в один;
+- если лимит звука исчерпан, новый голос отбрасывается;
+- если пул занят, голос вытесняет самый старый голос с меньшим
+  приоритетом, а если таких нет - отбрасывается.
+
+Счётчики (played, coalesced, dropped_limit, dropped_busy, stolen)
+нужны для настройки пула под тяжёлые бои.
+"""
+from typing import Dict, Any, List, Optional, Set
+import pygame
+
+
+# Параметры голосов: приоритет (больше - важнее) и лимит одновременных голосов
+VOICE_SETTINGS: Dict[str, Dict[str, int]] = {
+    "step": {"priority": 0, "max_voices": 1},
+    "pickup": {"priority": 2, "max_voices": 2},
+    "page_turn": {"priority": 2, "max_voices": 1},
+    "chest_open": {"priority": 2, "max_voices": 1},
+    "discover": {"priority": 1, "max_voices": 2},
+    "heal": {"priority": 2, "max_voices": 1},
+    "damage": {"priority": 3, "max_voices": 2},
+    "trap": {"priority": 3, "max_voices": 1},
+}
+
+DEFAULT_VOICE = {"priority": 1, "max_voices": 2}
+
+
+class VoiceManager:
+    """Пул каналов для звуковых эффектов"""
+
+    POOL_SIZE = 6
+
+    def __init__(self, first_channel: int = 0, pool_size: int = POOL_SIZE):
+        """
+        Инициализация пула
+
+        Args:
+            first_channel: Первый канал пула (каналы до него зарезервированы)
+            pool_size: Количество каналов в пуле
+        """
+        pygame.mixer.set_num_channels(first_channel + pool_size)
+        self.channels: List[pygame.mixer.Channel] = [
+            pygame.mixer.Channel(index) for index in range(first_channel, first_channel + pool_size)
+        ]
+
+        # Слот пула -> (название звука, приоритет, номер запуска) или None
+        self.voices: List[Optional[tuple]] = [None] * pool_size
+        self.play_counter = 0
+
+        # Звуки, уже запущенные в текущем кадре
+        self.frame_requests: Set[str] = set()
+
+        self.stats: Dict[str, int] = {
+            "played": 0,
+            "coalesced": 0,
+            "dropped_limit": 0,
+            "dropped_busy": 0,
+            "stolen": 0,
+        }
+
+    def begin_frame(self) -> None:
+        """Начало кадра: сброс слияния одинаковых запросов"""
+        self.frame_requests.clear()
+
+    def play(self, name: str, sound: pygame.mixer.Sound, volume: float) -> bool:
+        """
+        Запросить воспроизведение звука
+
+        Args:
+            name: Название звука
+            sound: Звук
+            volume: Громкость (0.0 - 1.0)
+
+        Returns:
+            True если звук запущен (или слит с уже запущенным в этом кадре)
+        """
+        if name in self.frame_requests:
+            self.stats["coalesced"] += 1
+            return True
+
+        settings = VOICE_SETTINGS.get(name, DEFAULT_VOICE)
+        priority = settings["priority"]
+
+        # Освобождаем слоты отзвучавших голосов
+        free_slot = None
+        same_sound = 0
+        for slot, channel in enumerate(self.channels):
+            voice = self.voices[slot]
+            if voice is not None and not channel.get_busy():
+                self.voices[slot] = voice = None
+
+            if voice is None:
+                if free_slot is None:
+                    free_slot = slot
+            elif voice[0] == name:
+                same_sound += 1
+
+        if same_sound >= settings["max_voices"]:
+            self.stats["dropped_limit"] += 1
+            return False
+
+        if free_slot is None:
+            free_slot = self._find_victim(priority)
+            if free_slot is None:
+                self.stats["dropped_busy"] += 1
+                return False
+            self.channels[free_slot].stop()
+            self.stats["stolen"] += 1
+
+        channel = self.channels[free_slot]
+        channel.set_volume(volume)
+        channel.play(sound)
+
+        self.play_counter += 1
+        self.voices[free_slot] = (name, priority, self.play_counter)
+        self.frame_requests.add(name)
+        self.stats["played"] += 1
+        return True
+
+    def _find_victim(self, priority: int) -> Optional[int]:
+        """
+        Найти голос для вытеснения: самый старый среди наименее приоритетных
+
+        Args:
+            priority: Приоритет нового звука
+
+        Returns:
+            Номер слота или None если вытеснять нечего
+        """
+        victim = None
+        victim_key = None
+        for slot, voice in enumerate(self.voices):
+            _, voice_priority, started = voice
+            if voice_priority >= priority:
+                continue
+            key = (voice_priority, started)
+            if victim_key is None or key < victim_key:
+                victim, victim_key = slot, key
+        return victim
+
+    def stop_all(self) -> None:
+        """Остановить все голоса пула"""
+        for channel in self.channels:
+            channel.stop()
+        self.voices = [None] * len(self.channels)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Получить счётчики голосов
+
+        Returns:
+            Счётчики и текущее число занятых каналов
+        """
+        stats = dict(self.stats)
+        stats["active"] = sum(1 for channel in self.channels if channel.get_busy())
+        stats["pool_size"] = len(self.channels)
+        return stats
+
+    def report(self) -> None:
+        """Напечатать счётчики голосов"""
+        stats = self.get_stats()
+        dropped = stats["dropped_limit"] + stats["dropped_busy"]
+        print(
+            f"🔊 Голоса: сыграно {stats['played']}, слито {stats['coalesced']}, "
+            f"отброшено {dropped} (лимит {stats['dropped_limit']}, пул занят {stats['dropped_busy']}), "
+            f"вытеснено {stats['stolen']}"
+        )
+
+
+if __name__ == "__main__":
+    # Тест пула: шквал звуков в одном кадре
+    import numpy as np
+
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    tone = pygame.sndarray.make_sound(np.zeros((22050, 2), dtype=np.int16))
+    manager = VoiceManager(pool_size=3)
+
+    for frame in range(5):
+        manager.begin_frame()
+        for name in ["step", "step", "discover", "discover", "damage", "trap", "pickup"]:
+            manager.play(name, tone, 0.5)
+
+    manager.report()
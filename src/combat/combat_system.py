@@ -4,6 +4,7 @@
 import pygame
 import random
 from typing import Optional
+from ..graphics.text_cache import render_text
 
 
 class CombatSystem:
@@ -181,8 +182,6 @@ class CombatSystem:
             camera_x: Смещение камеры X
             camera_y: Смещение камеры Y
         """
-        font = pygame.font.Font(None, 32)
-        
         for x, y, damage, timer, is_player in self.damage_numbers:
             # Вычисляем позицию на экране
             screen_x = x * 32 - camera_x + 16
@@ -194,8 +193,8 @@ class CombatSystem:
             # Прозрачность
             alpha = int(255 * timer)
             
-            # Рендерим текст
-            text = font.render(f"-{damage}", True, color)
+            # Текст из общего кэша; копия - чтобы не менять прозрачность общей поверхности
+            text = render_text(f"-{damage}", 32, color).copy()
             text.set_alpha(alpha)
             screen.blit(text, (screen_x, screen_y))
 
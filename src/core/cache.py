@@ -0,0 +1,33 @@
+"""
+Пользовательская папка кэша игры
+
+Здесь лежат производные данные, которые можно пересоздать в любой
+момент: синтезированные звуки, запечённый атлас спрайтов и т.п.
+"""
+import os
+import sys
+from pathlib import Path
+
+
+def get_cache_root() -> Path:
+    """
+    Корневая папка кэша игры
+
+    NIICHAVO_CACHE_DIR переопределяет расположение, иначе используется
+    стандартная пользовательская папка кэша ОС.
+
+    Returns:
+        Путь к корню кэша
+    """
+    override = os.environ.get("NIICHAVO_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        return Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / "niichavo-dungeon" / "cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "niichavo-dungeon"
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "niichavo-dungeon"
+
+
+if __name__ == "__main__":
+    print(f"📁 Кэш игры: {get_cache_root()}")
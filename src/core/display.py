@@ -0,0 +1,221 @@
+"""
+Окно игры и масштабирование кадра
+
+Режимы:
+- нативный (render_size=None): игра рисует прямо в окно, размер кадра
+  равен размеру окна/монитора (как раньше);
+- фиксированное внутреннее разрешение: мир и UI рисуются в логическую
+  поверхность render_size, а при выводе кадр масштабируется в окно
+  с сохранением пропорций (чёрные полосы по краям). Стоимость кадра
+  не зависит от разрешения монитора.
+
+Масштабирование делается либо программно (pygame.transform.scale в
+подповерхность окна), либо средствами SDL (флаг pygame.SCALED -
+аппаратное масштабирование, полосы и пересчёт мыши делает SDL).
+"""
+from typing import List, Optional, Tuple
+import pygame
+
+
+# События с координатами мыши, которые нужно пересчитывать в логические
+MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+class Display:
+    """Окно игры с опциональным фиксированным разрешением рендера"""
+
+    def __init__(
+        self,
+        windowed_size: Tuple[int, int],
+        render_size: Optional[Tuple[int, int]] = None,
+        render_scale: Optional[float] = None,
+        hardware_scaling: bool = False
+    ):
+        """
+        Инициализация (окно создаётся в set_mode)
+
+        Args:
+            windowed_size: Размер окна в оконном режиме
+            render_size: Внутреннее разрешение рендера (None - нативное)
+            render_scale: Доля разрешения рабочего стола (если render_size не задан)
+            hardware_scaling: Масштабировать средствами SDL (pygame.SCALED)
+        """
+        # Размер рабочего стола (до создания окна)
+        display_info = pygame.display.Info()
+        self.desktop_size = (display_info.current_w, display_info.current_h)
+
+        if render_size is None and render_scale:
+            render_size = (
+                max(1, int(self.desktop_size[0] * render_scale)),
+                max(1, int(self.desktop_size[1] * render_scale))
+            )
+
+        self.windowed_size = windowed_size
+        self.render_size = render_size
+        self.hardware_scaling = hardware_scaling and render_size is not None
+
+        self.window: Optional[pygame.Surface] = None
+        self.surface: Optional[pygame.Surface] = None  # Сюда рисует игра
+
+        # Область окна, куда выводится кадр (без полос), и её подповерхность
+        self.viewport = pygame.Rect(0, 0, 0, 0)
+        self._viewport_surface: Optional[pygame.Surface] = None
+        self._window_size = (0, 0)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Логический размер кадра"""
+        return self.surface.get_size()
+
+    @property
+    def is_scaled(self) -> bool:
+        """Масштабируется ли кадр программно"""
+        return self.surface is not self.window
+
+    def set_mode(self, fullscreen: bool) -> pygame.Surface:
+        """
+        Создать (пересоздать) окно
+
+        Args:
+            fullscreen: Полноэкранный режим
+
+        Returns:
+            Поверхность, в которую рисует игра
+        """
+        mode_flag = pygame.FULLSCREEN if fullscreen else pygame.RESIZABLE
+
+        if self.render_size is None:
+            size = self.desktop_size if fullscreen else self.windowed_size
+            self.window = pygame.display.set_mode(size, mode_flag)
+            self.surface = self.window
+        elif self.hardware_scaling:
+            # SDL сам растягивает кадр, рисует полосы и пересчитывает мышь
+            self.window = pygame.display.set_mode(self.render_size, mode_flag | pygame.SCALED)
+            self.surface = self.window
+        else:
+            size = self.desktop_size if fullscreen else self.windowed_size
+            self.window = pygame.display.set_mode(size, mode_flag)
+            if self.surface is None or self.surface is self.window:
+                self.surface = pygame.Surface(self.render_size).convert()
+
+        self._update_viewport()
+        return self.surface
+
+    def _update_viewport(self) -> None:
+        """Пересчитать область вывода с сохранением пропорций"""
+        window_w, window_h = self._window_size = self.window.get_size()
+
+        if not self.is_scaled:
+            self.viewport = pygame.Rect(0, 0, window_w, window_h)
+            self._viewport_surface = None
+            return
+
+        render_w, render_h = self.render_size
+        scale = min(window_w / render_w, window_h / render_h)
+        width, height = max(1, int(render_w * scale)), max(1, int(render_h * scale))
+
+        self.viewport = pygame.Rect((window_w - width) // 2, (window_h - height) // 2, width, height)
+        self._viewport_surface = self.window.subsurface(self.viewport)
+
+        # Полосы по краям рисуем один раз - кадр их не перекрывает
+        self.window.fill((0, 0, 0))
+
+    def present(self, rects: Optional[List[pygame.Rect]] = None) -> None:
+        """
+        Вывести кадр на экран (масштабирование + flip)
+
+        Args:
+            rects: Изменившиеся области (None - весь кадр); при программном
+                масштабировании кадр всегда выводится целиком
+        """
+        if self.is_scaled:
+            if self.window.get_size() != self._window_size:
+                # Окно изменило размер
+                self.window = pygame.display.get_surface()
+                self._update_viewport()
+            pygame.transform.scale(self.surface, self.viewport.size, self._viewport_surface)
+            rects = None
+
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def to_logical(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Пересчитать координаты окна в координаты кадра
+
+        Args:
+            pos: Позиция в окне
+
+        Returns:
+            Позиция в логическом кадре (ограничена его границами)
+        """
+        if not self.is_scaled:
+            return pos
+
+        render_w, render_h = self.render_size
+        x = (pos[0] - self.viewport.x) * render_w // self.viewport.width
+        y = (pos[1] - self.viewport.y) * render_h // self.viewport.height
+        return (min(max(x, 0), render_w - 1), min(max(y, 0), render_h - 1))
+
+    def remap_event(self, event: pygame.event.Event) -> pygame.event.Event:
+        """
+        Пересчитать координаты мыши в событии
+
+        Args:
+            event: Событие pygame
+
+        Returns:
+            Событие с логическими координатами (или исходное)
+        """
+        if not self.is_scaled or event.type not in MOUSE_EVENTS:
+            return event
+
+        attributes = dict(event.dict)
+        attributes["pos"] = self.to_logical(event.pos)
+        if "rel" in attributes:
+            render_w, render_h = self.render_size
+            attributes["rel"] = (
+                event.rel[0] * render_w // self.viewport.width,
+                event.rel[1] * render_h // self.viewport.height
+            )
+        return pygame.event.Event(event.type, attributes)
+
+
+def parse_resolution(value: str) -> Tuple[int, int]:
+    """
+    Разобрать разрешение вида 1280x720
+
+    Args:
+        value: Строка разрешения
+
+    Returns:
+        (ширина, высота)
+    """
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    # Тест: кадр 320x180 растягивается в окно 960x600 с полосами
+    pygame.init()
+    display = Display((960, 600), render_size=(320, 180))
+    screen = display.set_mode(fullscreen=False)
+    print(f"Кадр: {display.size}, область вывода: {display.viewport}")
+
+    running = True
+    cursor = (0, 0)
+    while running:
+        for event in pygame.event.get():
+            event = display.remap_event(event)
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEMOTION:
+                cursor = event.pos
+
+        screen.fill((30, 30, 50))
+        pygame.draw.circle(screen, (255, 200, 0), cursor, 4)
+        display.present()
+
+    pygame.quit()
@@ -0,0 +1,133 @@
+"""
+Шина игровых событий
+
+Проверки, которые имеют смысл только после того, как что-то произошло
+(игрок сделал шаг, выбросил предмет, вошёл на этаж), подписываются на
+события вместо опроса в каждом кадре. Пока игрок стоит, ни один
+обработчик не вызывается.
+
+Доставка синхронная: publish вызывает обработчики сразу, в порядке
+подписки. Подписка идёт на конкретный тип события (точное совпадение
+класса), поэтому публикация - один поиск в словаре и цикл по списку.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+
+class GameEvent:
+    """Базовый класс игровых событий"""
+
+
+@dataclass
+class PlayerMoved(GameEvent):
+    """Игрок перешёл на новую клетку"""
+    x: int
+    y: int
+    running: bool = False
+    level: Any = None   # Уровень, на котором сделан шаг (None - чердак)
+
+
+@dataclass
+class ItemDropped(GameEvent):
+    """Игрок выбросил предмет из инвентаря"""
+    item: Any
+    quantity: int = 1
+
+
+@dataclass
+class TrapTriggered(GameEvent):
+    """Сработала ловушка"""
+    trap: Any
+    effect: dict
+
+
+@dataclass
+class FloorEntered(GameEvent):
+    """Игрок оказался в локации (этаж подземелья или чердак)"""
+    location: Any   # Номер этажа или "attic"
+    floor: int      # 0 - чердак
+
+
+@dataclass
+class FloorStabilized(GameEvent):
+    """Этаж стабилизирован руной"""
+    floor: int
+
+
+Handler = Callable[[GameEvent], None]
+
+
+class EventBus:
+    """Синхронная шина событий с подпиской по типу"""
+
+    def __init__(self):
+        """Инициализация шины"""
+        self.handlers: Dict[Type[GameEvent], List[Handler]] = defaultdict(list)
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    def subscribe(self, event_type: Type[GameEvent], handler: Handler) -> None:
+        """
+        Подписаться на события типа
+
+        Args:
+            event_type: Класс события
+            handler: Функция, получающая событие
+        """
+        self.handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: Type[GameEvent], handler: Handler) -> None:
+        """
+        Отписаться от событий типа
+
+        Args:
+            event_type: Класс события
+            handler: Ранее подписанная функция
+        """
+        handlers = self.handlers.get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, event: GameEvent) -> None:
+        """
+        Доставить событие всем подписчикам его типа
+
+        Args:
+            event: Событие
+        """
+        self.stats[type(event).__name__] += 1
+        handlers = self.handlers.get(type(event))
+        if handlers:
+            # Копия: обработчик может подписать/отписать кого-то во время доставки
+            for handler in tuple(handlers):
+                handler(event)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Сколько событий каждого типа опубликовано"""
+        return dict(self.stats)
+
+    def report(self) -> None:
+        """Напечатать статистику событий"""
+        if not self.stats:
+            return
+        counts = ", ".join(f"{name} {count}" for name, count in sorted(self.stats.items()))
+        print(f"📨 События: {counts}")
+
+
+if __name__ == "__main__":
+    # Тест: подписка по типу, синхронная доставка
+    import time
+
+    bus = EventBus()
+    steps: List[Tuple[int, int]] = []
+    bus.subscribe(PlayerMoved, lambda event: steps.append((event.x, event.y)))
+    bus.subscribe(FloorEntered, lambda event: print(f"Вход: {event.location}"))
+
+    bus.publish(FloorEntered(1, 1))
+    start = time.perf_counter()
+    for i in range(100000):
+        bus.publish(PlayerMoved(i, 0))
+    elapsed = (time.perf_counter() - start) * 1e6 / 100000
+
+    print(f"Доставлено шагов: {len(steps)}, {elapsed:.2f} мкс на событие")
+    bus.report()
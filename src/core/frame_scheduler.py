@@ -0,0 +1,107 @@
+"""
+Планировщик кадров с переходом в режим простоя
+
+Пока на экране что-то происходит (ввод, частицы, враги, гаснущие
+сообщения), цикл идёт с полной частотой. Если активности нет дольше
+IDLE_DELAY, цикл не крутит кадры впустую: он блокируется в
+pygame.event.wait с таймаутом (1 / idle_fps) и просыпается сразу при
+любом событии. Первый же активный кадр возвращает полную частоту.
+"""
+import time
+import pygame
+
+
+class FrameScheduler:
+    """Частота кадров с учётом простоя"""
+
+    IDLE_DELAY = 0.5  # Секунд без активности до перехода в простой
+
+    def __init__(self, fps: int = 60, idle_fps: int = 10):
+        """
+        Инициализация
+
+        Args:
+            fps: Частота кадров при активности
+            idle_fps: Частота кадров в простое (таймер музыки, мигающий курсор)
+        """
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.clock = pygame.time.Clock()
+
+        self.last_active = time.perf_counter()
+        self.idle = False
+
+        self.stats = {"active": 0, "idle": 0, "woken": 0}
+
+    def tick(self, active: bool) -> float:
+        """
+        Дождаться следующего кадра
+
+        Args:
+            active: Было ли в прошлом кадре что-то, требующее полной частоты
+
+        Returns:
+            Delta time в секундах (реальное время с прошлого кадра)
+        """
+        now = time.perf_counter()
+        if active:
+            self.last_active = now
+
+        self.idle = now - self.last_active >= self.IDLE_DELAY
+        if not self.idle:
+            self.stats["active"] += 1
+            return self.clock.tick(self.fps) / 1000.0
+
+        self.stats["idle"] += 1
+
+        # Спим до события или таймаута; событие возвращаем в очередь для обработки
+        # (вернётся ли полная частота, решит вызывающий по итогам этого кадра)
+        event = pygame.event.wait(1000 // self.idle_fps)
+        if event.type != pygame.NOEVENT:
+            # Остальные события перекладываем вслед, чтобы не нарушить порядок (KEYDOWN до KEYUP)
+            for pending in [event] + pygame.event.get():
+                pygame.event.post(pending)
+            self.stats["woken"] += 1
+
+        return self.clock.tick() / 1000.0
+
+    def get_fps(self) -> float:
+        """Текущая частота (для отладки)"""
+        return self.clock.get_fps()
+
+    def report(self) -> None:
+        """Напечатать статистику кадров"""
+        total = self.stats["active"] + self.stats["idle"]
+        share = self.stats["idle"] / total if total else 0.0
+        print(
+            f"💤 Кадры: активных {self.stats['active']}, в простое {self.stats['idle']} ({share:.0%}), "
+            f"пробуждений по событию {self.stats['woken']}"
+        )
+
+
+if __name__ == "__main__":
+    # Тест: 1 секунда активности, затем 2 секунды простоя с одним событием посередине
+    pygame.init()
+    pygame.display.set_mode((200, 100))
+    scheduler = FrameScheduler()
+
+    start = time.perf_counter()
+    posted = False
+    events = 0
+    while time.perf_counter() - start < 3.0:
+        # Очередь разбираем, как игровой цикл: иначе wait возвращал бы то же событие снова
+        events += sum(1 for event in pygame.event.get() if event.type == pygame.USEREVENT)
+        if not posted and time.perf_counter() - start >= 2.0:
+            pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+            posted = True
+        scheduler.tick(active=time.perf_counter() - start < 1.0)
+
+    scheduler.report()
+
+    # Простой: ~ (2 с - IDLE_DELAY) * idle_fps кадров, пробуждение - только от нашего события
+    expected = (2.0 - FrameScheduler.IDLE_DELAY) * scheduler.idle_fps
+    assert expected * 0.7 <= scheduler.stats["idle"] <= expected * 1.3 + 2, scheduler.stats
+    assert scheduler.stats["woken"] == 1, scheduler.stats
+    assert events == 1, events
+    print("✅ Простой блокирует цикл, пробуждения считаются только по событиям")
+    pygame.quit()
@@ -3,29 +3,75 @@
 """
 import pygame
 import os
-from typing import Optional
+from typing import Optional, Tuple
 from ..entities.player import Player
-from ..world.level import Level
-from ..world.level_generator import LevelGenerator
-from ..world.attic import Attic
 from ..input.input_manager import InputManager
 from ..save.save_manager import SaveManager, GameStateSerializer
 from ..ui.inventory_ui import InventoryUI
 from ..ui.storage_ui import StorageUI
 from ..ui.riddle_ui import RiddleUI
 from ..ui.message_log import MessageLog
-from ..ui.main_menu import MainMenu
 from ..combat.combat_system import CombatSystem
-from ..graphics.sprite_manager import SpriteManager
 from ..graphics.particle_system import ParticleSystem
-from ..story.story_manager import StoryManager
+from ..graphics.text_cache import get_font, render_text, get_text_cache
 from ..story.dialogue_system import DialogueUI
+from .startup import StartupProfiler, LazySubsystem
+from .display import Display
+from .presenter import FramePresenter
+from .frame_scheduler import FrameScheduler
+from .events import (
+    EventBus, PlayerMoved, ItemDropped, TrapTriggered, FloorEntered, FloorStabilized
+)
 
 
 class Game:
     """Основной класс игры"""
     
-    def __init__(self, width: int = 1200, height: int = 800, fullscreen: bool = False):
+    # Тяжёлые подсистемы создаются при первом обращении
+    # (или прогреваются по одной за кадр, пока показывается заставка)
+    level_generator = LazySubsystem("_create_level_generator")
+    attic = LazySubsystem("_create_attic")
+    player = LazySubsystem("_create_player")
+    sound_manager = LazySubsystem("_create_sound_manager")
+    sprite_manager = LazySubsystem("_create_sprite_manager")
+    story_manager = LazySubsystem("_create_story_manager")
+    main_menu = LazySubsystem("_create_main_menu")
+    inventory_ui = LazySubsystem("_create_inventory_ui")
+    storage_ui = LazySubsystem("_create_storage_ui")
+    riddle_ui = LazySubsystem("_create_riddle_ui")
+    settings_ui = LazySubsystem("_create_settings_ui")
+    dialogue_ui = LazySubsystem("_create_dialogue_ui")
+    minimap = LazySubsystem("_create_minimap")
+    hud = LazySubsystem("_create_hud")
+    
+    # Порядок прогрева во время заставки (сначала то, что нужно сразу после неё)
+    WARMUP_ORDER = [
+        "sound_manager",
+        "main_menu",
+        "settings_ui",
+        "attic",
+        "player",
+        "story_manager",
+        "level_generator",
+        "inventory_ui",
+        "storage_ui",
+        "riddle_ui",
+        "dialogue_ui",
+        "minimap",
+        "hud",
+        "sprite_manager",
+    ]
+    
+    def __init__(
+        self,
+        width: int = 1200,
+        height: int = 800,
+        fullscreen: bool = False,
+        profiler: Optional[StartupProfiler] = None,
+        render_size: Optional[Tuple[int, int]] = None,
+        render_scale: Optional[float] = None,
+        hardware_scaling: bool = False
+    ):
         """
         Инициализация игры
         
@@ -33,35 +79,41 @@ class Game:
             width: Ширина окна
             height: Высота окна
             fullscreen: Полноэкранный режим
+            profiler: Профайлер запуска (None - замеры выключены)
+            render_size: Фиксированное внутреннее разрешение (None - нативное)
+            render_scale: Внутреннее разрешение как доля разрешения монитора
+            hardware_scaling: Масштабировать кадр средствами SDL (pygame.SCALED)
         """
+        self.profiler = profiler or StartupProfiler(enabled=False)
+        
         # Инициализация Pygame
-        pygame.init()
+        with self.profiler.measure("pygame.init"):
+            pygame.init()
         
         # Параметры окна
         self.fullscreen = fullscreen
         self.windowed_size = (width, height)
         
-        # Получаем размер экрана
-        display_info = pygame.display.Info()
-        self.screen_width = display_info.current_w
-        self.screen_height = display_info.current_h
+        # Окно (и внутреннее разрешение рендера, если задано)
+        self.display = Display(self.windowed_size, render_size, render_scale, hardware_scaling)
+        self.screen_width, self.screen_height = self.display.desktop_size
         
-        # Устанавливаем режим отображения
-        if fullscreen:
-            self.width = self.screen_width
-            self.height = self.screen_height
-            self.screen = pygame.display.set_mode((self.width, self.height), pygame.FULLSCREEN)
-        else:
-            self.width = width
-            self.height = height
-            self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+        # Устанавливаем режим отображения (self.width/height - размер кадра)
+        with self.profiler.measure("display.set_mode"):
+            self.screen = self.display.set_mode(fullscreen)
+            self.width, self.height = self.display.size
+        
+        # Единственная точка вывода кадра на дисплей (грязные прямоугольники / flip)
+        self.presenter = FramePresenter(self.display)
+        self._last_view = None  # Состояние, при смене которого кадр выводится целиком
+        self._had_input = False
         
         pygame.display.set_caption("Подземелье НИИЧАВО")
         
-        # Игровой цикл
-        self.clock = pygame.time.Clock()
+        # Игровой цикл (в простое - меню, окна, чердак без движения - частота падает)
         self.running = False
         self.fps = 60
+        self.scheduler = FrameScheduler(fps=self.fps, idle_fps=10)
         
         # FPS счётчик
         self.show_fps = False  # Показывать ли FPS (F3 для переключения)
@@ -69,27 +121,17 @@ class Game:
         self.fps_frames = 0  # Количество кадров с последнего обновления
         self.current_fps = 0  # Текущий FPS для отображения
         
-        # Создаём генератор уровней
-        self.level_generator = LevelGenerator(game_id="game_001")
-        
-        # Создаём чердак
-        self.attic = Attic()
-        
         # Менеджер сохранений
         self.save_manager = SaveManager()
         self.serializer = GameStateSerializer()
         
         # UI (используем self.width и self.height - они уже учитывают fullscreen)
-        self.inventory_ui = InventoryUI(self.width, self.height)
-        self.storage_ui = StorageUI(self.width, self.height)
-        self.riddle_ui = RiddleUI(self.width, self.height)
         self.message_log = MessageLog(self.width, self.height)
         
-        from ..ui.settings_ui import SettingsUI
-        self.settings_ui = SettingsUI(self.width, self.height)
-        
-        from ..ui.splash_screen import SplashScreen
-        self.splash_screen = SplashScreen(self.width, self.height)
+        # Заставка нужна для первого кадра - создаём сразу
+        with self.profiler.measure("splash_screen"):
+            from ..ui.splash_screen import SplashScreen
+            self.splash_screen = SplashScreen(self.width, self.height)
         
         self.show_inventory_ui = False
         self.show_storage_ui = False
@@ -98,31 +140,26 @@ class Game:
         self.show_splash = True  # Показываем заставку при запуске
         self.current_riddle = None
         
+        # Очередь прогрева ленивых подсистем
+        self.warmup_queue = list(self.WARMUP_ORDER)
+        
+        # Шина игровых событий (проверки после шага, выброса предмета, входа на этаж)
+        self.events = EventBus()
+        self._pending_drops = []  # Выброшенное на чердаке - ляжет на пол первого этажа
+        self._last_hint_pos = None
+        self._story_check_pending = False
+        
         # Боевая система
         self.combat = CombatSystem()
         
         # Графика
-        self.sprite_manager = SpriteManager()
         self.particle_system = ParticleSystem()
         
-        # Звук
-        from ..audio.sound_manager import SoundManager
-        self.sound_manager = SoundManager()
-        
-        # Подключаем колбэки настроек к звуковому менеджеру
-        self.settings_ui.on_music_toggle = self._on_music_toggle
-        self.settings_ui.on_sfx_toggle = self._on_sfx_toggle
-        self.settings_ui.on_music_volume_change = self._on_music_volume_change
-        self.settings_ui.on_sfx_volume_change = self._on_sfx_volume_change
-        self.settings_ui.on_back = self._on_settings_back
-        
         # Подключаем систему частиц и лог к боевой системе
         self.combat.particle_system = self.particle_system
         self.combat.message_log = self.message_log
         
         # Сюжет
-        self.story_manager = StoryManager()
-        self.dialogue_ui = DialogueUI(width, height)
         self.current_dialogue = None
         self.show_dialogue = False
         
@@ -131,7 +168,6 @@ class Game:
         self.death_timer = 0.0
         
         # Главное меню
-        self.main_menu = MainMenu(width, height)
         self.show_main_menu = True
         self.current_profile = None
         
@@ -148,22 +184,17 @@ class Game:
         
         # Текущий уровень (None если на чердаке)
         self.current_level = None
-        
-        # Создаём игрока на чердаке
-        if self.attic.spawn_pos:
-            spawn_x, spawn_y = self.attic.spawn_pos
-            self.player = Player(x=spawn_x, y=spawn_y)
-        else:
-            self.player = Player(x=15, y=10)
-        
-        # Устанавливаем message_log для игрока
-        self.player.message_log = self.message_log
             
         self.input_manager = InputManager()
         
-        # Камера
+        # Камера: camera_x/y - целые пиксели для отрисовки, camera_fx/fy - плавная позиция
         self.camera_x = 0
         self.camera_y = 0
+        self.camera_fx = 0.0
+        self.camera_fy = 0.0
+        self.camera_speed = 12.0  # Скорость догоняния цели (1/сек)
+        self.camera_moving = False
+        self._camera_scene = None  # Локация/уровень/размер: при смене камера прыгает сразу
         
         # Флаг для предотвращения повторных переходов
         self.can_transition = True
@@ -177,12 +208,225 @@ class Game:
         self.move_delay = 0.08  # Задержка между шагами (секунды) - комфортная скорость
         self.run_move_delay = 0.05  # Задержка при беге (быстрее)
         self.run_endurance_cost = 2  # Стоимость бега в выносливости за шаг
+        self.is_running = False  # Зажат ли Shift (обновляется в _update)
+        
+        # Проверки, срабатывающие по событиям, а не каждый кадр
+        self._subscribe_events()
         
         print("✅ Игра инициализирована")
         print(f"📺 Разрешение: {width}x{height}")
         print(f"⚙️  FPS: {self.fps}")
         print(f"🎮 Управление: WASD или стрелки (удерживайте для движения)")
         print(f"🏃 Бег: Shift + направление (тратит выносливость)")
+    
+    # Фабрики ленивых подсистем
+    def _create_level_generator(self):
+        """Создать генератор уровней"""
+        from ..world.level_generator import LevelGenerator
+        return LevelGenerator(game_id="game_001")
+    
+    def _create_attic(self):
+        """Создать чердак"""
+        from ..world.attic import Attic
+        return Attic()
+    
+    def _create_player(self) -> Player:
+        """Создать игрока на чердаке"""
+        if self.attic.spawn_pos:
+            spawn_x, spawn_y = self.attic.spawn_pos
+            player = Player(x=spawn_x, y=spawn_y)
+        else:
+            player = Player(x=15, y=10)
+        
+        # Устанавливаем message_log для игрока
+        player.message_log = self.message_log
+        return player
+    
+    def _create_sound_manager(self):
+        """Создать звуковой менеджер и запустить фоновую музыку"""
+        from ..audio.sound_manager import SoundManager
+        sound_manager = SoundManager()
+        
+        # Фоновая музыка (тема чердака если на чердаке)
+        if self.current_location == "attic":
+            sound_manager.start_music("attic")
+        else:
+            sound_manager.start_music()
+        sound_manager.preload_music(self._get_nearby_music_biomes(self.current_floor))
+        return sound_manager
+    
+    def _create_sprite_manager(self):
+        """Создать менеджер спрайтов"""
+        from ..graphics.sprite_manager import SpriteManager
+        return SpriteManager()
+    
+    def _create_story_manager(self):
+        """Создать менеджер сюжета"""
+        from ..story.story_manager import StoryManager
+        return StoryManager()
+    
+    def _create_main_menu(self):
+        """Создать главное меню"""
+        from ..ui.main_menu import MainMenu
+        return MainMenu(self.width, self.height)
+    
+    def _create_inventory_ui(self) -> InventoryUI:
+        """Создать GUI инвентаря"""
+        inventory_ui = InventoryUI(self.width, self.height)
+        inventory_ui.events = self.events
+        return inventory_ui
+    
+    def _create_storage_ui(self) -> StorageUI:
+        """Создать GUI хранилища"""
+        return StorageUI(self.width, self.height)
+    
+    def _create_riddle_ui(self) -> RiddleUI:
+        """Создать GUI загадок"""
+        return RiddleUI(self.width, self.height)
+    
+    def _create_dialogue_ui(self) -> DialogueUI:
+        """Создать GUI диалогов"""
+        return DialogueUI(self.width, self.height)
+    
+    def _create_minimap(self):
+        """Создать миникарту"""
+        from ..ui.minimap import Minimap
+        return Minimap()
+    
+    def _create_hud(self):
+        """Создать HUD: элементы объявлены привязками к состоянию игры"""
+        from ..ui.hud import Hud
+        from ..world.biomes import BiomeManager
+        
+        hud = Hud()
+        in_dungeon = lambda: self.current_location != "attic"
+        
+        # Статус игрока
+        hud.add(
+            "status",
+            lambda: (self.player.x, self.player.y),
+            lambda pos: (f"Позиция: ({pos[0]}, {pos[1]})", (255, 255, 255)),
+            (10, 10)
+        )
+        hud.add(
+            "status",
+            lambda: (self.player.stats.health, self.player.stats.max_health),
+            lambda hp: (f"HP: {hp[0]}/{hp[1]}", (255, 0, 0)),
+            (10, 35)
+        )
+        hud.add(
+            "status",
+            lambda: (self.player.stats.endurance, self.player.stats.max_endurance, self.is_running),
+            lambda v: (
+                f"{'🏃 ' if v[2] else ''}Выносливость: {v[0]}/{v[1]}",
+                (255, 165, 0) if v[2] else (0, 255, 255)  # Оранжевый при беге
+            ),
+            (10, 60)
+        )
+        hud.add(
+            "status",
+            lambda: self.player.steps,
+            lambda steps: (f"Шагов: {steps}", (200, 200, 200)),
+            (10, 85)
+        )
+        hud.add(
+            "status",
+            lambda: self.current_floor if in_dungeon() else None,
+            lambda floor: (f"Этаж: {floor}" if floor is not None else "Чердак", (255, 255, 255)),
+            (10, 110)
+        )
+        hud.add(
+            "status",
+            lambda: self.current_floor if in_dungeon() else None,
+            lambda floor: None if floor is None else (
+                f"📍 {BiomeManager.get_biome_for_floor(floor).name}", (150, 200, 255)  # Голубоватый цвет
+            ),
+            (10, 135),
+            size=20
+        )
+        
+        # Прогресс стабилизации и враги (только в подземелье)
+        floor_states = lambda: self.level_generator.floor_state_manager
+        hud.add(
+            "status",
+            lambda: floor_states().get_stabilized_count() if in_dungeon() else None,
+            lambda count: None if count is None else (f"Стабилизировано: {count}/20", (0, 255, 255)),
+            (10, 135)
+        )
+        hud.add(
+            "status",
+            lambda: (self.current_floor, floor_states().is_floor_stabilized(self.current_floor)) if in_dungeon() else None,
+            lambda v: None if v is None else (
+                f"Этаж {v[0]}: {'СТАБИЛИЗИРОВАН' if v[1] else 'НЕ СТАБИЛИЗИРОВАН'}",
+                (0, 255, 0) if v[1] else (255, 100, 100)
+            ),
+            (10, 160)
+        )
+        hud.add(
+            "status",
+            lambda: self.current_level.enemy_spawner.get_alive_count() if in_dungeon() else None,
+            lambda alive: None if alive is None else (f"Врагов: {alive}", (255, 100, 100)),
+            (10, 185)
+        )
+        
+        # Подсказки у нижнего края
+        def interaction_hint():
+            if in_dungeon():
+                for obj in self.current_level.interactive_objects:
+                    if obj.x == self.player.x and obj.y == self.player.y:
+                        return obj.get_interaction_hint()
+            return None
+        
+        static_hints = [
+            ("Красный круг = ВНИЗ (глубже), Зелёный круг = ВВЕРХ (назад)", (150, 150, 150), -30),
+            ("Этаж 1 = поверхность, Этаж 20 = самое дно подземелья", (150, 150, 150), -50),
+        ]
+        for text, color, y in static_hints:
+            hud.add("hints", lambda: None, lambda _, text=text, color=color: (text, color), (10, y), size=20)
+        
+        hud.add(
+            "hints",
+            interaction_hint,
+            lambda hint: None if hint is None else (hint, (255, 255, 100)),  # Яркий жёлтый
+            (10, -70),
+            size=20
+        )
+        
+        static_hints = [
+            ("SHIFT = бег | SPACE/A = атака | E = подобрать/загадка/записка | I = инвентарь | T = сундук", (255, 255, 0), -70),
+            ("F5 = сохранить (на чердаке) | F9 = загрузить | F11 = полный экран | M = миникарта | L = журнал", (255, 255, 0), -90),
+            ("Предметы подбираются автоматически", (150, 150, 150), -110),
+        ]
+        for text, color, y in static_hints:
+            hud.add("hints", lambda: None, lambda _, text=text, color=color: (text, color), (10, y), size=20)
+        
+        return hud
+    
+    def _create_settings_ui(self):
+        """Создать меню настроек и подключить колбэки звука"""
+        from ..ui.settings_ui import SettingsUI
+        settings_ui = SettingsUI(self.width, self.height)
+        
+        # Подключаем колбэки настроек к звуковому менеджеру
+        settings_ui.on_music_toggle = self._on_music_toggle
+        settings_ui.on_sfx_toggle = self._on_sfx_toggle
+        settings_ui.on_music_volume_change = self._on_music_volume_change
+        settings_ui.on_sfx_volume_change = self._on_sfx_volume_change
+        settings_ui.on_back = self._on_settings_back
+        return settings_ui
+    
+    def _warm_up_step(self) -> None:
+        """Прогреть одну ленивую подсистему (вызывается раз в кадр во время заставки)"""
+        while self.warmup_queue:
+            name = self.warmup_queue.pop(0)
+            if not LazySubsystem.is_created(self, name):
+                getattr(self, name)
+                break
+        
+        if not self.warmup_queue:
+            self.profiler.report("прогрев завершён")
+            self.profiler.uninstall_import_hook()
+            self.warmup_queue = None
         
     def run(self) -> None:
         """Главный игровой цикл"""
@@ -190,22 +434,20 @@ class Game:
         print("\n🎮 Игра запущена!")
         print("Нажмите ESC для выхода\n")
         
-        # Запускаем фоновую музыку (тема чердака если на чердаке)
-        if self.current_location == "attic":
-            self.sound_manager.start_music("attic")
-        else:
-            self.sound_manager.start_music()
-        
         while self.running:
-            # Delta time
-            dt = self.clock.tick(self.fps) / 1000.0
+            # Delta time (в простое цикл спит до события или таймаута)
+            dt = self.scheduler.tick(self._is_animating())
             
             # Обновляем FPS счётчик
             self._update_fps_counter(dt)
             
+            # Подкачиваем потоковую музыку (если звук уже инициализирован)
+            if LazySubsystem.is_created(self, "sound_manager"):
+                self.sound_manager.update()
+            
             # Если показываем заставку - только её обрабатываем
             if self.show_splash:
-                events = pygame.event.get()
+                events = [self.display.remap_event(event) for event in pygame.event.get()]
                 for event in events:
                     if event.type == pygame.QUIT:
                         self.running = False
@@ -217,7 +459,13 @@ class Game:
                 
                 # Рисуем заставку
                 self.splash_screen.render(self.screen)
-                pygame.display.flip()
+                self.presenter.mark_full()
+                self.presenter.present()
+                self.profiler.mark_first_frame()
+                
+                # Пока видна заставка, прогреваем подсистемы по одной за кадр
+                if self.warmup_queue:
+                    self._warm_up_step()
                 continue
             
             # Обработка событий
@@ -233,14 +481,22 @@ class Game:
             # Отрисовка
             self._render()
             
-            # Обновление экрана
-            pygame.display.flip()
+            # Вывод кадра: только изменившиеся области или целиком
+            self._mark_dirty_regions()
+            self.presenter.present()
+            
+            # Если заставку пропустили раньше - догреваем остальное
+            if self.warmup_queue:
+                self._warm_up_step()
             
         self._quit()
         
     def _handle_events(self) -> None:
         """Обработка событий"""
-        events = pygame.event.get()
+        events = [self.display.remap_event(event) for event in pygame.event.get()]
+        
+        # Любой ввод (кроме движения мыши) может изменить что угодно на экране
+        self._had_input = any(event.type != pygame.MOUSEMOTION for event in events)
         
         # ВАЖНО: Обновляем менеджер ввода ПЕРЕД всеми проверками
         # Это предотвращает "залипание" клавиш при открытии/закрытии UI
@@ -324,6 +580,17 @@ class Game:
                 if self.dialogue_ui.handle_input(event, self.current_dialogue):
                     self.show_dialogue = False
                     self.current_dialogue = None
+                    # Диалог мог установить флаги - следующий триггер проверится после закрытия
+                    self._story_check_pending = True
+            return
+        
+        # Если открыт журнал сообщений - листаем его
+        if self.message_log.history_open:
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.running = False
+                if self.message_log.handle_history_input(event):
+                    self.message_log.toggle_history()
             return
         
         # Если открыт диалог выхода - обрабатываем его
@@ -337,6 +604,7 @@ class Game:
                         self.show_exit_dialog = False
                         self.show_main_menu = True
                         self.message_log.clear()
+                        self.message_log.detach_history_file()
                     elif event.key == pygame.K_n or event.key == pygame.K_ESCAPE:
                         # Отменено
                         self.show_exit_dialog = False
@@ -360,6 +628,14 @@ class Game:
                 # Переключение отображения FPS (F3)
                 if event.key == pygame.K_F3:
                     self.show_fps = not self.show_fps
+                
+                # Миникарта (M)
+                if event.key == pygame.K_m:
+                    self.minimap.toggle()
+                
+                # Журнал сообщений (L)
+                if event.key == pygame.K_l:
+                    self.message_log.toggle_history()
                     
                 # Взаимодействие (E) - предметы, загадки, записки
                 if event.key == pygame.K_e:
@@ -404,6 +680,7 @@ class Game:
         # Проверяем, зажат ли Shift (бег)
         keys = pygame.key.get_pressed()
         is_running = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
+        self.is_running = is_running  # Для HUD
         
         # Определяем задержку движения
         current_delay = self.run_move_delay if is_running else self.move_delay
@@ -436,12 +713,8 @@ class Game:
                 # Сохраняем был ли последний шаг бегом (для обнаружения ловушек)
                 self._last_move_was_running = is_running
                 
-                # Проверяем ловушки (только в подземелье)
-                if self.current_location != "attic":
-                    self._check_traps()
-            
-        # Проверяем переходы между локациями
-        self._check_location_transition()
+                # Ловушки, переходы, руны, подсказки - обработчики шага
+                self.events.publish(PlayerMoved(self.player.x, self.player.y, is_running, self.current_level))
             
         # Обновляем игрока (передаём информацию о движении для анимации)
         is_moving = (dx != 0 or dy != 0) and self.move_timer >= current_delay
@@ -456,12 +729,7 @@ class Game:
         # Обновляем лог сообщений
         self.message_log.update(dt)
         
-        # Проверяем сбор рун и предметов (только в подземелье)
         if self.current_location != "attic":
-            self._check_rune_collection()
-            self._check_dropped_items()
-            self._show_interaction_hints()
-            
             # Обновляем врагов
             attacking_enemies = self.current_level.enemy_spawner.update_all(
                 dt, 
@@ -487,20 +755,95 @@ class Game:
             if self.death_timer >= 3.0:  # 3 секунды показываем экран смерти
                 self._respawn_player()
         
-        # Проверяем сюжетные триггеры
-        self._check_story_triggers()
+        # Сюжетные триггеры (запрошены входом на этаж, стабилизацией или закрытием диалога)
+        if self._story_check_pending:
+            self._check_story_triggers()
+        
+        # Обновляем камеру (плавно догоняет игрока)
+        self._update_camera(dt)
+        
+    def _subscribe_events(self) -> None:
+        """Подписать проверки игры на события (порядок подписки = порядок вызова)"""
+        # Шаг: ловушка под ногами, затем лестница, затем руна и подсказка на новой клетке
+        self.events.subscribe(PlayerMoved, self._on_player_moved_traps)
+        self.events.subscribe(PlayerMoved, self._on_player_moved_transition)
+        self.events.subscribe(PlayerMoved, self._on_player_moved_pickups)
+        
+        self.events.subscribe(FloorEntered, self._on_floor_entered)
+        self.events.subscribe(FloorStabilized, self._on_floor_stabilized)
+        self.events.subscribe(ItemDropped, self._on_item_dropped)
+        self.events.subscribe(TrapTriggered, self._on_trap_triggered)
+    
+    def _on_player_moved_traps(self, event: PlayerMoved) -> None:
+        """Ловушки и обнаружение скрытого после шага (только в подземелье)"""
+        if self.current_location != "attic":
+            self._check_traps()
+    
+    def _on_player_moved_transition(self, event: PlayerMoved) -> None:
+        """Переход по лестнице/люку после шага"""
+        self._check_location_transition()
+    
+    def _on_player_moved_pickups(self, event: PlayerMoved) -> None:
+        """Сбор рун и подсказки о предметах на новой клетке"""
+        # Шаг увёл на другой этаж - новую клетку уже обработал вход на этаж
+        if self.current_level is not event.level:
+            return
+        if self.current_location != "attic":
+            self._check_rune_collection()
+            self._show_interaction_hints()
+    
+    def _on_floor_entered(self, event: FloorEntered) -> None:
+        """Вход в локацию: выброшенное на чердаке, подсказки, сюжет"""
+        if self.current_location != "attic":
+            self._check_dropped_items()
+            self._show_interaction_hints()
         
-        # Обновляем камеру (центрируем на игроке)
-        self._update_camera()
+        # Этаж мог быть стабилизирован в сохранении без сюжетного флага
+        if event.floor and self.level_generator.floor_state_manager.is_floor_stabilized(event.floor):
+            self.story_manager.set_flag(f"floor_{event.floor}_stabilized", True)
+        self.story_manager.enter_location(event.location, event.floor)
+        self._story_check_pending = True
+    
+    def _on_floor_stabilized(self, event: FloorStabilized) -> None:
+        """Стабилизация этажа может открыть сюжетный диалог"""
+        self.story_manager.set_flag(f"floor_{event.floor}_stabilized", True)
+        self._story_check_pending = True
+    
+    def _on_item_dropped(self, event: ItemDropped) -> None:
+        """Выброшенный предмет ложится на пол (на чердаке - ждёт первого этажа)"""
+        self._pending_drops.append((event.item, event.quantity))
+        if self.current_location != "attic":
+            self._check_dropped_items()
+    
+    def _on_trap_triggered(self, event: TrapTriggered) -> None:
+        """Частицы сработавшей ловушки"""
+        from ..world.traps import TrapType
+        effect_types = {
+            TrapType.FIRE: "explosion",
+            TrapType.ICE: "sparkle",
+            TrapType.POISON: "smoke",
+            TrapType.EXPLOSIVE: "explosion",
+        }
+        self.particle_system.emit(
+            event.trap.x * 32 + 16,
+            event.trap.y * 32 + 16,
+            count=15,
+            effect_type=effect_types.get(event.trap.trap_type, "sparkle")
+        )
+    
+    def _update_camera(self, dt: float) -> None:
+        """
+        Обновление позиции камеры
         
-    def _update_camera(self) -> None:
-        """Обновление позиции камеры"""
-        # Центрируем камеру на игроке
+        Args:
+            dt: Delta time (время между кадрами в секундах)
+        """
+        # Цель - игрок в центре экрана
         player_screen_x = self.player.x * self.player.size
         player_screen_y = self.player.y * self.player.size
         
-        self.camera_x = player_screen_x - self.width // 2
-        self.camera_y = player_screen_y - self.height // 2
+        target_x = player_screen_x - self.width // 2
+        target_y = player_screen_y - self.height // 2
         
         # Ограничиваем камеру границами уровня
         if self.current_location == "attic":
@@ -510,8 +853,25 @@ class Game:
             max_camera_x = self.current_level.width * self.current_level.tile_size - self.width
             max_camera_y = self.current_level.height * self.current_level.tile_size - self.height
         
-        self.camera_x = max(0, min(self.camera_x, max_camera_x))
-        self.camera_y = max(0, min(self.camera_y, max_camera_y))
+        target_x = max(0, min(target_x, max_camera_x))
+        target_y = max(0, min(target_y, max_camera_y))
+        
+        # Новая сцена (этаж, чердак, размер окна) - камера сразу на месте, без пролёта через карту
+        scene = (self.current_location, id(self.current_level), self.width, self.height)
+        if scene != self._camera_scene:
+            self._camera_scene = scene
+            self.camera_fx, self.camera_fy = float(target_x), float(target_y)
+        else:
+            # Экспоненциальное сглаживание между клетками; вблизи цели - точная остановка
+            blend = min(1.0, dt * self.camera_speed)
+            self.camera_fx += (target_x - self.camera_fx) * blend
+            self.camera_fy += (target_y - self.camera_fy) * blend
+            if abs(target_x - self.camera_fx) < 0.5 and abs(target_y - self.camera_fy) < 0.5:
+                self.camera_fx, self.camera_fy = float(target_x), float(target_y)
+        
+        self.camera_moving = (self.camera_fx, self.camera_fy) != (target_x, target_y)
+        self.camera_x = round(self.camera_fx)
+        self.camera_y = round(self.camera_fy)
         
     def _check_location_transition(self) -> None:
         """Проверка перехода между локациями"""
@@ -573,6 +933,7 @@ class Game:
         # Меняем музыку в зависимости от биома
         biome = self._get_biome_for_floor(floor)
         self.sound_manager.start_music(biome)
+        self.sound_manager.preload_music(self._get_nearby_music_biomes(floor))
         
         # Телепортируем игрока
         if going_down:  # Спускаемся вниз
@@ -585,6 +946,8 @@ class Game:
             if self.current_level.exit_pos:
                 self.player.x, self.player.y = self.current_level.exit_pos
                 print(f"↑ Поднялись на этаж {floor} (появились у выхода)")
+        
+        self.events.publish(FloorEntered(self.current_location, self.current_floor))
                 
     def _go_to_attic(self) -> None:
         """Возврат на чердак"""
@@ -596,6 +959,7 @@ class Game:
         
         # Меняем музыку на тему чердака
         self.sound_manager.start_music("attic")
+        self.sound_manager.preload_music(self._get_nearby_music_biomes(0))
         
         # Восстанавливаем выносливость при возвращении на базу
         old_endurance = self.player.stats.endurance
@@ -610,6 +974,8 @@ class Game:
         if self.attic.entrance_pos:
             self.player.x, self.player.y = self.attic.entrance_pos
             print(f"↑ Вернулись на чердак")
+        
+        self.events.publish(FloorEntered(self.current_location, self.current_floor))
                 
     def _test_stabilize_floor(self) -> None:
         """Тестовая функция стабилизации этажа (SPACE) - для отладки"""
@@ -658,6 +1024,8 @@ class Game:
         # Создаём загадку на стене после стабилизации
         self._spawn_riddle_after_stabilization()
         
+        self.events.publish(FloorStabilized(self.current_floor))
+        
         # Показываем прогресс
         stabilized = floor_state_manager.get_stabilized_count()
         self.message_log.success(f"Этаж {self.current_floor} стабилизирован! ({stabilized}/20)")
@@ -842,6 +1210,9 @@ class Game:
             self.current_level = None
         else:
             self.current_level = self.level_generator.generate(self.current_floor)
+        
+        # Новая локация и флаги сюжета - для подписчиков это вход на этаж
+        self.events.publish(FloorEntered(self.current_location, self.current_floor))
             
         print("✅ Игра загружена!")
         print(f"   Локация: {self.current_location}")
@@ -1045,9 +1416,9 @@ class Game:
                     return
     
     def _check_dropped_items(self) -> None:
-        """Проверка выброшенных предметов и размещение их на карте"""
-        if hasattr(self.player, '_dropped_items') and self.player._dropped_items:
-            for item, quantity in self.player._dropped_items:
+        """Размещение выброшенных предметов на карте"""
+        if self._pending_drops:
+            for item, quantity in self._pending_drops:
                 # Размещаем предмет на позиции игрока
                 self.current_level.item_spawner.spawn_dropped_item(
                     item,
@@ -1060,7 +1431,7 @@ class Game:
                 self.message_log.info(f"Выброшено: {item.name} x{quantity}")
             
             # Очищаем список выброшенных предметов
-            self.player._dropped_items.clear()
+            self._pending_drops.clear()
     
     def _check_traps(self) -> None:
         """Проверка ловушек на позиции игрока"""
@@ -1071,49 +1442,30 @@ class Game:
         self._try_detect_nearby_traps()
         self._try_detect_nearby_containers()
         
-        # Проверяем все ловушки на уровне
-        for trap in self.current_level.traps:
-            if trap.x == self.player.x and trap.y == self.player.y:
-                # Активируем ловушку
-                effect = trap.trigger()
+        # Проверяем ловушки на клетке игрока
+        for trap in self.current_level.get_position_store("traps").at(self.player.x, self.player.y):
+            # Активируем ловушку
+            effect = trap.trigger()
+            
+            if effect["triggered"]:
+                # Показываем сообщение
+                self.message_log.warning(f"⚠️ {effect['message']}")
+                print(f"⚠️ {effect['message']}")
                 
-                if effect["triggered"]:
-                    # Показываем сообщение
-                    self.message_log.warning(f"⚠️ {effect['message']}")
-                    print(f"⚠️ {effect['message']}")
-                    
-                    # Наносим урон игроку
-                    damage = effect.get("damage", 0)
-                    if damage > 0:
-                        # Звук урона
-                        self.sound_manager.play_sound("damage")
-                        
-                        self.player.take_damage(damage)
-                        self.message_log.combat(f"💥 Получено {damage} урона!")
-                        print(f"💥 Получено {damage} урона! HP: {self.player.stats.health}/{self.player.stats.max_health}")
-                    
-                    # Создаём эффект частиц
-                    from ..world.traps import TrapType
-                    if trap.trap_type == TrapType.FIRE:
-                        effect_type = "explosion"
-                    elif trap.trap_type == TrapType.ICE:
-                        effect_type = "sparkle"
-                    elif trap.trap_type == TrapType.POISON:
-                        effect_type = "smoke"
-                    elif trap.trap_type == TrapType.EXPLOSIVE:
-                        effect_type = "explosion"
-                    else:
-                        effect_type = "sparkle"
-                    
-                    # Добавляем частицы в позиции ловушки
-                    self.particle_system.emit(
-                        self.player.x * 32 + 16,
-                        self.player.y * 32 + 16,
-                        count=15,
-                        effect_type=effect_type
-                    )
+                # Наносим урон игроку
+                damage = effect.get("damage", 0)
+                if damage > 0:
+                    # Звук урона
+                    self.sound_manager.play_sound("damage")
                     
-                    break  # Только одна ловушка за раз
+                    self.player.take_damage(damage)
+                    self.message_log.combat(f"💥 Получено {damage} урона!")
+                    print(f"💥 Получено {damage} урона! HP: {self.player.stats.health}/{self.player.stats.max_health}")
+                
+                # Эффекты - подписчикам
+                self.events.publish(TrapTriggered(trap, effect))
+                
+                break  # Только одна ловушка за раз
     
     def _try_detect_nearby_traps(self) -> None:
         """Попытка обнаружить ловушки рядом с игроком"""
@@ -1132,25 +1484,20 @@ class Game:
         # Радиус обнаружения (2 клетки)
         detection_radius = 2
         
-        # Проверяем все ловушки в радиусе
-        for trap in self.current_level.traps:
-            # Вычисляем расстояние
-            dx = abs(trap.x - self.player.x)
-            dy = abs(trap.y - self.player.y)
-            distance = max(dx, dy)  # Чебышёвское расстояние
+        # Ловушки в радиусе (чебышёвское расстояние по столбцам позиций)
+        traps = self.current_level.get_position_store("traps")
+        for trap, distance in traps.within(self.player.x, self.player.y, detection_radius):
+            # Шанс обнаружения уменьшается с расстоянием
+            distance_penalty = distance * 0.15
+            detection_chance = max(0.05, base_chance - distance_penalty)
             
-            if distance <= detection_radius:
-                # Шанс обнаружения уменьшается с расстоянием
-                distance_penalty = distance * 0.15
-                detection_chance = max(0.05, base_chance - distance_penalty)
+            # Пытаемся обнаружить
+            if trap.try_detect(detection_chance):
+                # Звук обнаружения
+                self.sound_manager.play_sound("discover")
                 
-                # Пытаемся обнаружить
-                if trap.try_detect(detection_chance):
-                    # Звук обнаружения
-                    self.sound_manager.play_sound("discover")
-                    
-                    self.message_log.info(f"🔍 Вы заметили ловушку!")
-                    print(f"🔍 Обнаружена ловушка на ({trap.x}, {trap.y})")
+                self.message_log.info(f"🔍 Вы заметили ловушку!")
+                print(f"🔍 Обнаружена ловушка на ({trap.x}, {trap.y})")
     
     def _try_detect_nearby_containers(self) -> None:
         """Попытка обнаружить тайники рядом с игроком"""
@@ -1168,34 +1515,25 @@ class Game:
         # Радиус обнаружения
         detection_radius = 2
         
-        # Проверяем все контейнеры в радиусе
-        for container in self.current_level.containers:
-            # Вычисляем расстояние
-            dx = abs(container.x - self.player.x)
-            dy = abs(container.y - self.player.y)
-            distance = max(dx, dy)
+        # Контейнеры в радиусе
+        containers = self.current_level.get_position_store("containers")
+        for container, distance in containers.within(self.player.x, self.player.y, detection_radius):
+            # Шанс обнаружения уменьшается с расстоянием
+            distance_penalty = distance * 0.15
+            detection_chance = max(0.05, base_chance - distance_penalty)
             
-            if distance <= detection_radius:
-                # Шанс обнаружения уменьшается с расстоянием
-                distance_penalty = distance * 0.15
-                detection_chance = max(0.05, base_chance - distance_penalty)
+            # Пытаемся обнаружить тайник
+            if container.try_discover(detection_chance):
+                # Звук обнаружения
+                self.sound_manager.play_sound("discover")
                 
-                # Пытаемся обнаружить тайник
-                if container.try_discover(detection_chance):
-                    # Звук обнаружения
-                    self.sound_manager.play_sound("discover")
-                    
-                    self.message_log.info(f"🔍 Вы нашли тайник!")
-                    print(f"🔍 Обнаружен тайник на ({container.x}, {container.y})")
+                self.message_log.info(f"🔍 Вы нашли тайник!")
+                print(f"🔍 Обнаружен тайник на ({container.x}, {container.y})")
     
     def _show_interaction_hints(self) -> None:
         """Показать подсказки о предметах и записках под игроком"""
-        # Создаём ключ текущей позиции для отслеживания
-        current_pos = (self.player.x, self.player.y)
-        
-        # Инициализируем атрибут если его нет
-        if not hasattr(self, '_last_hint_pos'):
-            self._last_hint_pos = None
+        # Ключ текущей позиции (с этажом - та же клетка на другом этаже это новое место)
+        current_pos = (self.current_location, self.player.x, self.player.y)
         
         # Если позиция не изменилась, не показываем подсказку снова
         if self._last_hint_pos == current_pos:
@@ -1386,9 +1724,19 @@ class Game:
         # Отрисовываем игрока
         self.player.render(self.screen, self.camera_x, self.camera_y)
         
+        # Освещение тёмных этажей (поверх мира, под HUD)
+        if self.current_location != "attic":
+            self.current_level.render_lighting(
+                self.screen, self.camera_x, self.camera_y, self.player.x, self.player.y
+            )
+        
         # HUD (информация на экране)
         self._render_hud()
         
+        # Миникарта этажа
+        if self.current_location != "attic":
+            self.minimap.render(self.screen, self.current_level, self.player.x, self.player.y)
+        
         # Лог сообщений
         self.message_log.render(self.screen)
         
@@ -1413,165 +1761,93 @@ class Game:
             self.storage_ui.render(self.screen, self.player.inventory, self.attic.storage)
         elif self.show_riddle_ui and self.current_riddle:
             self.riddle_ui.render(self.screen, self.current_riddle)
+        elif self.message_log.history_open:
+            self.message_log.render_history(self.screen)
         
         # FPS счётчик (поверх всего)
         self._render_fps()
         
-        # Обновление экрана
-        pygame.display.flip()
-        
-    def _render_hud(self) -> None:
-        """Отрисовка HUD"""
-        font = pygame.font.Font(None, 24)
-        
-        # Позиция игрока
-        pos_text = font.render(
-            f"Позиция: ({self.player.x}, {self.player.y})",
-            True,
-            (255, 255, 255)
-        )
-        self.screen.blit(pos_text, (10, 10))
+    def _mark_dirty_regions(self) -> None:
+        """Сообщить presenter'у, какие области кадра изменились"""
+        in_game = not self.show_main_menu and not self._any_ui_open() and not self.player_dead
+        level = self.current_level if self.current_location != "attic" else None
         
-        # Здоровье
-        hp_text = font.render(
-            f"HP: {self.player.stats.health}/{self.player.stats.max_health}",
-            True,
-            (255, 0, 0)
+        # Камера, позиция игрока (туман и свет), локация, открытые окна - всё меняет кадр целиком
+        view = (
+            in_game, self.current_location, self.current_floor, id(level),
+            self.camera_x, self.camera_y, self.player.x, self.player.y, (self.width, self.height)
         )
-        self.screen.blit(hp_text, (10, 35))
-        
-        # Выносливость (с индикацией бега)
-        keys = pygame.key.get_pressed()
-        is_running = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
-        
-        stamina_color = (255, 165, 0) if is_running else (0, 255, 255)  # Оранжевый при беге
-        stamina_prefix = "🏃 " if is_running else ""
+        if not in_game or self._had_input or view != self._last_view:
+            self._last_view = view
+            self.presenter.mark_full()
+            return
         
-        stamina_text = font.render(
-            f"{stamina_prefix}Выносливость: {self.player.stats.endurance}/{self.player.stats.max_endurance}",
-            True,
-            stamina_color
-        )
-        self.screen.blit(stamina_text, (10, 60))
+        tile = 32
+        mark = self.presenter.mark
         
-        # Шаги
-        steps_text = font.render(
-            f"Шагов: {self.player.steps}",
-            True,
-            (200, 200, 200)
-        )
-        self.screen.blit(steps_text, (10, 85))
+        # Игрок (анимация)
+        mark(pygame.Rect(self.player.x * tile - self.camera_x, self.player.y * tile - self.camera_y, tile, tile))
         
-        # Локация
-        if self.current_location == "attic":
-            location_text = "Чердак"
-            biome_text = ""
-        else:
-            location_text = f"Этаж: {self.current_floor}"
-            # Получаем название биома
-            from src.world.biomes import BiomeManager
-            biome = BiomeManager.get_biome_for_floor(self.current_floor)
-            biome_text = biome.name
+        if level is not None:
+            # Враги (с полоской здоровья над головой)
+            for enemy in level.enemy_spawner.get_alive():
+                mark(pygame.Rect(
+                    enemy.x * tile - self.camera_x, enemy.y * tile - self.camera_y - 8, tile, tile + 8
+                ))
             
-        floor_text = font.render(
-            location_text,
-            True,
-            (255, 255, 255)
-        )
-        self.screen.blit(floor_text, (10, 110))
-        
-        # Название биома (если не на чердаке)
-        if biome_text:
-            biome_font = pygame.font.Font(None, 20)
-            biome_render = biome_font.render(
-                f"📍 {biome_text}",
-                True,
-                (150, 200, 255)  # Голубоватый цвет
-            )
-            self.screen.blit(biome_render, (10, 135))
-        
-        # Подсказка
-        hint_font = pygame.font.Font(None, 20)
-        hint_text = hint_font.render(
-            "Красный круг = ВНИЗ (глубже), Зелёный круг = ВВЕРХ (назад)",
-            True,
-            (150, 150, 150)
-        )
-        self.screen.blit(hint_text, (10, self.height - 30))
+            # Пульсирующие руны
+            for rune in level.rune_manager.runes:
+                if not rune.collected:
+                    mark(pygame.Rect(
+                        rune.x * tile - self.camera_x, rune.y * tile - self.camera_y, tile, tile
+                    ).inflate(8, 8))
+            
+            mark(self.minimap.get_bounds(self.screen, level))
         
-        # Дополнительная подсказка
-        hint2_text = hint_font.render(
-            "Этаж 1 = поверхность, Этаж 20 = самое дно подземелья",
-            True,
-            (150, 150, 150)
-        )
-        self.screen.blit(hint2_text, (10, self.height - 50))
+        # Числа урона (поднимаются вверх)
+        for x, y, damage, timer, is_player in self.combat.damage_numbers:
+            mark(pygame.Rect(
+                x * tile - self.camera_x + 16, y * tile - self.camera_y - int(timer * 20), 64, 32
+            ))
         
-        # Подсказка для интерактивных объектов
-        if self.current_location != "attic":
-            for obj in self.current_level.interactive_objects:
-                if obj.x == self.player.x and obj.y == self.player.y:
-                    hint_text = hint_font.render(
-                        obj.get_interaction_hint(),
-                        True,
-                        (255, 255, 100)  # Яркий жёлтый
-                    )
-                    self.screen.blit(hint_text, (10, self.height - 70))
-                    break
+        mark(self.particle_system.get_bounds(self.camera_x, self.camera_y))
+        mark(self.message_log.get_bounds(self.width))
+        for rect in self.hud.get_dirty_rects():
+            mark(rect)
         
-        # Тестовая подсказка
-        hint3_text = hint_font.render(
-            "SHIFT = бег | SPACE/A = атака | E = подобрать/загадка/записка | I = инвентарь | T = сундук",
-            True,
-            (255, 255, 0)
-        )
-        self.screen.blit(hint3_text, (10, self.height - 70))
+        if self.show_fps:
+            mark(pygame.Rect(self.width - 110, 10, 100, 70))
+    
+    def _is_animating(self) -> bool:
+        """
+        Нужна ли полная частота кадров
         
-        # Подсказка сохранений
-        hint4_text = hint_font.render(
-            "F5 = сохранить (на чердаке) | F9 = загрузить | F11 = полный экран",
-            True,
-            (255, 255, 0)
-        )
-        self.screen.blit(hint4_text, (10, self.height - 90))
+        Returns:
+            True если был ввод или на экране что-то движется (прогрев, затухание
+            заставки, враги, частицы, гаснущие сообщения); False - простой
+        """
+        if self.warmup_queue or self._had_input or self.input_manager.keys_pressed:
+            return True
+        if self.show_splash:
+            # Заставка, ждущая нажатия, анимирует только мигание подсказки
+            return self.splash_screen.state != "showing"
+        if self.show_main_menu or self._any_ui_open() or self.player_dead:
+            return False
+        
+        # В подземелье враги ходят, а руны пульсируют постоянно
+        if self.current_location != "attic":
+            return True
         
-        # Подсказка предметов
-        hint5_text = hint_font.render(
-            "Предметы подбираются автоматически",
-            True,
-            (150, 150, 150)
+        return bool(
+            self.camera_moving or
+            self.particle_system.count or
+            self.message_log.messages or
+            self.combat.damage_numbers
         )
-        self.screen.blit(hint5_text, (10, self.height - 110))
-        
-        # Прогресс стабилизации (только в подземелье)
-        if self.current_location != "attic":
-            stabilized = self.level_generator.floor_state_manager.get_stabilized_count()
-            progress_text = font.render(
-                f"Стабилизировано: {stabilized}/20",
-                True,
-                (0, 255, 255)
-            )
-            self.screen.blit(progress_text, (10, 135))
-            
-            # Статус текущего этажа
-            is_stabilized = self.level_generator.floor_state_manager.is_floor_stabilized(self.current_floor)
-            status_color = (0, 255, 0) if is_stabilized else (255, 100, 100)
-            status_text = "СТАБИЛИЗИРОВАН" if is_stabilized else "НЕ СТАБИЛИЗИРОВАН"
-            floor_status = font.render(
-                f"Этаж {self.current_floor}: {status_text}",
-                True,
-                status_color
-            )
-            self.screen.blit(floor_status, (10, 160))
-            
-            # Количество врагов
-            alive_enemies = self.current_level.enemy_spawner.get_alive_count()
-            enemies_text = font.render(
-                f"Врагов: {alive_enemies}",
-                True,
-                (255, 100, 100)
-            )
-            self.screen.blit(enemies_text, (10, 185))
+    
+    def _render_hud(self) -> None:
+        """Отрисовка HUD (слои перерисовываются только при смене значений)"""
+        self.hud.render(self.screen)
         
     def _render_exit_dialog(self) -> None:
         """Отрисовка диалога выхода"""
@@ -1591,9 +1867,9 @@ class Game:
         pygame.draw.rect(self.screen, (255, 200, 100), (box_x, box_y, box_width, box_height), 3)
         
         # Текст
-        title_font = pygame.font.Font(None, 48)
-        text_font = pygame.font.Font(None, 32)
-        hint_font = pygame.font.Font(None, 28)
+        title_font = get_font(48)
+        text_font = get_font(32)
+        hint_font = get_font(28)
         
         title = title_font.render("Выход в меню?", True, (255, 200, 100))
         title_rect = title.get_rect(center=(self.width // 2, box_y + 70))
@@ -1626,7 +1902,7 @@ class Game:
         pygame.draw.rect(self.screen, (150, 120, 80), (box_x, box_y, box_width, box_height), 3)
         
         # Заголовок
-        title_font = pygame.font.Font(None, 42)
+        title_font = get_font(42)
         title = title_font.render(f"📜 {self.current_note.title}", True, (80, 50, 20))
         title_rect = title.get_rect(center=(self.width // 2, box_y + 50))
         self.screen.blit(title, title_rect)
@@ -1641,7 +1917,7 @@ class Game:
         )
         
         # Текст записки (многострочный)
-        text_font = pygame.font.Font(None, 28)
+        text_font = get_font(28)
         lines = self.current_note.text.split('\n')
         y_offset = box_y + 120
         
@@ -1652,7 +1928,7 @@ class Game:
             y_offset += 35
         
         # Подсказка
-        hint_font = pygame.font.Font(None, 24)
+        hint_font = get_font(24)
         hint = hint_font.render("Нажмите ПРОБЕЛ, ENTER или ESC чтобы закрыть", True, (120, 100, 60))
         hint_rect = hint.get_rect(center=(self.width // 2, box_y + box_height - 30))
         self.screen.blit(hint, hint_rect)
@@ -1666,13 +1942,13 @@ class Game:
         self.screen.blit(overlay, (0, 0))
         
         # Текст "ВЫ ПОГИБЛИ"
-        death_font = pygame.font.Font(None, 72)
+        death_font = get_font(72)
         death_text = death_font.render("💀 ВЫ ПОГИБЛИ 💀", True, (255, 255, 255))
         death_rect = death_text.get_rect(center=(self.width // 2, self.height // 2 - 50))
         self.screen.blit(death_text, death_rect)
         
         # Таймер возрождения
-        timer_font = pygame.font.Font(None, 36)
+        timer_font = get_font(36)
         remaining = max(0, 3.0 - self.death_timer)
         timer_text = timer_font.render(
             f"Возрождение через {remaining:.1f} сек...",
@@ -1683,7 +1959,7 @@ class Game:
         self.screen.blit(timer_text, timer_rect)
         
         # Подсказка
-        hint_font = pygame.font.Font(None, 24)
+        hint_font = get_font(24)
         hint_text = hint_font.render(
             "Вы возродитесь на чердаке с полным здоровьем",
             True,
@@ -1700,33 +1976,16 @@ class Game:
         print("⏳ Возрождение через 3 секунды...")
         
     def _check_story_triggers(self) -> None:
-        """Проверка сюжетных триггеров"""
-        # Не показываем диалоги если уже открыт какой-то UI
+        """Показать диалог первого сработавшего сюжетного триггера из очереди"""
+        # Не показываем диалоги если уже открыт какой-то UI (проверим после закрытия)
         if self.show_dialogue or self.show_inventory_ui or self.show_storage_ui or self.show_riddle_ui:
             return
-            
-        # Вступительный диалог (на чердаке при первом запуске)
-        if self.current_location == "attic":
-            if self.story_manager.should_show_dialogue("intro", 0):
-                self._show_story_dialogue("intro")
-                self.story_manager.set_flag("intro_shown", True)
-                return
-                
-        # Диалог на 10 этаже
-        if self.current_location != "attic" and self.current_floor == 10:
-            if self.story_manager.should_show_dialogue("midpoint", 10):
-                self._show_story_dialogue("midpoint")
-                self.story_manager.set_flag("midpoint_shown", True)
-                return
-                
-        # Финальный диалог на 20 этаже
-        if self.current_location != "attic" and self.current_floor == 20:
-            # Проверяем что этаж стабилизирован
-            if self.level_generator.floor_state_manager.is_floor_stabilized(20):
-                if self.story_manager.should_show_dialogue("ending", 20):
-                    self._show_story_dialogue("ending")
-                    self.story_manager.set_flag("ending_shown", True)
-                    return
+        self._story_check_pending = False
+        
+        trigger = self.story_manager.pop_ready_trigger()
+        if trigger:
+            self._show_story_dialogue(trigger.dialogue_id)
+            self.story_manager.set_flag(trigger.shown_flag, True)
     
     def _show_story_dialogue(self, dialogue_id: str) -> None:
         """
@@ -1764,31 +2023,35 @@ class Game:
         self.player_dead = False
         self.death_timer = 0.0
         
+        self.events.publish(FloorEntered(self.current_location, self.current_floor))
+        
         # Штраф: теряем часть предметов (опционально)
         # Можно добавить потерю случайных предметов
     
     def _toggle_fullscreen(self) -> None:
         """Переключение полноэкранного режима"""
         self.fullscreen = not self.fullscreen
+        old_size = (self.width, self.height)
+        
+        self.screen = self.display.set_mode(self.fullscreen)
+        self.width, self.height = self.display.size
         
+        window_w, window_h = self.display.window.get_size()
         if self.fullscreen:
-            # Переход в полноэкранный режим
-            self.width = self.screen_width
-            self.height = self.screen_height
-            self.screen = pygame.display.set_mode((self.width, self.height), pygame.FULLSCREEN)
-            print(f"🖥️  Полноэкранный режим: {self.width}x{self.height}")
+            print(f"🖥️  Полноэкранный режим: {window_w}x{window_h} (кадр {self.width}x{self.height})")
         else:
-            # Переход в оконный режим
-            self.width, self.height = self.windowed_size
-            self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
-            print(f"🪟 Оконный режим: {self.width}x{self.height}")
+            print(f"🪟 Оконный режим: {window_w}x{window_h} (кадр {self.width}x{self.height})")
+        
+        # При фиксированном разрешении рендера размер кадра не меняется
+        if (self.width, self.height) == old_size:
+            return
         
         # Пересоздаём UI с новыми размерами
-        self.inventory_ui = InventoryUI(self.width, self.height)
-        self.storage_ui = StorageUI(self.width, self.height)
+        self.inventory_ui = self._create_inventory_ui()
+        self.storage_ui = self._create_storage_ui()
         self.riddle_ui = RiddleUI(self.width, self.height)
         self.dialogue_ui = DialogueUI(self.width, self.height)
-        self.message_log = MessageLog(self.width, self.height)
+        self.message_log.resize(self.width, self.height)  # История и ссылки на лог сохраняются
     
     def _serialize_attic_storage(self) -> list:
         """Сериализовать содержимое сундука на чердаке"""
@@ -1858,25 +2121,13 @@ class Game:
             return
         
         from datetime import datetime
-        import json
         
-        # Путь к папке профиля и файлу метаданных
-        profile_dir = f"saves/profiles/{self.current_profile}"
-        profile_file = os.path.join(profile_dir, "profile.json")
-        os.makedirs(profile_dir, exist_ok=True)
-        
-        # Загружаем существующий профиль или создаём новый
-        if os.path.exists(profile_file):
-            try:
-                with open(profile_file, 'r', encoding='utf-8') as f:
-                    profile_data = json.load(f)
-            except:
-                profile_data = {}
-        else:
-            profile_data = {
-                "name": self.current_profile,
-                "created_at": datetime.now().isoformat()
-            }
+        # Берём текущие метаданные из индекса профилей (без чтения profile.json)
+        profile_index = self.main_menu.profile_index
+        profile_data = profile_index.get(self.current_profile) or {
+            "name": self.current_profile,
+            "created_at": datetime.now().isoformat()
+        }
         
         # Обновляем данные
         profile_data["last_played"] = datetime.now().isoformat()
@@ -1884,10 +2135,9 @@ class Game:
         profile_data["current_floor"] = self.current_floor
         profile_data["health"] = self.player.stats.health
         
-        # Сохраняем
+        # Сохраняем profile.json и индекс
         try:
-            with open(profile_file, 'w', encoding='utf-8') as f:
-                json.dump(profile_data, f, ensure_ascii=False, indent=2)
+            profile_index.save_profile(profile_data)
             # Сбрасываем счётчик времени сессии
             self.total_play_time = 0.0
         except Exception as e:
@@ -1902,18 +2152,22 @@ class Game:
         """
         print(f"\n🎮 Запуск игры с профилем: {profile_name}")
         
-        # Загружаем метаданные профиля (время игры)
+        # Время игры копится с нуля для новой сессии (накопленное лежит в индексе профилей)
         profile_dir = f"saves/profiles/{profile_name}"
-        profile_file = os.path.join(profile_dir, "profile.json")
-        if os.path.exists(profile_file):
-            try:
-                import json
-                with open(profile_file, 'r', encoding='utf-8') as f:
-                    profile_data = json.load(f)
-                    # Загружаем накопленное время игры
-                    self.total_play_time = 0.0  # Сбрасываем для новой сессии
-            except Exception as e:
-                print(f"⚠️  Ошибка загрузки метаданных профиля: {e}")
+        self.total_play_time = 0.0
+        
+        # История сообщений профиля (листается по L)
+        self.message_log.attach_history_file(os.path.join(profile_dir, "messages.jsonl"))
+        
+        # Сетки стабилизированных этажей хранятся в архиве профиля
+        # (если архив не открыть даже заново - держим сетки в памяти, как без архива)
+        from ..world.floor_archive import FloorArchive
+        try:
+            archive = FloorArchive(os.path.join(profile_dir, "floors.bin"))
+        except OSError as e:
+            print(f"⚠️  Архив этажей недоступен, сетки останутся в памяти: {e}")
+            archive = None
+        self.level_generator.floor_state_manager.attach_archive(archive)
         
         # Пытаемся загрузить сохранение
         save_file = os.path.join(profile_dir, "save.json")
@@ -1933,12 +2187,21 @@ class Game:
             print("Начинаем новую игру")
             self.message_log.info(f"Добро пожаловать, {profile_name}!")
             
-        # Показываем вступительный диалог ТОЛЬКО для новых игроков (без сохранения)
-        if not has_save and self.current_floor == 0:
-            self._check_story_triggers()
+        # Новая игра начинается на чердаке (вступительный диалог - по этому событию);
+        # при загрузке событие уже опубликовано
+        if not has_save:
+            self.events.publish(FloorEntered(self.current_location, self.current_floor))
     
     def _quit(self) -> None:
         """Завершение игры"""
+        if LazySubsystem.is_created(self, "sound_manager"):
+            self.sound_manager.voices.report()
+            self.sound_manager.music_cache.shutdown()
+        get_text_cache().report()
+        self.presenter.report()
+        self.scheduler.report()
+        self.events.report()
+        self.message_log.flush_history()
         pygame.quit()
         print("\n👋 Игра завершена")
         print("✅ До новых встреч!")
@@ -1960,10 +2223,8 @@ class Game:
     
     def _on_music_volume_change(self, volume: float) -> None:
         """Изменение громкости музыки"""
-        self.sound_manager.music_volume = volume
-        # Применяем новую громкость к текущей музыке
-        if self.sound_manager.music_playing:
-            pygame.mixer.music.set_volume(volume)
+        # Применяем новую громкость к текущей музыке (файловой и потоковой)
+        self.sound_manager.set_music_volume(volume)
     
     def _on_sfx_volume_change(self, volume: float) -> None:
         """Изменение громкости звуковых эффектов"""
@@ -1992,6 +2253,25 @@ class Game:
         else:
             return "abyss"  # Этажи 16-20+: Зона катастрофы/Бездна
     
+    def _get_nearby_music_biomes(self, floor: int) -> list:
+        """
+        Биомы текущего и соседних этажей (для предзагрузки музыки)
+        
+        Args:
+            floor: Номер этажа (0 - чердак)
+            
+        Returns:
+            Список биомов/локаций без повторов
+        """
+        biomes = []
+        for nearby in (floor, floor - 1, floor + 1):
+            if nearby < 0:
+                continue
+            biome = "attic" if nearby == 0 else self._get_biome_for_floor(nearby)
+            if biome not in biomes:
+                biomes.append(biome)
+        return biomes
+    
     def _any_ui_open(self) -> bool:
         """
         Проверка открыт ли какой-либо UI
@@ -2006,7 +2286,8 @@ class Game:
             self.show_dialogue or
             self.show_settings_ui or
             self.show_exit_dialog or
-            self.show_note
+            self.show_note or
+            self.message_log.history_open
         )
     
     def _update_fps_counter(self, dt: float) -> None:
@@ -2030,16 +2311,23 @@ class Game:
         if not self.show_fps:
             return
         
+        # Счётчики голосов звука (для настройки пула)
+        voice_stats = None
+        if LazySubsystem.is_created(self, "sound_manager"):
+            voice_stats = self.sound_manager.voices.get_stats()
+        
         # Создаём полупрозрачный фон
-        fps_bg = pygame.Surface((100, 30))
+        fps_bg = pygame.Surface((100, 70 if voice_stats else 50))
         fps_bg.set_alpha(180)
         fps_bg.fill((0, 0, 0))
         
         # Рисуем фон в правом верхнем углу
         self.screen.blit(fps_bg, (self.width - 110, 10))
         
-        # Выбираем цвет в зависимости от FPS
-        if self.current_fps >= 55:
+        # Выбираем цвет в зависимости от FPS (в простое низкий FPS - норма)
+        if self.scheduler.idle:
+            color = (150, 150, 150)  # Серый - простой
+        elif self.current_fps >= 55:
             color = (0, 255, 0)  # Зелёный - отлично
         elif self.current_fps >= 30:
             color = (255, 255, 0)  # Жёлтый - нормально
@@ -2047,9 +2335,19 @@ class Game:
             color = (255, 0, 0)  # Красный - плохо
         
         # Рисуем текст FPS
-        font = pygame.font.Font(None, 24)
-        fps_text = font.render(f"FPS: {self.current_fps}", True, color)
+        fps_text = render_text(f"FPS: {self.current_fps}", 24, color)
         self.screen.blit(fps_text, (self.width - 100, 15))
+        
+        # Доля экрана, выведенная в прошлом кадре (грязные прямоугольники)
+        redraw_text = render_text(f"Вывод {self.presenter.last_fraction:.0%}", 18, (200, 200, 200))
+        self.screen.blit(redraw_text, (self.width - 100, 38))
+        
+        if voice_stats:
+            dropped = voice_stats["dropped_limit"] + voice_stats["dropped_busy"]
+            voice_text = render_text(
+                f"SFX {voice_stats['active']}/{voice_stats['pool_size']} -{dropped}", 18, (200, 200, 200)
+            )
+            self.screen.blit(voice_text, (self.width - 100, 58))
 
 
 if __name__ == "__main__":
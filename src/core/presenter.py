@@ -0,0 +1,128 @@
+"""
+Вывод кадра на экран по грязным прямоугольникам
+
+Игра по-прежнему рисует кадр целиком в поверхность экрана, но на дисплей
+копируются только изменившиеся области: слои (игрок, враги, HUD, лог,
+частицы, миникарта) сообщают свои прямоугольники через mark(), а
+presenter добавляет к ним прямоугольники прошлого кадра (чтобы стереть
+старое положение) и вызывает pygame.display.update(rects).
+
+Если изменилось почти всё (сдвиг камеры, меню, переход на этаж) или
+область слишком большая, кадр выводится целиком одним flip. Presenter -
+единственное место, где кадр выдаётся на дисплей.
+"""
+from typing import List, Optional
+import pygame
+
+
+class FramePresenter:
+    """Вывод кадра: частичное обновление или полный flip"""
+
+    FULL_THRESHOLD = 0.5  # Доля экрана, начиная с которой выгоднее полный flip
+
+    def __init__(self, display):
+        """
+        Инициализация
+
+        Args:
+            display: Окно игры (core.display.Display)
+        """
+        self.display = display
+
+        self.rects: List[pygame.Rect] = []
+        self.previous_rects: List[pygame.Rect] = []
+        self.full = True  # Первый кадр - всегда целиком
+
+        self.stats = {"frames": 0, "full": 0, "partial": 0, "skipped": 0}
+        self.redrawn_pixels = 0
+        self.total_pixels = 0
+        self.last_fraction = 1.0  # Доля экрана, выведенная в последнем кадре
+
+    def mark(self, rect: Optional[pygame.Rect]) -> None:
+        """
+        Отметить изменившуюся область кадра
+
+        Args:
+            rect: Прямоугольник в координатах кадра (None игнорируется)
+        """
+        if rect is not None and rect.width > 0 and rect.height > 0:
+            self.rects.append(pygame.Rect(rect))
+
+    def mark_full(self) -> None:
+        """Кадр изменился целиком"""
+        self.full = True
+
+    def present(self) -> None:
+        """Вывести кадр и начать учёт следующего"""
+        screen_rect = pygame.Rect((0, 0), self.display.size)
+        screen_area = screen_rect.width * screen_rect.height
+
+        current = [rect.clip(screen_rect) for rect in self.rects]
+        dirty = [rect for rect in current + self.previous_rects if rect.width and rect.height]
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+
+        # Программное масштабирование растягивает кадр целиком - частичный вывод не помогает
+        if self.full or self.display.is_scaled or dirty_area >= screen_area * self.FULL_THRESHOLD:
+            self.display.present()
+            self.stats["full"] += 1
+            redrawn = screen_area
+        elif dirty:
+            self.display.present(dirty)
+            self.stats["partial"] += 1
+            redrawn = dirty_area
+        else:
+            self.stats["skipped"] += 1
+            redrawn = 0
+
+        self.stats["frames"] += 1
+        self.redrawn_pixels += redrawn
+        self.total_pixels += screen_area
+        self.last_fraction = redrawn / screen_area if screen_area else 0.0
+
+        # Области этого кадра нужно будет перерисовать и в следующем (стереть старое)
+        self.previous_rects = [rect for rect in current if rect.width and rect.height]
+        self.rects = []
+        self.full = False
+
+    def get_stats(self) -> dict:
+        """
+        Статистика вывода
+
+        Returns:
+            Счётчики кадров и средняя доля перерисованного экрана
+        """
+        return {
+            **self.stats,
+            "redrawn_fraction": self.redrawn_pixels / self.total_pixels if self.total_pixels else 0.0,
+        }
+
+    def report(self) -> None:
+        """Напечатать статистику вывода"""
+        stats = self.get_stats()
+        print(
+            f"🖼️  Вывод кадров: {stats['frames']} (целиком {stats['full']}, частично {stats['partial']}, "
+            f"без изменений {stats['skipped']}), перерисовано в среднем {stats['redrawn_fraction']:.1%} экрана"
+        )
+
+
+if __name__ == "__main__":
+    # Тест: квадрат двигается по неподвижному фону - выводится только его след
+    from .display import Display
+
+    pygame.init()
+    display = Display((800, 600))
+    screen = display.set_mode(fullscreen=False)
+    presenter = FramePresenter(display)
+
+    screen.fill((30, 30, 50))
+    for frame in range(300):
+        for event in pygame.event.get():
+            pass
+        rect = pygame.Rect(frame * 2 % 780, 290, 20, 20)
+        screen.fill((30, 30, 50), rect.inflate(8, 0))
+        pygame.draw.rect(screen, (255, 200, 0), rect)
+        presenter.mark(rect.inflate(8, 0))
+        presenter.present()
+
+    presenter.report()
+    pygame.quit()
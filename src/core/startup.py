@@ -0,0 +1,184 @@
+"""
+Ускорение запуска: ленивые подсистемы и профайлер запуска
+
+Профайлер включается флагом --profile-startup и печатает время импорта
+модулей (собственное, без вложенных импортов), время создания подсистем
+и время до первого кадра.
+"""
+import builtins
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    """Профайлер времени запуска"""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Инициализация профайлера
+
+        Args:
+            enabled: Включён ли профайлер (выключенный ничего не замеряет)
+        """
+        self.enabled = enabled
+        self.start_time = time.perf_counter()
+
+        # Модуль -> собственное время импорта (сек)
+        self.imports: Dict[str, float] = {}
+        # (раздел, время) в порядке выполнения
+        self.sections: List[Tuple[str, float]] = []
+
+        self.first_frame_time = None
+        self._original_import = None
+
+    @contextmanager
+    def measure(self, name: str):
+        """
+        Замерить время выполнения блока
+
+        Args:
+            name: Название раздела (подсистема, этап инициализации)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections.append((name, time.perf_counter() - start))
+
+    def install_import_hook(self) -> None:
+        """Начать замер времени импорта модулей"""
+        if not self.enabled or self._original_import is not None:
+            return
+
+        original_import = builtins.__import__
+        self._original_import = original_import
+        child_times: List[float] = []
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            modules_before = len(sys.modules)
+            start = time.perf_counter()
+            child_times.append(0.0)
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = child_times.pop()
+                if child_times:
+                    child_times[-1] += elapsed
+
+                # Учитываем только реальную загрузку новых модулей
+                if len(sys.modules) > modules_before:
+                    module_name = name
+                    if level > 0 and globals:
+                        try:
+                            module_name = importlib.util.resolve_name("." * level + name, globals.get("__package__"))
+                        except (ImportError, ValueError):
+                            pass
+                    self.imports[module_name] = self.imports.get(module_name, 0.0) + elapsed - children
+
+        builtins.__import__ = timed_import
+
+    def uninstall_import_hook(self) -> None:
+        """Прекратить замер времени импорта"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def mark_first_frame(self) -> None:
+        """Отметить вывод первого кадра и напечатать отчёт"""
+        if not self.enabled or self.first_frame_time is not None:
+            return
+
+        self.first_frame_time = time.perf_counter() - self.start_time
+        self.report("до первого кадра")
+
+    def report(self, title: str, top: int = 15) -> None:
+        """
+        Напечатать отчёт
+
+        Args:
+            title: Заголовок отчёта
+            top: Сколько самых медленных импортов показать
+        """
+        if not self.enabled:
+            return
+
+        elapsed = time.perf_counter() - self.start_time
+        print(f"\n⏱️  Профиль запуска ({title}): {elapsed * 1000:.1f} мс")
+
+        if self.first_frame_time is not None:
+            print(f"   Первый кадр: {self.first_frame_time * 1000:.1f} мс")
+
+        if self.imports:
+            total = sum(self.imports.values())
+            print(f"   Импорт модулей: {total * 1000:.1f} мс ({len(self.imports)} модулей)")
+            slowest = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:top]
+            for module_name, seconds in slowest:
+                print(f"      {seconds * 1000:8.1f} мс  {module_name}")
+
+        if self.sections:
+            print("   Инициализация:")
+            for name, seconds in self.sections:
+                print(f"      {seconds * 1000:8.1f} мс  {name}")
+
+
+class LazySubsystem:
+    """
+    Ленивая подсистема: создаётся при первом обращении к атрибуту
+
+    Использование в классе:
+        sound_manager = LazySubsystem("_create_sound_manager")
+
+    Фабрика вызывается один раз, результат кладётся в __dict__ экземпляра,
+    поэтому дальнейшие обращения идут напрямую, а присваивание атрибута
+    (например, пересоздание UI) работает как обычно. Если у владельца есть
+    атрибут profiler, время создания попадает в отчёт.
+    """
+
+    def __init__(self, factory_name: str):
+        """
+        Args:
+            factory_name: Имя метода-фабрики владельца
+        """
+        self.factory_name = factory_name
+        self.name = None
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        factory = getattr(instance, self.factory_name)
+        profiler = instance.__dict__.get("profiler")
+
+        if profiler is not None:
+            with profiler.measure(self.name):
+                value = factory()
+        else:
+            value = factory()
+
+        instance.__dict__[self.name] = value
+        return value
+
+    @staticmethod
+    def is_created(instance, name: str) -> bool:
+        """
+        Проверить, создана ли уже подсистема
+
+        Args:
+            instance: Владелец
+            name: Имя атрибута
+
+        Returns:
+            True если подсистема уже создана
+        """
+        return name in instance.__dict__
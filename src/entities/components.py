@@ -0,0 +1,308 @@
+"""
+Столбцовое хранилище компонентов сущностей
+
+Горячие данные сущностей (позиция, таймеры, состояние, флаги) лежат в
+NumPy-массивах по одному на компонент; строка массива - одна сущность.
+Холодные данные (тип, характеристики, патрульные точки) остаются в
+Python-объекте, который хранилище держит в списке objects в том же
+порядке, что и строки.
+
+Объект видит свою строку через дескриптор Component: чтение и запись
+атрибута идут в массив, поэтому старый код (enemy.x += 1) работает как
+прежде. Системы же обрабатывают все сущности разом, векторными
+операциями над столбцами: дистанция до игрока, маска видимости в тумане,
+поиск по клетке, уменьшение таймеров.
+
+Строки только добавляются; убитые сущности помечаются флагом, а при
+смене этажа создаётся новое хранилище.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+class Component:
+    """
+    Атрибут объекта, хранящийся в столбце ComponentStore
+
+    Использование в классе:
+        x = Component("x", int)
+
+    У объекта должны быть атрибуты _store (хранилище) и _row (строка).
+    """
+
+    def __init__(
+        self,
+        column: str,
+        convert=None,
+        names: Optional[Sequence[str]] = None,
+        missing: Optional[int] = None
+    ):
+        """
+        Args:
+            column: Имя столбца
+            convert: Приведение к типу Python при чтении (int, float, bool)
+            names: Значения перечисления (в столбце хранится индекс)
+            missing: Значение в столбце, означающее None (например, -1 для клетки)
+        """
+        self.column = column
+        self.convert = convert
+        self.names = tuple(names) if names else None
+        self.codes = {name: code for code, name in enumerate(self.names)} if names else None
+        self.missing = missing
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance._store.columns[self.column][instance._row]
+        if self.names:
+            return self.names[value]
+        if self.missing is not None and value == self.missing:
+            return None
+        return self.convert(value) if self.convert else value
+
+    def __set__(self, instance, value) -> None:
+        if self.codes:
+            value = self.codes[value]
+        elif value is None:
+            value = self.missing
+        instance._store.columns[self.column][instance._row] = value
+
+
+class ComponentStore:
+    """Столбцы компонентов и объекты сущностей"""
+
+    def __init__(self, schema: Dict[str, Any], capacity: int = 16):
+        """
+        Инициализация хранилища
+
+        Args:
+            schema: Имя столбца -> dtype NumPy
+            capacity: Начальная ёмкость (растёт удвоением)
+        """
+        self.schema = dict(schema)
+        self.capacity = max(capacity, 1)
+        self.count = 0
+        self.objects: List[Any] = []
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(self.capacity, dtype=dtype) for name, dtype in self.schema.items()
+        }
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, obj: Any, **values) -> int:
+        """
+        Добавить сущность
+
+        Args:
+            obj: Объект с холодными данными
+            **values: Начальные значения столбцов (остальные - нули)
+
+        Returns:
+            Номер строки сущности
+        """
+        if self.count == self.capacity:
+            self._grow()
+
+        row = self.count
+        self.count += 1
+        self.objects.append(obj)
+        for name, value in values.items():
+            self.columns[name][row] = value
+        return row
+
+    def _grow(self) -> None:
+        """Удвоить ёмкость (объекты обращаются к столбцам по имени, а не по ссылке)"""
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    def view(self, column: str) -> np.ndarray:
+        """
+        Заполненная часть столбца (представление, запись меняет хранилище)
+
+        Args:
+            column: Имя столбца
+
+        Returns:
+            Массив длиной len(self)
+        """
+        return self.columns[column][:self.count]
+
+    def decay(self, columns: Sequence[str], dt: float, rows=None) -> None:
+        """
+        Уменьшить таймеры на dt, не опуская ниже нуля
+
+        Args:
+            columns: Имена столбцов-таймеров
+            dt: Прошедшее время
+            rows: Маска или индексы строк (None - все)
+        """
+        for name in columns:
+            column = self.view(name)
+            if rows is None:
+                np.maximum(column - dt, 0.0, out=column)
+            else:
+                column[rows] = np.maximum(column[rows] - dt, 0.0)
+
+    def distance_to(self, x: int, y: int, metric: str = "manhattan") -> np.ndarray:
+        """
+        Расстояние от каждой сущности до клетки
+
+        Args:
+            x: Клетка X
+            y: Клетка Y
+            metric: "manhattan" или "chebyshev"
+
+        Returns:
+            Массив расстояний по строкам
+        """
+        dx = np.abs(self.view("x") - x)
+        dy = np.abs(self.view("y") - y)
+        if metric == "chebyshev":
+            return np.maximum(dx, dy)
+        return dx + dy
+
+    def visible_in(self, visibility: np.ndarray, state: int) -> np.ndarray:
+        """
+        Маска сущностей, стоящих на клетках с заданным состоянием тумана
+
+        Args:
+            visibility: Карта тумана (height, width)
+            state: Состояние клетки (например, FogOfWar.VISIBLE)
+
+        Returns:
+            Булева маска по строкам
+        """
+        return visibility[self.view("y"), self.view("x")] == state
+
+    def rows_at(self, x: int, y: int) -> np.ndarray:
+        """
+        Строки сущностей на клетке
+
+        Args:
+            x: Клетка X
+            y: Клетка Y
+
+        Returns:
+            Индексы строк по возрастанию
+        """
+        return np.flatnonzero((self.view("x") == x) & (self.view("y") == y))
+
+    def select(self, rows) -> List[Any]:
+        """
+        Объекты по маске или индексам строк (в порядке строк)
+
+        Args:
+            rows: Булева маска или массив индексов
+
+        Returns:
+            Список объектов
+        """
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        objects = self.objects
+        return [objects[row] for row in rows.tolist()]
+
+
+class PositionStore(ComponentStore):
+    """
+    Позиции неподвижных объектов уровня (ловушки, тайники) поверх их списка
+
+    Список объектов остаётся источником истины: хранилище перестраивается,
+    когда меняется сам список или его длина (генерация, загрузка этажа).
+    """
+
+    SCHEMA = {"x": np.int32, "y": np.int32}
+
+    def __init__(self):
+        """Инициализация (пустое хранилище)"""
+        super().__init__(self.SCHEMA)
+        self.signature: Optional[Tuple[int, int]] = None
+
+    def sync(self, objects: List[Any]) -> "PositionStore":
+        """
+        Привести хранилище к списку объектов
+
+        Args:
+            objects: Список объектов с атрибутами x, y
+
+        Returns:
+            self (для цепочек вызовов)
+        """
+        signature = (id(objects), len(objects))
+        if signature == self.signature:
+            return self
+
+        self.signature = signature
+        self.objects = list(objects)
+        self.count = len(objects)
+        self.capacity = max(self.count, 1)
+        self.columns = {
+            "x": np.array([obj.x for obj in objects] or [0], dtype=np.int32),
+            "y": np.array([obj.y for obj in objects] or [0], dtype=np.int32),
+        }
+        return self
+
+    def within(self, x: int, y: int, radius: int) -> List[Tuple[Any, int]]:
+        """
+        Объекты в квадрате радиуса radius вокруг клетки
+
+        Args:
+            x: Клетка X
+            y: Клетка Y
+            radius: Чебышёвский радиус
+
+        Returns:
+            Пары (объект, расстояние) в порядке списка
+        """
+        distance = self.distance_to(x, y, "chebyshev")
+        rows = np.flatnonzero(distance <= radius)
+        return [(self.objects[row], int(distance[row])) for row in rows.tolist()]
+
+    def at(self, x: int, y: int) -> List[Any]:
+        """
+        Объекты на клетке (в порядке списка)
+
+        Args:
+            x: Клетка X
+            y: Клетка Y
+
+        Returns:
+            Список объектов
+        """
+        return self.select(self.rows_at(x, y))
+
+
+if __name__ == "__main__":
+    # Тест: 10000 сущностей - дистанция, туман и таймеры одной операцией
+    import time
+
+    class Dummy:
+        x = Component("x", int)
+        y = Component("y", int)
+        cooldown = Component("cooldown", float)
+
+        def __init__(self, store: ComponentStore, x: int, y: int):
+            self._store = store
+            self._row = store.add(self, x=x, y=y, cooldown=1.0)
+
+    rng = np.random.default_rng(1)
+    store = ComponentStore({"x": np.int32, "y": np.int32, "cooldown": np.float64})
+    entities = [Dummy(store, int(x), int(y)) for x, y in rng.integers(0, 200, size=(10000, 2))]
+    visibility = (rng.random((200, 200)) < 0.1).astype(np.uint8) * 2
+
+    start = time.perf_counter()
+    for _ in range(100):
+        store.decay(["cooldown"], 1 / 60)
+        near = store.distance_to(100, 100) <= 8
+        seen = store.visible_in(visibility, 2)
+    elapsed = (time.perf_counter() - start) * 1000 / 100
+
+    print(f"Сущностей: {len(store)}, рядом: {int(near.sum())}, видимы: {int(seen.sum())}")
+    print(f"Кадр систем: {elapsed:.3f} мс, cooldown первой сущности: {entities[0].cooldown:.3f}")
+    entities[0].x += 1
+    print(f"Запись через атрибут: x={entities[0].x}, в столбце {store.view('x')[0]}")
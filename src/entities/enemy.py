@@ -6,6 +6,8 @@ import random
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, Tuple
+import numpy as np
+from .components import Component, ComponentStore
 
 
 class EnemyType(Enum):
@@ -27,10 +29,48 @@ class EnemyStats:
     attack_range: int = 1       # Дальность атаки
 
 
+# AI состояния врага (в столбце state хранится индекс)
+ENEMY_STATES = ("idle", "patrol", "chase", "attack")
+
+# Горячие компоненты врага - столбцы хранилища спавнера
+ENEMY_COMPONENTS = {
+    "x": np.int32,
+    "y": np.int32,
+    "target_x": np.int32,          # -1 - цели нет
+    "target_y": np.int32,
+    "move_cooldown": np.float64,
+    "attack_cooldown": np.float64,
+    "hit_timer": np.float64,
+    "state": np.uint8,
+    "dead": np.bool_,
+    "aggro": np.bool_,
+    # Копии характеристик для пакетного обновления (EnemySpawner.update_all)
+    "attack_range": np.int32,
+    "detection_range": np.int32,
+    "move_delay": np.float64,
+    "attack_delay": np.float64,
+}
+
+
 class Enemy:
     """Класс врага"""
     
-    def __init__(self, enemy_type: EnemyType, x: int, y: int):
+    HIT_FLASH = 0.15  # Секунд вспышки после попадания
+    
+    # Горячие данные - в столбцах ComponentStore, остальное - в объекте
+    x = Component("x", int)
+    y = Component("y", int)
+    target_x = Component("target_x", int, missing=-1)
+    target_y = Component("target_y", int, missing=-1)
+    move_cooldown = Component("move_cooldown", float)
+    attack_cooldown = Component("attack_cooldown", float)
+    hit_timer = Component("hit_timer", float)
+    state = Component("state", names=ENEMY_STATES)
+    is_dead = Component("dead", bool)
+    aggro = Component("aggro", bool)
+    attack_delay = Component("attack_delay", float)
+    
+    def __init__(self, enemy_type: EnemyType, x: int, y: int, store: Optional[ComponentStore] = None):
         """
         Инициализация врага
         
@@ -38,13 +78,21 @@ class Enemy:
             enemy_type: Тип врага
             x: Позиция X
             y: Позиция Y
+            store: Хранилище компонентов (None - собственное, для одиночного врага)
         """
+        self._store = store if store is not None else ComponentStore(ENEMY_COMPONENTS, capacity=1)
+        self._row = self._store.add(self)
+        
         self.enemy_type = enemy_type
         self.x = x
         self.y = y
         
-        # Характеристики
+        # Характеристики (дальности и задержка шага - ещё и в столбцах для пакетного обновления)
         self.stats = self._get_stats_for_type(enemy_type)
+        columns = self._store.columns
+        columns["attack_range"][self._row] = self.stats.attack_range
+        columns["detection_range"][self._row] = self.stats.detection_range
+        columns["move_delay"][self._row] = 1.0 / self.stats.speed
         
         # AI состояние
         self.state = "idle"  # idle, patrol, chase, attack
@@ -67,6 +115,7 @@ class Enemy:
         # Флаги
         self.is_dead = False
         self.aggro = False  # Агрессивен ли враг
+        self.hit_timer = 0.0  # Остаток вспышки после попадания
         
     def _get_stats_for_type(self, enemy_type: EnemyType) -> EnemyStats:
         """
@@ -135,6 +184,7 @@ class Enemy:
         # Обновляем таймеры
         self.move_cooldown = max(0, self.move_cooldown - dt)
         self.attack_cooldown = max(0, self.attack_cooldown - dt)
+        self.hit_timer = max(0, self.hit_timer - dt)
         
         # Проверяем дистанцию до игрока
         distance = abs(self.x - player_x) + abs(self.y - player_y)
@@ -265,6 +315,7 @@ class Enemy:
         """
         self.stats.health -= damage
         self.aggro = True  # Становится агрессивным
+        self.hit_timer = self.HIT_FLASH
         
         if self.stats.health <= 0:
             self.stats.health = 0
@@ -274,6 +325,42 @@ class Enemy:
             
         return False
         
+    def get_render_state(self) -> str:
+        """
+        Состояние для выбора подкрашенного спрайта
+        
+        Returns:
+            "hit" (вспышка после попадания), "aggro" или "normal"
+        """
+        if self.hit_timer > 0:
+            return "hit"
+        if self.aggro:
+            return "aggro"
+        return "normal"
+        
+    def get_blits(self, camera_x: int = 0, camera_y: int = 0) -> list:
+        """
+        Готовые поверхности врага для Surface.blits
+        
+        Args:
+            camera_x: Смещение камеры по X
+            camera_y: Смещение камеры по Y
+            
+        Returns:
+            Список (поверхность, позиция): спрайт и полоска здоровья (если ранен)
+        """
+        from ..graphics.enemy_sprites import get_enemy_sprite, get_health_bar, HEALTH_BAR_OFFSET
+        
+        screen_x = self.x * self.size - camera_x
+        screen_y = self.y * self.size - camera_y
+        
+        blits = [(get_enemy_sprite(self.enemy_type.value, self.get_render_state(), self.color), (screen_x, screen_y))]
+        
+        bar = get_health_bar(self.stats.health, self.stats.max_health)
+        if bar is not None:
+            blits.append((bar, (screen_x, screen_y - HEALTH_BAR_OFFSET)))
+        return blits
+        
     def render(self, screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0, fog_of_war=None) -> None:
         """
         Отрисовка врага
@@ -291,40 +378,7 @@ class Enemy:
         if fog_of_war and not fog_of_war.is_visible(self.x, self.y):
             return
             
-        # Вычисляем позицию на экране
-        screen_x = self.x * self.size - camera_x
-        screen_y = self.y * self.size - camera_y
-        
-        # Рисуем врага
-        pygame.draw.circle(
-            screen,
-            self.color,
-            (screen_x + self.size // 2, screen_y + self.size // 2),
-            self.size // 3
-        )
-        
-        # Контур
-        pygame.draw.circle(
-            screen,
-            (255, 255, 255),
-            (screen_x + self.size // 2, screen_y + self.size // 2),
-            self.size // 3,
-            1
-        )
-        
-        # Полоска здоровья
-        if self.stats.health < self.stats.max_health:
-            bar_width = self.size
-            bar_height = 4
-            bar_x = screen_x
-            bar_y = screen_y - 8
-            
-            # Фон
-            pygame.draw.rect(screen, (100, 0, 0), (bar_x, bar_y, bar_width, bar_height))
-            
-            # Здоровье
-            health_width = int(bar_width * (self.stats.health / self.stats.max_health))
-            pygame.draw.rect(screen, (0, 255, 0), (bar_x, bar_y, health_width, bar_height))
+        screen.blits(self.get_blits(camera_x, camera_y), doreturn=False)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,24 @@
 """
 Система спавна врагов
+
+Обновление всех врагов - пакетное (update_all): таймеры, дистанции до
+игрока и смена состояний считаются несколькими операциями NumPy над
+столбцами хранилища. В Python по одному обрабатываются только враги,
+которые в этом кадре действительно делают шаг.
 """
 import random
 from typing import List
-from .enemy import Enemy, EnemyType
+import numpy as np
+from .components import ComponentStore
+from .enemy import Enemy, EnemyType, ENEMY_COMPONENTS, ENEMY_STATES
+
+
+STATE_PATROL = ENEMY_STATES.index("patrol")
+STATE_CHASE = ENEMY_STATES.index("chase")
+STATE_ATTACK = ENEMY_STATES.index("attack")
+
+# Вероятность шага патрулирующего врага, когда его таймер готов
+PATROL_MOVE_CHANCE = 0.3
 
 
 class EnemySpawner:
@@ -13,6 +28,9 @@ class EnemySpawner:
         """Инициализация генератора"""
         self.enemies: List[Enemy] = []
         
+        # Горячие компоненты врагов (строка = индекс в self.enemies)
+        self.store = ComponentStore(ENEMY_COMPONENTS)
+        
     def spawn_enemies(self, level, floor_number: int) -> None:
         """
         Создать врагов на уровне
@@ -22,7 +40,7 @@ class EnemySpawner:
             floor_number: Номер этажа
         """
         # Очищаем старых врагов
-        self.enemies.clear()
+        self.clear()
         
         # Определяем количество врагов (больше на глубоких этажах)
         enemy_count = min(2 + floor_number // 3, 8)
@@ -57,19 +75,34 @@ class EnemySpawner:
                     continue
                     
             # Проверяем что не занято другим врагом
-            if any(e.x == x and e.y == y and not e.is_dead for e in self.enemies):
+            if self.get_enemy_at(x, y):
                 continue
                 
             # Выбираем случайный тип врага
             enemy_type = random.choice(possible_types)
             
             # Создаём врага
-            enemy = Enemy(enemy_type, x, y)
-            self.enemies.append(enemy)
+            self.add_enemy(enemy_type, x, y)
             spawned += 1
             
         print(f"👹 Создано {spawned} врагов на этаже {floor_number}")
         
+    def add_enemy(self, enemy_type: EnemyType, x: int, y: int) -> Enemy:
+        """
+        Добавить врага (строка в хранилище и объект в списке)
+        
+        Args:
+            enemy_type: Тип врага
+            x: Позиция X
+            y: Позиция Y
+            
+        Returns:
+            Созданный враг
+        """
+        enemy = Enemy(enemy_type, x, y, self.store)
+        self.enemies.append(enemy)
+        return enemy
+        
     def _get_enemy_types_for_floor(self, floor_number: int) -> List[EnemyType]:
         """
         Получить возможные типы врагов для этажа
@@ -112,17 +145,53 @@ class EnemySpawner:
         Returns:
             Список врагов которые атакуют
         """
-        attacking_enemies = []
+        store = self.store
+        if not len(store):
+            return []
         
-        for enemy in self.enemies:
-            if enemy.is_dead:
-                continue
-                
-            action = enemy.update(dt, player_x, player_y, level)
-            if action == "attack":
-                attacking_enemies.append(enemy)
-                
-        return attacking_enemies
+        columns = {name: store.view(name) for name in ENEMY_COMPONENTS}
+        alive = ~columns["dead"]
+        
+        # Таймеры живых врагов
+        store.decay(("move_cooldown", "attack_cooldown", "hit_timer"), dt, alive)
+        
+        # Манхэттенская дистанция до игрока
+        distance = np.abs(columns["x"] - player_x) + np.abs(columns["y"] - player_y)
+        
+        # Зоны поведения (порядок проверок как в Enemy.update)
+        attack = alive & (distance <= columns["attack_range"])
+        detect = alive & ~attack & (distance <= columns["detection_range"])
+        pursue = alive & ~attack & ~detect & columns["aggro"]
+        patrol = alive & ~attack & ~detect & ~pursue
+        
+        columns["state"][attack] = STATE_ATTACK
+        columns["state"][detect | pursue] = STATE_CHASE
+        columns["state"][patrol] = STATE_PATROL
+        
+        # Заметивший игрока враг становится агрессивным и запоминает цель
+        columns["aggro"][detect] = True
+        columns["target_x"][detect] = player_x
+        columns["target_y"][detect] = player_y
+        
+        # Атаки - разом: у готовых таймер перезаряжается
+        striking = attack & (columns["attack_cooldown"] <= 0)
+        columns["attack_cooldown"][striking] = columns["attack_delay"][striking]
+        
+        # Шаги - по одному, в порядке создания (случайность патруля как раньше)
+        ready = (detect | pursue | patrol) & (columns["move_cooldown"] <= 0)
+        objects = store.objects
+        move_delay = columns["move_delay"]
+        for row in np.flatnonzero(ready).tolist():
+            enemy = objects[row]
+            if patrol[row]:
+                if random.random() >= PATROL_MOVE_CHANCE:
+                    continue
+                enemy._patrol_move(level)
+            else:
+                enemy._move_towards_target(level)
+            columns["move_cooldown"][row] = move_delay[row]
+        
+        return store.select(striking)
         
     def render_all(self, screen, camera_x: int = 0, camera_y: int = 0, fog_of_war=None) -> None:
         """
@@ -148,10 +217,39 @@ class EnemySpawner:
         Returns:
             Враг или None
         """
-        for enemy in self.enemies:
-            if not enemy.is_dead and enemy.x == x and enemy.y == y:
-                return enemy
-        return None
+        rows = self.store.rows_at(x, y)
+        alive = rows[~self.store.view("dead")[rows]]
+        return self.store.objects[alive[0]] if len(alive) else None
+        
+    def get_alive(self) -> List[Enemy]:
+        """
+        Получить живых врагов
+        
+        Returns:
+            Список в порядке создания
+        """
+        return self.store.select(~self.store.view("dead"))
+        
+    def get_visible(self, visibility: np.ndarray, x0: int, y0: int, x1: int, y1: int) -> List[Enemy]:
+        """
+        Живые враги в прямоугольнике клеток на видимых клетках тумана
+        
+        Args:
+            visibility: Карта тумана (FogOfWar.visibility)
+            x0, y0: Левый верхний угол (включительно)
+            x1, y1: Правый нижний угол (не включительно)
+            
+        Returns:
+            Список в порядке создания
+        """
+        from ..world.fog_of_war import FogOfWar
+        
+        xs = self.store.view("x")
+        ys = self.store.view("y")
+        mask = ~self.store.view("dead") & (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        rows = np.flatnonzero(mask)
+        seen = visibility[ys[rows], xs[rows]] == FogOfWar.VISIBLE
+        return self.store.select(rows[seen])
         
     def get_alive_count(self) -> int:
         """
@@ -160,18 +258,46 @@ class EnemySpawner:
         Returns:
             Количество
         """
-        return sum(1 for e in self.enemies if not e.is_dead)
+        return int(np.count_nonzero(~self.store.view("dead")))
         
     def clear(self) -> None:
-        """Очистить всех врагов"""
+        """Очистить всех врагов (у старых объектов остаётся прежнее хранилище)"""
         self.enemies.clear()
+        self.store = ComponentStore(ENEMY_COMPONENTS)
 
 
 if __name__ == "__main__":
     # Тест спавнера
+    import time
+    from ..world.level import Level
+    
     spawner = EnemySpawner()
     
     # Тестируем типы врагов для разных этажей
     for floor in [1, 5, 10, 15, 20]:
         types = spawner._get_enemy_types_for_floor(floor)
         print(f"\nЭтаж {floor}: {[t.value for t in types]}")
+    
+    # Бенчмарк: пакетное обновление против Enemy.update по одному
+    level = Level(200, 200)
+    level._generate_test_level()
+    frames = 60
+    
+    print("\nВрагов   по одному, мс   пакетно, мс")
+    for count in (10, 100, 1000, 10000):
+        timings = []
+        for batched in (False, True):
+            random.seed(count)
+            spawner = EnemySpawner()
+            for _ in range(count):
+                spawner.add_enemy(random.choice(list(EnemyType)), random.randint(1, 198), random.randint(1, 198))
+            
+            start = time.perf_counter()
+            for _ in range(frames):
+                if batched:
+                    spawner.update_all(1 / 60, 100, 100, level)
+                else:
+                    for enemy in spawner.enemies:
+                        enemy.update(1 / 60, 100, 100, level)
+            timings.append((time.perf_counter() - start) * 1000 / frames)
+        print(f"{count:>6}   {timings[0]:>13.3f}   {timings[1]:>11.3f}")
@@ -0,0 +1,132 @@
+"""
+Готовые спрайты врагов и полоски здоровья
+
+Враг рисуется одним blit спрайта своего типа из атласа (enemy_rat,
+enemy_zombie, ...). Состояния (агрессия, вспышка при попадании) - это
+подкрашенные копии базового спрайта, создаваемые один раз на пару
+(тип, состояние).
+
+Полоска здоровья тоже готовая поверхность: заполнение квантуется до
+HEALTH_BAR_STEPS уровней, и на весь процесс создаётся не больше
+HEALTH_BAR_STEPS + 1 полосок.
+"""
+from typing import Dict, Optional, Tuple
+import pygame
+
+
+TILE_SIZE = 32
+
+HEALTH_BAR_STEPS = 16
+HEALTH_BAR_HEIGHT = 4
+HEALTH_BAR_OFFSET = 8          # Полоска над клеткой врага
+HEALTH_BAR_BACK = (100, 0, 0)
+HEALTH_BAR_FILL = (0, 255, 0)
+
+# Подкраска состояний: цвет, прибавляемый к RGB спрайта (альфа не меняется)
+STATE_TINTS: Dict[str, Tuple[int, int, int]] = {
+    "aggro": (60, 0, 0),
+    "hit": (160, 160, 160),
+}
+
+_sprites: Dict[Tuple[str, str], pygame.Surface] = {}
+_health_bars: Dict[int, pygame.Surface] = {}
+
+
+def _draw_fallback(color: Tuple[int, int, int]) -> pygame.Surface:
+    """Спрайт врага без атласа: круг с контуром"""
+    sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    center = (TILE_SIZE // 2, TILE_SIZE // 2)
+    pygame.draw.circle(sprite, color, center, TILE_SIZE // 3)
+    pygame.draw.circle(sprite, (255, 255, 255), center, TILE_SIZE // 3, 1)
+    return sprite
+
+
+def get_enemy_sprite(enemy_type: str, state: str = "normal", color: Tuple[int, int, int] = (255, 0, 255)) -> pygame.Surface:
+    """
+    Спрайт врага в заданном состоянии (создаётся при первом обращении)
+
+    Args:
+        enemy_type: Тип врага (значение EnemyType)
+        state: "normal", "aggro" или "hit"
+        color: Цвет для запасного спрайта, если в атласе нет такого типа
+
+    Returns:
+        Поверхность TILE_SIZE x TILE_SIZE (общая, не изменять)
+    """
+    key = (enemy_type, state)
+    sprite = _sprites.get(key)
+    if sprite is not None:
+        return sprite
+
+    if state == "normal":
+        from .texture_atlas import get_atlas
+        sprite = get_atlas().get_sprite(f"enemy_{enemy_type}") or _draw_fallback(color)
+    else:
+        sprite = get_enemy_sprite(enemy_type, "normal", color).copy()
+        sprite.fill(STATE_TINTS.get(state, (0, 0, 0)), special_flags=pygame.BLEND_RGB_ADD)
+
+    _sprites[key] = sprite
+    return sprite
+
+
+def get_health_bar(health: int, max_health: int) -> Optional[pygame.Surface]:
+    """
+    Полоска здоровья (квантованная до HEALTH_BAR_STEPS уровней)
+
+    Args:
+        health: Текущее здоровье
+        max_health: Максимальное здоровье
+
+    Returns:
+        Поверхность полоски или None (здоровье полное - полоска не рисуется)
+    """
+    if health >= max_health:
+        return None
+
+    # Живому врагу - хотя бы одна ступень, чтобы полоска не выглядела пустой
+    step = int(HEALTH_BAR_STEPS * max(health, 0) / max_health)
+    if health > 0:
+        step = max(step, 1)
+
+    bar = _health_bars.get(step)
+    if bar is None:
+        bar = pygame.Surface((TILE_SIZE, HEALTH_BAR_HEIGHT))
+        bar.fill(HEALTH_BAR_BACK)
+        bar.fill(HEALTH_BAR_FILL, (0, 0, TILE_SIZE * step // HEALTH_BAR_STEPS, HEALTH_BAR_HEIGHT))
+        _health_bars[step] = bar
+    return bar
+
+
+def get_cache_size() -> int:
+    """Сколько поверхностей врагов создано (спрайты состояний + полоски)"""
+    return len(_sprites) + len(_health_bars)
+
+
+if __name__ == "__main__":
+    # Тест: 2000 врагов с разным здоровьем - поверхностей создаётся несколько десятков
+    import random
+    import time
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    types = ["rat", "zombie", "ghost", "mutant"]
+    enemies = [
+        (random.choice(types), random.choice(["normal", "aggro", "hit"]),
+         random.randint(1, 50), random.randrange(0, 768), random.randrange(8, 568))
+        for _ in range(2000)
+    ]
+
+    start = time.perf_counter()
+    for frame in range(60):
+        blits = []
+        for enemy_type, state, health, x, y in enemies:
+            blits.append((get_enemy_sprite(enemy_type, state), (x, y)))
+            bar = get_health_bar(health, 50)
+            if bar is not None:
+                blits.append((bar, (x, y - HEALTH_BAR_OFFSET)))
+        screen.blits(blits, doreturn=False)
+    elapsed = (time.perf_counter() - start) * 1000 / 60
+
+    print(f"Кадр с 2000 врагов: {elapsed:.2f} мс, поверхностей в кэше: {get_cache_size()}")
+    pygame.quit()
@@ -0,0 +1,445 @@
+"""
+Единый проход отрисовки объектов уровня
+
+Раньше каждый вид объектов (препятствия, ловушки, записки, контейнеры,
+интерактивные объекты, руны, загадки, предметы, враги) рисовался своим
+циклом по всему этажу: своя проверка тумана, свои словари цветов,
+pygame.draw на каждый объект каждый кадр.
+
+Теперь неподвижные объекты лежат в пространственном индексе по чанкам
+клеток. Кадр:
+1. берёт из индекса только объекты в окне камеры;
+2. отсекает невидимые в тумане одной векторной маской;
+3. упорядочивает по слою (порядок записей в индексе = порядок слоёв);
+4. выводит готовые спрайты одним Surface.blits.
+
+Спрайт объекта рисуется один раз на каждое состояние (тип, открыт,
+прочитан, сработал...) и кэшируется на весь процесс. Враги попадают в
+тот же список готовыми спрайтами (graphics.enemy_sprites). Стоимость
+кадра зависит от того, что на экране, а не от населённости этажа.
+"""
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pygame
+from ..world.fog_of_war import FogOfWar
+
+
+TILE_SIZE = 32
+PAD = 8                        # Запас спрайта вокруг клетки (свечение рун, крупные значки)
+SPRITE_SIZE = TILE_SIZE + PAD * 2
+PULSE_STEPS = 8                # Ступени пульсации рун
+
+
+class SpatialIndex:
+    """Индекс точек по квадратным чанкам клеток"""
+
+    CHUNK = 8  # Размер чанка в клетках
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray):
+        """
+        Построить индекс
+
+        Args:
+            xs: Координаты X записей
+            ys: Координаты Y записей
+        """
+        self.xs = xs
+        self.ys = ys
+
+        # Записи, отсортированные по чанку; внутри чанка - в исходном порядке
+        chunk_x = xs // self.CHUNK
+        chunk_y = ys // self.CHUNK
+        order = np.lexsort((np.arange(len(xs)), chunk_y, chunk_x))
+
+        self.chunks: Dict[Tuple[int, int], np.ndarray] = {}
+        if len(order):
+            keys = np.stack((chunk_x[order], chunk_y[order]), axis=1)
+            starts = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+            for group in np.split(order, starts):
+                self.chunks[(int(chunk_x[group[0]]), int(chunk_y[group[0]]))] = group
+
+    def query(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """
+        Записи в прямоугольнике клеток [x0, x1) x [y0, y1)
+
+        Args:
+            x0, y0: Левый верхний угол (включительно)
+            x1, y1: Правый нижний угол (не включительно)
+
+        Returns:
+            Индексы записей по возрастанию
+        """
+        groups = [
+            self.chunks[(cx, cy)]
+            for cx in range(x0 // self.CHUNK, (x1 - 1) // self.CHUNK + 1)
+            for cy in range(y0 // self.CHUNK, (y1 - 1) // self.CHUNK + 1)
+            if (cx, cy) in self.chunks
+        ]
+        if not groups:
+            return np.empty(0, dtype=np.intp)
+
+        found = np.concatenate(groups)
+        xs = self.xs[found]
+        ys = self.ys[found]
+        found = found[(xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)]
+        found.sort()
+        return found
+
+
+class _Stairs:
+    """Вход или выход этажа как объект слоя"""
+
+    def __init__(self, pos: Tuple[int, int], color: Tuple[int, int, int]):
+        self.x, self.y = pos
+        self.color = color
+
+
+# ---------- Спрайты слоёв ----------
+# key(obj, pulse) -> ключ состояния (None - объект сейчас не рисуется)
+# draw(surface, obj, key) -> рисует объект; клетка объекта лежит в (PAD, PAD)
+
+def _stairs_key(stairs: _Stairs, pulse: int) -> tuple:
+    return (stairs.color,)
+
+
+def _draw_stairs(surface: pygame.Surface, stairs: _Stairs, key: tuple) -> None:
+    center = (PAD + TILE_SIZE // 2, PAD + TILE_SIZE // 2)
+    pygame.draw.circle(surface, stairs.color, center, TILE_SIZE // 3)
+
+
+_obstacle_colors: Dict[Any, Tuple[int, int, int]] = {}
+
+
+def _obstacle_key(obstacle, pulse: int) -> tuple:
+    return (obstacle.obstacle_type,)
+
+
+def _draw_obstacle(surface: pygame.Surface, obstacle, key: tuple) -> None:
+    from ..world.obstacles import ObstacleType
+
+    if not _obstacle_colors:
+        _obstacle_colors.update({
+            ObstacleType.PILLAR: (120, 120, 120),  # Серый
+            ObstacleType.TABLE: (139, 69, 19),  # Коричневый
+            ObstacleType.STATUE: (160, 160, 160),  # Светло-серый
+            ObstacleType.RUBBLE: (100, 100, 100),  # Тёмно-серый
+            ObstacleType.PIT: (20, 20, 20),  # Почти чёрный
+            ObstacleType.WATER: (0, 100, 200),  # Синий
+            ObstacleType.LAVA: (255, 100, 0),  # Оранжевый
+        })
+
+    color = _obstacle_colors.get(obstacle.obstacle_type, (100, 100, 100))
+
+    if obstacle.obstacle_type == ObstacleType.PILLAR:
+        # Колонна - круг
+        pygame.draw.circle(surface, color, (PAD + TILE_SIZE // 2, PAD + TILE_SIZE // 2), TILE_SIZE // 3)
+    elif obstacle.obstacle_type in [ObstacleType.WATER, ObstacleType.LAVA]:
+        # Вода/лава - вся клетка
+        pygame.draw.rect(surface, color, (PAD, PAD, TILE_SIZE, TILE_SIZE))
+    else:
+        # Остальные - квадрат
+        pygame.draw.rect(surface, color, (PAD + 4, PAD + 4, TILE_SIZE - 8, TILE_SIZE - 8))
+
+
+_trap_colors: Dict[Any, Tuple[int, int, int]] = {}
+
+
+def _trap_key(trap, pulse: int) -> Optional[tuple]:
+    from ..world.traps import TrapType
+
+    # Скрытые ловушки невидимы до обнаружения
+    if not trap.is_visible():
+        return None
+
+    # Не показываем сработавшие одноразовые ловушки
+    if trap.triggered and trap.trap_type not in [TrapType.FIRE, TrapType.ICE, TrapType.POISON]:
+        return None
+
+    return (trap.trap_type, trap.is_hidden, trap.triggered, trap.detected)
+
+
+def _draw_trap(surface: pygame.Surface, trap, key: tuple) -> None:
+    from ..world.traps import TrapType
+
+    if not _trap_colors:
+        _trap_colors.update({
+            TrapType.SPIKES: (150, 150, 150),  # Серый
+            TrapType.ARROW: (139, 69, 19),  # Коричневый
+            TrapType.FIRE: (255, 100, 0),  # Оранжевый
+            TrapType.ICE: (100, 200, 255),  # Голубой
+            TrapType.TELEPORT: (200, 100, 255),  # Фиолетовый
+            TrapType.POISON: (100, 200, 100),  # Зелёный
+            TrapType.COLLAPSE: (100, 100, 100),  # Тёмно-серый
+            TrapType.EXPLOSIVE: (255, 50, 50),  # Красный
+        })
+
+    color = _trap_colors.get(trap.trap_type, (200, 200, 0))
+
+    # Сработавшая - полупрозрачная, обнаруженная - тусклая
+    if trap.triggered:
+        color = tuple(c // 2 for c in color)
+    if trap.detected and not trap.triggered:
+        color = tuple(c * 2 // 3 for c in color)
+
+    center_x = PAD + TILE_SIZE // 2
+    center_y = PAD + TILE_SIZE // 2
+
+    if not trap.is_hidden:
+        # Видимые механизмы - квадраты
+        size = 12
+        pygame.draw.rect(surface, color, (center_x - size, center_y - size, size * 2, size * 2))
+        pygame.draw.rect(surface, (255, 255, 0), (center_x - size, center_y - size, size * 2, size * 2), 2)
+    else:
+        # Скрытые ловушки (обнаруженные) - треугольники с восклицательным знаком
+        size = 10
+        points = [
+            (center_x, center_y - size),  # Верх
+            (center_x - size, center_y + size),  # Левый нижний
+            (center_x + size, center_y + size),  # Правый нижний
+        ]
+        pygame.draw.polygon(surface, color, points)
+        pygame.draw.polygon(surface, (255, 255, 0), points, 2)
+        pygame.draw.line(surface, (0, 0, 0), (center_x, center_y - 4), (center_x, center_y + 2), 2)
+        pygame.draw.circle(surface, (0, 0, 0), (center_x, center_y + 5), 1)
+
+
+def _note_key(note, pulse: int) -> tuple:
+    return (note.read,)
+
+
+def _draw_note(surface: pygame.Surface, note, key: tuple) -> None:
+    # Серый если прочитана, жёлтый если нет
+    color = (150, 150, 150) if note.read else (255, 220, 150)
+    rect = (PAD + 8, PAD + 8, TILE_SIZE - 16, TILE_SIZE - 16)
+    pygame.draw.rect(surface, color, rect)
+    pygame.draw.rect(surface, (100, 100, 100), rect, 2)
+
+    # Строчки текста
+    for line_y in (14, 18):
+        pygame.draw.line(
+            surface, (50, 50, 50), (PAD + 12, PAD + line_y), (PAD + TILE_SIZE - 12, PAD + line_y), 2
+        )
+
+
+def _container_key(container, pulse: int) -> Optional[tuple]:
+    # Тайники видны только после обнаружения
+    if not container.is_visible():
+        return None
+    return (container.container_type, container.opened)
+
+
+def _draw_container(surface: pygame.Surface, container, key: tuple) -> None:
+    container.render(surface, container.x * TILE_SIZE - PAD, container.y * TILE_SIZE - PAD, TILE_SIZE)
+
+
+def _interactive_key(obj, pulse: int) -> tuple:
+    return (obj.obj_type, obj.interacted)
+
+
+def _draw_interactive(surface: pygame.Surface, obj, key: tuple) -> None:
+    from .texture_atlas import get_atlas
+    from .text_cache import render_text
+
+    sprite = obj.get_sprite(get_atlas())
+    if sprite:
+        surface.blit(sprite, (PAD, PAD))
+        return
+
+    # Fallback - цветной квадрат с символом
+    pygame.draw.rect(surface, obj.get_color(), (PAD + 4, PAD + 4, TILE_SIZE - 8, TILE_SIZE - 8))
+    text = render_text(obj.get_display_char(), 28, (255, 255, 255))
+    surface.blit(text, text.get_rect(center=(PAD + TILE_SIZE // 2, PAD + TILE_SIZE // 2)))
+
+
+def _rune_key(rune, pulse: int) -> Optional[tuple]:
+    if rune.collected:
+        return None
+    return (rune.color, rune.size, pulse)
+
+
+def _draw_rune(surface: pygame.Surface, rune, key: tuple) -> None:
+    pulse = 0.7 + 0.3 * key[2] / (PULSE_STEPS - 1)
+    rune.render(surface, rune.x * TILE_SIZE - PAD, rune.y * TILE_SIZE - PAD, pulse=pulse)
+
+
+def _riddle_key(riddle, pulse: int) -> tuple:
+    return (riddle.solved,)
+
+
+def _draw_riddle(surface: pygame.Surface, riddle, key: tuple) -> None:
+    riddle.render(surface, riddle.x * TILE_SIZE - PAD, riddle.y * TILE_SIZE - PAD)
+
+
+def _item_key(item_spawn, pulse: int) -> Optional[tuple]:
+    if item_spawn.picked_up:
+        return None
+    return (item_spawn.item.get_rarity_color(),)
+
+
+def _draw_item(surface: pygame.Surface, item_spawn, key: tuple) -> None:
+    item_spawn.render(surface, item_spawn.x * TILE_SIZE - PAD, item_spawn.y * TILE_SIZE - PAD)
+
+
+# Слои снизу вверх: (имя, источник объектов, ключ состояния, рисование)
+LAYERS: List[Tuple[str, Callable, Callable, Callable]] = [
+    ("stairs", lambda level: [
+        _Stairs(pos, color)
+        for pos, color in ((level.entrance_pos, (0, 255, 0)), (level.exit_pos, (255, 0, 0)))
+        if pos
+    ], _stairs_key, _draw_stairs),
+    ("obstacles", lambda level: level.obstacles, _obstacle_key, _draw_obstacle),
+    ("traps", lambda level: level.traps, _trap_key, _draw_trap),
+    ("notes", lambda level: level.notes, _note_key, _draw_note),
+    ("containers", lambda level: level.containers, _container_key, _draw_container),
+    ("interactive", lambda level: level.interactive_objects, _interactive_key, _draw_interactive),
+    ("runes", lambda level: level.rune_manager.runes, _rune_key, _draw_rune),
+    ("riddles", lambda level: level.riddle_manager.riddles, _riddle_key, _draw_riddle),
+    ("items", lambda level: level.item_spawner.spawned_items, _item_key, _draw_item),
+]
+
+# Спрайты всех уровней: (слой, ключ состояния) -> поверхность
+_sprites: Dict[tuple, pygame.Surface] = {}
+
+
+class EntityLayer:
+    """Объекты одного уровня, выводимые одним проходом"""
+
+    def __init__(self, level):
+        """
+        Инициализация слоя
+
+        Args:
+            level: Уровень (world.level.Level)
+        """
+        self.level = level
+
+        # Неподвижные объекты всех слоёв: объект и номер слоя каждой записи
+        self.entries: List[Any] = []
+        self.entry_layers: List[int] = []
+        self.index: Optional[SpatialIndex] = None
+        self.signature: Optional[tuple] = None
+
+        self.stats = {"rebuilds": 0, "drawn": 0}
+
+    def _sources(self) -> List[list]:
+        """Текущие списки объектов каждого слоя"""
+        return [source(self.level) for _, source, _, _ in LAYERS]
+
+    def _sync_index(self) -> None:
+        """Перестроить индекс, если изменился состав объектов (генерация, выброшенный предмет)"""
+        level = self.level
+        lists = [
+            level.obstacles, level.traps, level.notes, level.containers, level.interactive_objects,
+            level.rune_manager.runes, level.riddle_manager.riddles, level.item_spawner.spawned_items,
+        ]
+        signature = (level.entrance_pos, level.exit_pos) + tuple((id(objects), len(objects)) for objects in lists)
+        if signature == self.signature:
+            return
+
+        self.signature = signature
+        self.entries = []
+        self.entry_layers = []
+        for layer, objects in enumerate(self._sources()):
+            self.entries.extend(objects)
+            self.entry_layers.extend([layer] * len(objects))
+
+        xs = np.array([obj.x for obj in self.entries], dtype=np.int32)
+        ys = np.array([obj.y for obj in self.entries], dtype=np.int32)
+        self.index = SpatialIndex(xs, ys)
+        self.stats["rebuilds"] += 1
+
+    def _get_sprite(self, layer: int, key: tuple, obj) -> pygame.Surface:
+        """Спрайт объекта в данном состоянии (рисуется при первом обращении)"""
+        name, _, _, draw = LAYERS[layer]
+        cache_key = (name,) + key
+        sprite = _sprites.get(cache_key)
+        if sprite is None:
+            sprite = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE), pygame.SRCALPHA)
+            draw(sprite, obj, key)
+            _sprites[cache_key] = sprite
+        return sprite
+
+    def get_view(self, screen: pygame.Surface, camera_x: int, camera_y: int) -> Tuple[int, int, int, int]:
+        """
+        Прямоугольник клеток, попадающих в окно камеры (с запасом на спрайты)
+
+        Returns:
+            (x0, y0, x1, y1) - правая и нижняя границы не включительно
+        """
+        width, height = screen.get_size()
+        x0 = max(0, (camera_x - PAD) // TILE_SIZE)
+        y0 = max(0, (camera_y - PAD) // TILE_SIZE)
+        x1 = min(self.level.width, (camera_x + width + PAD) // TILE_SIZE + 1)
+        y1 = min(self.level.height, (camera_y + height + PAD) // TILE_SIZE + 1)
+        return x0, y0, x1, y1
+
+    def render(self, screen: pygame.Surface, camera_x: int, camera_y: int) -> None:
+        """
+        Нарисовать видимые объекты уровня
+
+        Args:
+            screen: Поверхность для отрисовки
+            camera_x: Смещение камеры по X
+            camera_y: Смещение камеры по Y
+        """
+        self._sync_index()
+        x0, y0, x1, y1 = self.get_view(screen, camera_x, camera_y)
+        visibility = self.level.fog_of_war.visibility
+
+        # Окно камеры из индекса, затем туман одной маской
+        found = self.index.query(x0, y0, x1, y1) if x1 > x0 and y1 > y0 else np.empty(0, dtype=np.intp)
+        xs = self.index.xs[found]
+        ys = self.index.ys[found]
+        visible = visibility[ys, xs] == FogOfWar.VISIBLE
+        found, xs, ys = found[visible], xs[visible], ys[visible]
+
+        # Пульсация рун - общая для кадра, квантуется до PULSE_STEPS спрайтов
+        pulse = round(abs(math.sin(time.time() * 3)) * (PULSE_STEPS - 1))
+
+        blits = []
+        for entry, x, y in zip(found.tolist(), xs.tolist(), ys.tolist()):
+            obj = self.entries[entry]
+            layer = self.entry_layers[entry]
+            key = LAYERS[layer][2](obj, pulse)
+            if key is None:
+                continue
+            sprite = self._get_sprite(layer, key, obj)
+            blits.append((sprite, (x * TILE_SIZE - camera_x - PAD, y * TILE_SIZE - camera_y - PAD)))
+
+        # Враги двигаются - их окно и туман проверяются каждый кадр по столбцам, рисуются поверх остальных
+        for enemy in self.level.enemy_spawner.get_visible(visibility, x0, y0, x1, y1):
+            blits.extend(enemy.get_blits(camera_x, camera_y))
+
+        screen.blits(blits, doreturn=False)
+        self.stats["drawn"] += len(blits)
+
+    def get_stats(self) -> dict:
+        """Статистика: перестроения индекса, выведенные объекты, спрайтов в кэше"""
+        return {**self.stats, "sprites": len(_sprites)}
+
+
+if __name__ == "__main__":
+    # Тест: этаж с тысячей колонн, в окне камеры - только малая часть
+    from ..world.level import Level
+    from ..world.obstacles import Obstacle, ObstacleType
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    level = Level(200, 200)
+    level.fog_of_war.visibility[:] = FogOfWar.VISIBLE
+    rng = np.random.default_rng(1)
+    level.obstacles = [
+        Obstacle(int(x), int(y), ObstacleType.PILLAR) for x, y in rng.integers(0, 200, size=(1000, 2))
+    ]
+
+    layer = EntityLayer(level)
+    start = time.perf_counter()
+    for frame in range(300):
+        layer.render(screen, 1600 + frame, 1600)
+    elapsed = (time.perf_counter() - start) * 1000 / 300
+
+    print(f"Кадр: {elapsed:.3f} мс, {layer.get_stats()}")
+    pygame.quit()
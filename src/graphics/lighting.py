@@ -0,0 +1,244 @@
+"""
+Освещение тёмных этажей
+
+Карта света - массив NumPy (высота, ширина) с яркостью каждой клетки.
+Каждый источник (игрок, лава, кристаллы, порталы) добавляет в буфер
+накопления готовое ядро затухания - квадрат (2r+1)x(2r+1), вычисленный
+один раз и закэшированный по радиусу и силе. Статические источники
+накапливаются в отдельный буфер один раз (заново - только если сменились
+списки объектов уровня), при движении игрока пересчитывается только
+его вклад.
+
+На экран свет накладывается одной операцией: видимое окно карты
+переводится в маленькую поверхность через surfarray (пиксель = клетка),
+растягивается до размера тайлов и умножается на кадр (BLEND_MULT).
+Поверхность пересобирается, только когда изменился свет или окно камеры.
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pygame
+
+
+# Параметры источников света: (радиус в клетках, сила)
+LIGHT_SOURCES: Dict[str, Tuple[int, float]] = {
+    "player": (7, 1.0),
+    "lava": (4, 0.8),
+    "crystal": (4, 0.6),
+    "portal": (3, 0.7),
+}
+
+# Доля lighting_modifier биома, которая остаётся в полной темноте
+AMBIENT_SCALE = 0.35
+
+# Кэш ядер затухания: (радиус, сила) -> массив (2r+1, 2r+1)
+_kernels: Dict[Tuple[int, float], np.ndarray] = {}
+
+
+def get_kernel(radius: int, intensity: float) -> np.ndarray:
+    """
+    Ядро затухания света (кэшируется)
+
+    Args:
+        radius: Радиус в клетках
+        intensity: Яркость в центре
+
+    Returns:
+        Массив (2r+1, 2r+1) float32
+    """
+    key = (radius, intensity)
+    kernel = _kernels.get(key)
+    if kernel is None:
+        offsets = np.arange(-radius, radius + 1, dtype=np.float32)
+        distance = np.sqrt(offsets[:, None] ** 2 + offsets[None, :] ** 2)
+        falloff = np.clip(1.0 - distance / (radius + 0.5), 0.0, 1.0)
+        kernel = (falloff * falloff * intensity).astype(np.float32)
+        _kernels[key] = kernel
+    return kernel
+
+
+def stamp(buffer: np.ndarray, x: int, y: int, kernel: np.ndarray) -> None:
+    """
+    Добавить ядро в буфер накопления с центром в (x, y)
+
+    Args:
+        buffer: Буфер (высота, ширина)
+        x: Клетка X
+        y: Клетка Y
+        kernel: Ядро затухания
+    """
+    radius = kernel.shape[0] // 2
+    height, width = buffer.shape
+
+    x0, x1 = max(0, x - radius), min(width, x + radius + 1)
+    y0, y1 = max(0, y - radius), min(height, y + radius + 1)
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    buffer[y0:y1, x0:x1] += kernel[
+        y0 - (y - radius):y1 - (y - radius),
+        x0 - (x - radius):x1 - (x - radius)
+    ]
+
+
+class LightMap:
+    """Карта освещения уровня"""
+
+    def __init__(self, level, ambient: float):
+        """
+        Инициализация карты света
+
+        Args:
+            level: Уровень
+            ambient: Минимальная яркость клетки (0.0 - 1.0)
+        """
+        self.level = level
+        self.ambient = ambient
+        self.tile_size = level.tile_size
+
+        # Вклад неподвижных источников и итоговая яркость
+        self.static_light = np.zeros((level.height, level.width), dtype=np.float32)
+        self.light = np.zeros_like(self.static_light)
+
+        self.static_signature: Optional[tuple] = None
+        self.player_pos: Optional[Tuple[int, int]] = None
+        self.version = 0  # Растёт при каждом пересчёте света
+
+        # Готовый оверлей и ключ, для которого он собран
+        self.overlay: Optional[pygame.Surface] = None
+        self.overlay_key: Optional[tuple] = None
+
+        self.recomputes = 0
+
+    def _static_sources(self) -> List[Tuple[str, int, int]]:
+        """Неподвижные источники уровня: (тип, x, y)"""
+        from ..world.obstacles import ObstacleType
+
+        sources = [
+            ("lava", obstacle.x, obstacle.y)
+            for obstacle in self.level.obstacles
+            if obstacle.obstacle_type == ObstacleType.LAVA
+        ]
+        sources.extend(("crystal", x, y) for x, y in self.level.crystals)
+        sources.extend(("portal", x, y) for x, y in self.level.portals)
+        return sources
+
+    def update(self, player_x: int, player_y: int) -> bool:
+        """
+        Пересчитать свет, если источники сдвинулись
+
+        Args:
+            player_x: Позиция игрока X
+            player_y: Позиция игрока Y
+
+        Returns:
+            True если карта пересчитана
+        """
+        # Подпись - сами списки и их длины (как в EntityLayer), без обхода объектов каждый кадр
+        level = self.level
+        signature = tuple((id(objects), len(objects)) for objects in (level.obstacles, level.crystals, level.portals))
+        static_changed = signature != self.static_signature
+
+        if static_changed:
+            self.static_signature = signature
+            self.static_light.fill(self.ambient)
+            for kind, x, y in self._static_sources():
+                stamp(self.static_light, x, y, get_kernel(*LIGHT_SOURCES[kind]))
+
+        if not static_changed and self.player_pos == (player_x, player_y):
+            return False
+
+        self.player_pos = (player_x, player_y)
+        np.copyto(self.light, self.static_light)
+        stamp(self.light, player_x, player_y, get_kernel(*LIGHT_SOURCES["player"]))
+        np.clip(self.light, 0.0, 1.0, out=self.light)
+
+        self.version += 1
+        self.recomputes += 1
+        return True
+
+    def get_intensity(self, x: int, y: int) -> float:
+        """
+        Яркость клетки
+
+        Args:
+            x: Клетка X
+            y: Клетка Y
+
+        Returns:
+            Яркость (0.0 - 1.0)
+        """
+        if 0 <= x < self.level.width and 0 <= y < self.level.height:
+            return float(self.light[y, x])
+        return 0.0
+
+    def render(self, screen: pygame.Surface, camera_x: int, camera_y: int) -> None:
+        """
+        Наложить освещение на кадр (умножением)
+
+        Args:
+            screen: Поверхность кадра (уровень уже нарисован)
+            camera_x: Смещение камеры по X
+            camera_y: Смещение камеры по Y
+        """
+        screen_width, screen_height = screen.get_size()
+        tile = self.tile_size
+
+        # Окно карты с запасом в клетку - края растянутого оверлея за экраном
+        start_x = max(0, camera_x // tile - 1)
+        start_y = max(0, camera_y // tile - 1)
+        end_x = min(self.level.width, (camera_x + screen_width) // tile + 2)
+        end_y = min(self.level.height, (camera_y + screen_height) // tile + 2)
+        if start_x >= end_x or start_y >= end_y:
+            return
+
+        key = (self.version, start_x, start_y, end_x, end_y)
+        if key != self.overlay_key:
+            self.overlay_key = key
+            self.overlay = self._build_overlay(start_x, start_y, end_x, end_y)
+
+        screen.blit(
+            self.overlay,
+            (start_x * tile - camera_x, start_y * tile - camera_y),
+            special_flags=pygame.BLEND_MULT
+        )
+
+    def _build_overlay(self, start_x: int, start_y: int, end_x: int, end_y: int) -> pygame.Surface:
+        """
+        Собрать поверхность-множитель для окна карты
+
+        Returns:
+            Поверхность размером окна в пикселях
+        """
+        window = self.light[start_y:end_y, start_x:end_x]
+        values = (window.T * 255).astype(np.uint8)  # surfarray ждёт (x, y)
+
+        cells = pygame.Surface(values.shape)
+        pygame.surfarray.blit_array(cells, np.repeat(values[:, :, None], 3, axis=2))
+
+        size = (values.shape[0] * self.tile_size, values.shape[1] * self.tile_size)
+        return pygame.transform.smoothscale(cells, size)
+
+
+if __name__ == "__main__":
+    # Тест: игрок ходит по тёмному уровню, свет пересчитывается только при шаге
+    import time
+    from ..world.level import Level
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    level = Level(60, 40, floor_number=16)
+    level._generate_test_level()
+    level.crystals = [(10, 10), (30, 20)]
+    level.portals = [(45, 30)]
+
+    light_map = LightMap(level, ambient=0.2)
+    for step in range(20):
+        start = time.perf_counter()
+        light_map.update(5 + step // 2, 20)
+        screen.fill((120, 120, 120))
+        light_map.render(screen, 0, 0)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Шаг {step}: {elapsed:.3f} мс, пересчётов {light_map.recomputes}")
+
+    pygame.quit()
@@ -1,91 +1,101 @@
 """
 Система частиц для визуальных эффектов
+
+Частицы хранятся не объектами, а набором заранее выделенных массивов
+NumPy (структура массивов): позиция, скорость, время жизни, гравитация,
+цвет и размер. Обновление - несколько векторных операций на весь набор,
+мёртвые частицы удаляются перестановкой последних живых на их место
+(swap-remove), без сдвига массивов.
+
+При отрисовке размер и прозрачность частицы квантуются, а спрайт круга
+для каждой тройки (цвет, размер, ступень прозрачности) рисуется один раз
+и берётся из кэша. Частицы за пределами экрана отбрасываются до blit,
+видимые выводятся одним вызовом Surface.blits.
 """
 import pygame
-import random
-from typing import List, Tuple
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+# Параметры эффектов
+EFFECTS: Dict[str, dict] = {
+    "explosion": {
+        "speed": (50, 150), "lift": 0.0,
+        "colors": [(255, 200, 0), (255, 100, 0), (255, 50, 0)],   # Жёлтый, оранжевый, красный
+        "lifetime": (0.3, 0.8), "size": (2, 5), "gravity": 100.0,
+    },
+    "blood": {
+        "speed": (30, 100), "lift": -50.0,  # Брызги летят вверх
+        "colors": [(200, 0, 0), (255, 0, 0), (150, 0, 0)],
+        "lifetime": (0.5, 1.0), "size": (2, 4), "gravity": 200.0,
+    },
+    "sparkle": {
+        "speed": (20, 80), "lift": 0.0,
+        "colors": [(255, 255, 0), (255, 255, 255), (255, 200, 100)],  # Жёлтый, белый, золотой
+        "lifetime": (0.2, 0.5), "size": (1, 3), "gravity": 0.0,
+    },
+    "smoke": {
+        "box": ((-20, 20), (-80, -40)),  # Скорость по осям, а не по кругу (поднимается вверх)
+        "colors": [(100, 100, 100), (80, 80, 80), (120, 120, 120)],
+        "lifetime": (0.8, 1.5), "size": (4, 8), "gravity": -20.0,
+    },
+}
+
+ALPHA_STEPS = 16  # Ступеней прозрачности в кэше спрайтов
+MAX_RADIUS = 255  # Размер частицы хранится в uint8
 
 
-class Particle:
-    """Класс частицы"""
+class ParticleSystem:
+    """Система частиц (структура массивов NumPy)"""
     
-    def __init__(self, x: float, y: float, vx: float, vy: float, 
-                 color: Tuple[int, int, int], lifetime: float = 1.0, size: int = 3):
-        """
-        Инициализация частицы
-        
-        Args:
-            x, y: Позиция
-            vx, vy: Скорость
-            color: Цвет RGB
-            lifetime: Время жизни в секундах
-            size: Размер
-        """
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = size
-        self.gravity = 100.0  # Гравитация
-        
-    def update(self, dt: float) -> bool:
+    INITIAL_CAPACITY = 1024
+    
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
         """
-        Обновление частицы
+        Инициализация системы
         
         Args:
-            dt: Delta time
-            
-        Returns:
-            True если частица жива
+            capacity: Начальная ёмкость массивов (растёт удвоением)
         """
-        self.lifetime -= dt
+        self.count = 0
+        self.capacity = 0
+        self._allocate(capacity)
         
-        if self.lifetime <= 0:
-            return False
-            
-        # Обновляем позицию
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        
-        # Применяем гравитацию
-        self.vy += self.gravity * dt
+        # Таблица цветов (индекс в массиве color) и кэш спрайтов кругов
+        self.colors: List[Tuple[int, int, int]] = []
+        self.color_index: Dict[Tuple[int, int, int], int] = {}
+        self.sprites: Dict[Tuple[int, int, int], pygame.Surface] = {}
+        self.sprite_table = np.empty(0, dtype=object)  # Код спрайта -> поверхность (для векторного выбора)
         
-        return True
+        self.rng = np.random.default_rng()
         
-    def render(self, screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0) -> None:
+    def _allocate(self, capacity: int) -> None:
         """
-        Отрисовка частицы
+        Выделить массивы (с копированием живых частиц)
         
         Args:
-            screen: Поверхность для отрисовки
-            camera_x, camera_y: Смещение камеры
+            capacity: Новая ёмкость
         """
-        # Вычисляем прозрачность
-        alpha = int(255 * (self.lifetime / self.max_lifetime))
-        
-        # Вычисляем размер (уменьшается со временем)
-        current_size = max(1, int(self.size * (self.lifetime / self.max_lifetime)))
+        fields = {
+            "x": np.float32, "y": np.float32, "vx": np.float32, "vy": np.float32,
+            "life": np.float32, "max_life": np.float32, "gravity": np.float32,
+            "color": np.uint16, "size": np.uint8,
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
         
-        # Создаём поверхность с прозрачностью
-        surf = pygame.Surface((current_size * 2, current_size * 2), pygame.SRCALPHA)
-        color_with_alpha = (*self.color, alpha)
-        pygame.draw.circle(surf, color_with_alpha, (current_size, current_size), current_size)
-        
-        # Рисуем на экране
-        screen_x = int(self.x - camera_x - current_size)
-        screen_y = int(self.y - camera_y - current_size)
-        screen.blit(surf, (screen_x, screen_y))
-
-
-class ParticleSystem:
-    """Система частиц"""
-    
-    def __init__(self):
-        """Инициализация системы"""
-        self.particles: List[Particle] = []
+    def _get_color_index(self, color: Tuple[int, int, int]) -> int:
+        """Индекс цвета в таблице (цвет регистрируется при первом использовании)"""
+        index = self.color_index.get(color)
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(color)
+            self.color_index[color] = index
+        return index
         
     def emit(self, x: float, y: float, count: int, effect_type: str = "explosion") -> None:
         """
@@ -96,92 +106,40 @@ class ParticleSystem:
             count: Количество частиц
             effect_type: Тип эффекта
         """
-        if effect_type == "explosion":
-            self._emit_explosion(x, y, count)
-        elif effect_type == "blood":
-            self._emit_blood(x, y, count)
-        elif effect_type == "sparkle":
-            self._emit_sparkle(x, y, count)
-        elif effect_type == "smoke":
-            self._emit_smoke(x, y, count)
-            
-    def _emit_explosion(self, x: float, y: float, count: int) -> None:
-        """Эффект взрыва"""
-        for _ in range(count):
-            angle = random.uniform(0, 6.28)
-            speed = random.uniform(50, 150)
-            vx = speed * pygame.math.Vector2(1, 0).rotate_rad(angle).x
-            vy = speed * pygame.math.Vector2(1, 0).rotate_rad(angle).y
-            
-            color = random.choice([
-                (255, 200, 0),   # Жёлтый
-                (255, 100, 0),   # Оранжевый
-                (255, 50, 0),    # Красный
-            ])
-            
-            particle = Particle(x, y, vx, vy, color, 
-                              lifetime=random.uniform(0.3, 0.8),
-                              size=random.randint(2, 5))
-            self.particles.append(particle)
-            
-    def _emit_blood(self, x: float, y: float, count: int) -> None:
-        """Эффект крови"""
-        for _ in range(count):
-            angle = random.uniform(0, 6.28)
-            speed = random.uniform(30, 100)
-            vx = speed * pygame.math.Vector2(1, 0).rotate_rad(angle).x
-            vy = speed * pygame.math.Vector2(1, 0).rotate_rad(angle).y - 50  # Вверх
-            
-            color = random.choice([
-                (200, 0, 0),     # Тёмно-красный
-                (255, 0, 0),     # Красный
-                (150, 0, 0),     # Очень тёмно-красный
-            ])
-            
-            particle = Particle(x, y, vx, vy, color,
-                              lifetime=random.uniform(0.5, 1.0),
-                              size=random.randint(2, 4))
-            particle.gravity = 200.0  # Больше гравитация
-            self.particles.append(particle)
-            
-    def _emit_sparkle(self, x: float, y: float, count: int) -> None:
-        """Эффект искр"""
-        for _ in range(count):
-            angle = random.uniform(0, 6.28)
-            speed = random.uniform(20, 80)
-            vx = speed * pygame.math.Vector2(1, 0).rotate_rad(angle).x
-            vy = speed * pygame.math.Vector2(1, 0).rotate_rad(angle).y
-            
-            color = random.choice([
-                (255, 255, 0),   # Жёлтый
-                (255, 255, 255), # Белый
-                (255, 200, 100), # Золотой
-            ])
-            
-            particle = Particle(x, y, vx, vy, color,
-                              lifetime=random.uniform(0.2, 0.5),
-                              size=random.randint(1, 3))
-            particle.gravity = 0  # Без гравитации
-            self.particles.append(particle)
-            
-    def _emit_smoke(self, x: float, y: float, count: int) -> None:
-        """Эффект дыма"""
-        for _ in range(count):
-            vx = random.uniform(-20, 20)
-            vy = random.uniform(-80, -40)  # Вверх
-            
-            color = random.choice([
-                (100, 100, 100), # Серый
-                (80, 80, 80),    # Тёмно-серый
-                (120, 120, 120), # Светло-серый
-            ])
-            
-            particle = Particle(x, y, vx, vy, color,
-                              lifetime=random.uniform(0.8, 1.5),
-                              size=random.randint(4, 8))
-            particle.gravity = -20.0  # Поднимается вверх
-            self.particles.append(particle)
-            
+        effect = EFFECTS.get(effect_type)
+        if effect is None or count <= 0:
+            return
+        
+        if self.count + count > self.capacity:
+            self._allocate(max(self.capacity * 2, self.count + count))
+        
+        new = slice(self.count, self.count + count)
+        rng = self.rng
+        
+        if "box" in effect:
+            (vx_min, vx_max), (vy_min, vy_max) = effect["box"]
+            self.vx[new] = rng.uniform(vx_min, vx_max, count)
+            self.vy[new] = rng.uniform(vy_min, vy_max, count)
+        else:
+            angle = rng.uniform(0, 2 * np.pi, count)
+            speed = rng.uniform(*effect["speed"], count)
+            self.vx[new] = speed * np.cos(angle)
+            self.vy[new] = speed * np.sin(angle) + effect["lift"]
+        
+        life = rng.uniform(*effect["lifetime"], count)
+        self.x[new] = x
+        self.y[new] = y
+        self.life[new] = life
+        self.max_life[new] = life
+        self.gravity[new] = effect["gravity"]
+        
+        palette = np.array([self._get_color_index(color) for color in effect["colors"]], dtype=np.uint16)
+        self.color[new] = rng.choice(palette, count)
+        size_min, size_max = effect["size"]
+        self.size[new] = rng.integers(size_min, size_max + 1, count)
+        
+        self.count += count
+        
     def update(self, dt: float) -> None:
         """
         Обновление всех частиц
@@ -189,8 +147,51 @@ class ParticleSystem:
         Args:
             dt: Delta time
         """
-        # Обновляем и удаляем мёртвые частицы
-        self.particles = [p for p in self.particles if p.update(dt)]
+        n = self.count
+        if n == 0:
+            return
+        
+        life = self.life[:n]
+        life -= dt
+        
+        vy = self.vy[:n]
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += vy * dt
+        vy += self.gravity[:n] * dt
+        
+        dead = life <= 0
+        if dead.any():
+            self._remove(dead)
+            
+    def _remove(self, dead: np.ndarray) -> None:
+        """
+        Удалить мёртвые частицы: последние живые переносятся в дыры (swap-remove)
+        
+        Args:
+            dead: Маска мёртвых частиц среди первых count
+        """
+        alive_count = self.count - int(np.count_nonzero(dead))
+        
+        holes = np.flatnonzero(dead[:alive_count])                  # Дыры в сохраняемой части
+        movers = alive_count + np.flatnonzero(~dead[alive_count:])  # Живые в хвосте
+        
+        if len(holes):
+            for name in ("x", "y", "vx", "vy", "life", "max_life", "gravity", "color", "size"):
+                array = getattr(self, name)
+                array[holes] = array[movers]
+        
+        self.count = alive_count
+        
+    def _get_sprite(self, color: int, radius: int, alpha_step: int) -> pygame.Surface:
+        """Спрайт круга из кэша (рисуется при первом запросе)"""
+        key = (color, radius, alpha_step)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            alpha = min(255, alpha_step * 256 // ALPHA_STEPS)
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*self.colors[color], alpha), (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
         
     def render(self, screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0) -> None:
         """
@@ -200,12 +201,72 @@ class ParticleSystem:
             screen: Поверхность для отрисовки
             camera_x, camera_y: Смещение камеры
         """
-        for particle in self.particles:
-            particle.render(screen, camera_x, camera_y)
+        n = self.count
+        if n == 0:
+            return
+        
+        # Доля оставшейся жизни: от неё зависят размер и прозрачность
+        fraction = self.life[:n] / self.max_life[:n]
+        radius = np.maximum(1, (self.size[:n] * fraction).astype(np.int32))
+        alpha_step = np.minimum(ALPHA_STEPS, (fraction * ALPHA_STEPS).astype(np.int32) + 1)
+        
+        screen_x = (self.x[:n] - camera_x).astype(np.int32) - radius
+        screen_y = (self.y[:n] - camera_y).astype(np.int32) - radius
+        
+        # Отсечение частиц за экраном
+        width, height = screen.get_size()
+        visible = np.flatnonzero(
+            (screen_x > -2 * radius) & (screen_x < width) &
+            (screen_y > -2 * radius) & (screen_y < height)
+        )
+        if len(visible) == 0:
+            return
+        
+        # Код спрайта - одно целое на частицу; таблица кодов дополняется по необходимости
+        codes = (
+            (self.color[visible].astype(np.int32) * (MAX_RADIUS + 1) + radius[visible]) * (ALPHA_STEPS + 1)
+            + alpha_step[visible]
+        )
+        table_size = len(self.colors) * (MAX_RADIUS + 1) * (ALPHA_STEPS + 1)
+        if len(self.sprite_table) < table_size:
+            self.sprite_table = np.concatenate(
+                [self.sprite_table, np.full(table_size - len(self.sprite_table), None, dtype=object)]
+            )
+        for code in np.unique(codes).tolist():
+            if self.sprite_table[code] is None:
+                rest, step = divmod(code, ALPHA_STEPS + 1)
+                color, size = divmod(rest, MAX_RADIUS + 1)
+                self.sprite_table[code] = self._get_sprite(color, size, step)
+        
+        screen.blits(
+            list(zip(self.sprite_table[codes].tolist(), zip(screen_x[visible].tolist(), screen_y[visible].tolist()))),
+            doreturn=False
+        )
+            
+    def get_bounds(self, camera_x: int = 0, camera_y: int = 0) -> Optional[pygame.Rect]:
+        """
+        Прямоугольник, покрывающий все частицы на экране (для грязных областей)
+        
+        Args:
+            camera_x, camera_y: Смещение камеры
             
+        Returns:
+            Прямоугольник в координатах экрана или None (частиц нет)
+        """
+        n = self.count
+        if n == 0:
+            return None
+        
+        margin = int(self.size[:n].max()) + 1
+        left = int(self.x[:n].min()) - camera_x - margin
+        top = int(self.y[:n].min()) - camera_y - margin
+        right = int(self.x[:n].max()) - camera_x + margin
+        bottom = int(self.y[:n].max()) - camera_y + margin
+        return pygame.Rect(left, top, right - left, bottom - top)
+        
     def clear(self) -> None:
         """Очистить все частицы"""
-        self.particles.clear()
+        self.count = 0
 
 
 if __name__ == "__main__":
@@ -230,6 +291,10 @@ if __name__ == "__main__":
                 elif event.button == 3:  # ПКМ
                     particle_system.emit(x, y, 15, "blood")
                     
+        # Нагрузочный тест: зажатая колёсико/средняя кнопка - фонтан частиц
+        if pygame.mouse.get_pressed()[1]:
+            particle_system.emit(*pygame.mouse.get_pos(), 500, "explosion")
+        
         particle_system.update(dt)
         
         screen.fill((0, 0, 0))
@@ -237,7 +302,7 @@ if __name__ == "__main__":
         
         # Подсказка
         font = pygame.font.Font(None, 24)
-        text = font.render("ЛКМ - взрыв, ПКМ - кровь", True, (255, 255, 255))
+        text = font.render(f"ЛКМ - взрыв, ПКМ - кровь, СКМ - фонтан | частиц: {particle_system.count}, FPS: {clock.get_fps():.0f}", True, (255, 255, 255))
         screen.blit(text, (10, 10))
         
         pygame.display.flip()
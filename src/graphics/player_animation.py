@@ -2,18 +2,23 @@
 Анимация игрока
 """
 import pygame
-from typing import Tuple
+from typing import Dict, Tuple
 
 
 class PlayerAnimation:
     """Анимация игрока"""
     
-    def __init__(self, tile_size: int = 32):
+    DIRECTIONS = ("down", "up", "left", "right")
+    FRAMES = 3
+    ATLAS_TILE_SIZE = 32  # Размер, в котором кадры запечены в атлас
+    
+    def __init__(self, tile_size: int = 32, use_atlas: bool = True):
         """
         Инициализация анимации
         
         Args:
             tile_size: Размер тайла
+            use_atlas: Брать кадры из атласа спрайтов (False - рисовать напрямую)
         """
         self.tile_size = tile_size
         self.current_direction = "down"  # down, up, left, right
@@ -23,7 +28,32 @@ class PlayerAnimation:
         self.is_moving = False
         
         # Создаём спрайты для каждого направления
-        self._create_sprites()
+        if use_atlas and tile_size == self.ATLAS_TILE_SIZE:
+            self._load_sprites_from_atlas()
+        else:
+            self._create_sprites()
+    
+    def _load_sprites_from_atlas(self) -> None:
+        """Взять кадры из запечённого атласа (subsurface, без перерисовки)"""
+        from .texture_atlas import get_atlas
+        atlas = get_atlas()
+        self.sprites = {
+            direction: [atlas.get_sprite(f"player_anim_{direction}_{i}") for i in range(self.FRAMES)]
+            for direction in self.DIRECTIONS
+        }
+    
+    def get_named_frames(self) -> Dict[str, pygame.Surface]:
+        """
+        Кадры под именами атласа
+        
+        Returns:
+            Имя кадра (player_anim_<направление>_<номер>) -> поверхность
+        """
+        return {
+            f"player_anim_{direction}_{i}": frame
+            for direction, frames in self.sprites.items()
+            for i, frame in enumerate(frames)
+        }
     
     def _create_sprites(self) -> None:
         """Создать пиксельные спрайты игрока"""
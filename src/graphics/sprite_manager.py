@@ -4,6 +4,7 @@
 import pygame
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from .texture_atlas import get_atlas
 
 
 class Animation:
@@ -60,14 +61,25 @@ class Animation:
 class SpriteManager:
     """Менеджер спрайтов"""
     
-    def __init__(self):
-        """Инициализация менеджера"""
+    def __init__(self, use_atlas: bool = True):
+        """
+        Инициализация менеджера
+        
+        Args:
+            use_atlas: Брать спрайты из запечённого атласа (False - рисовать
+                       напрямую, так атлас и запекается)
+        """
         self.sprites: Dict[str, pygame.Surface] = {}
         self.animations: Dict[str, Animation] = {}
         self.assets_path = Path("assets")
         
         # Создаём базовые процедурные спрайты
-        self._create_procedural_sprites()
+        if use_atlas:
+            self.sprites.update(get_atlas().sprites)
+        else:
+            self._create_procedural_sprites()
+        
+        self._create_animations()
         
     def _create_procedural_sprites(self) -> None:
         """Создание процедурных спрайтов (пока нет графики)"""
@@ -113,15 +125,12 @@ class SpriteManager:
         
         self.sprites["player"] = sprite
         
-        # Анимация ходьбы (простая - покачивание)
-        frames = []
+        # Кадры анимации ходьбы (простая - покачивание)
         for i in range(4):
             frame = sprite.copy()
             offset = (i % 2) * 2 - 1
             # Можно добавить покачивание
-            frames.append(frame)
-        
-        self.animations["player_walk"] = Animation(frames, 0.15)
+            self.sprites[f"player_walk_{i}"] = frame
         
     def _create_enemy_sprites(self) -> None:
         """Создать спрайты врагов"""
@@ -231,17 +240,24 @@ class SpriteManager:
         """Создать спрайты эффектов"""
         size = 32
         
-        # Эффект атаки (вспышка)
-        frames = []
+        # Кадры эффекта атаки (вспышка)
         for i in range(4):
             frame = pygame.Surface((size, size), pygame.SRCALPHA)
             radius = (4 - i) * 4
             alpha = 255 - i * 60
             color = (255, 255, 0, alpha)
             pygame.draw.circle(frame, color, (size // 2, size // 2), radius)
-            frames.append(frame)
-        
-        self.animations["effect_attack"] = Animation(frames, 0.05)
+            self.sprites[f"effect_attack_{i}"] = frame
+    
+    def _create_animations(self) -> None:
+        """Собрать анимации из кадров-спрайтов"""
+        self.animations["player_walk"] = Animation(
+            [self.sprites[f"player_walk_{i}"] for i in range(4)], 0.15
+        )
+        
+        self.animations["effect_attack"] = Animation(
+            [self.sprites[f"effect_attack_{i}"] for i in range(4)], 0.05
+        )
         self.animations["effect_attack"].loop = False
     
     def _create_interactive_object_sprites(self) -> None:
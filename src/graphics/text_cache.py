@@ -0,0 +1,210 @@
+"""
+Общий реестр шрифтов и кэш отрисованного текста
+
+pygame.font.Font загружает и разбирает файл шрифта при каждом создании,
+а font.render растеризует строку заново при каждом вызове. Большая часть
+надписей (HUD, FPS, числа урона, значки на карте) от кадра к кадру не
+меняется, поэтому:
+- шрифт каждой пары (файл, размер) загружается один раз;
+- готовые поверхности текста хранятся в LRU-кэше по ключу
+  (шрифт, текст, цвет, сглаживание) с лимитом по памяти.
+
+Поверхности из кэша общие: их нельзя менять (set_alpha, fill и т.п.) -
+для этого нужно сделать copy().
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import pygame
+
+
+FontKey = Tuple[Optional[str], int]
+
+
+class FontRegistry:
+    """Шрифты, загруженные один раз на пару (файл, размер)"""
+
+    def __init__(self):
+        """Инициализация реестра"""
+        self.fonts: Dict[FontKey, pygame.font.Font] = {}
+
+    def get(self, size: int, face: Optional[str] = None) -> pygame.font.Font:
+        """
+        Получить шрифт
+
+        Args:
+            size: Размер шрифта
+            face: Путь к файлу шрифта (None - шрифт pygame по умолчанию)
+
+        Returns:
+            Шрифт
+        """
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self.fonts[key] = font
+        return font
+
+
+class TextCache:
+    """LRU-кэш поверхностей текста с лимитом по памяти"""
+
+    DEFAULT_MEMORY_LIMIT = 4 * 1024 * 1024  # 4 МБ пикселей текста
+
+    def __init__(self, fonts: FontRegistry, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        """
+        Инициализация кэша
+
+        Args:
+            fonts: Реестр шрифтов
+            memory_limit: Лимит памяти поверхностей (байт)
+        """
+        self.fonts = fonts
+        self.memory_limit = memory_limit
+
+        self.surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.sizes: Dict[tuple, int] = {}
+        self.memory_used = 0
+
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0}
+
+    def render(
+        self,
+        text: str,
+        size: int,
+        color: Tuple[int, ...],
+        antialias: bool = True,
+        face: Optional[str] = None
+    ) -> pygame.Surface:
+        """
+        Отрисовать текст (или взять готовую поверхность из кэша)
+
+        Args:
+            text: Строка
+            size: Размер шрифта
+            color: Цвет текста
+            antialias: Сглаживание
+            face: Путь к файлу шрифта (None - шрифт по умолчанию)
+
+        Returns:
+            Поверхность текста (общая, не изменять)
+        """
+        key = (face, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.stats["hits"] += 1
+            return surface
+
+        self.stats["misses"] += 1
+        surface = self.fonts.get(size, face).render(text, antialias, color)
+
+        nbytes = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self.surfaces[key] = surface
+        self.sizes[key] = nbytes
+        self.memory_used += nbytes
+        self._evict()
+        return surface
+
+    def _evict(self) -> None:
+        """Вытеснить давно не использованные надписи сверх лимита"""
+        while self.memory_used > self.memory_limit and len(self.surfaces) > 1:
+            key, _ = self.surfaces.popitem(last=False)
+            self.memory_used -= self.sizes.pop(key)
+            self.stats["evicted"] += 1
+
+    def clear(self) -> None:
+        """Очистить кэш (статистика сохраняется)"""
+        self.surfaces.clear()
+        self.sizes.clear()
+        self.memory_used = 0
+
+    def get_stats(self) -> dict:
+        """
+        Статистика кэша
+
+        Returns:
+            Счётчики, доля попаданий, число записей и занятая память
+        """
+        requests = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / requests if requests else 0.0,
+            "entries": len(self.surfaces),
+            "memory_used": self.memory_used,
+        }
+
+    def report(self) -> None:
+        """Напечатать статистику кэша"""
+        stats = self.get_stats()
+        print(
+            f"📝 Кэш текста: попаданий {stats['hit_rate']:.1%} "
+            f"({stats['hits']}/{stats['hits'] + stats['misses']}), "
+            f"записей {stats['entries']}, {stats['memory_used'] / 1024:.0f} КБ, "
+            f"вытеснено {stats['evicted']}"
+        )
+
+
+_fonts = FontRegistry()
+_text_cache = TextCache(_fonts)
+
+
+def get_font(size: int, face: Optional[str] = None) -> pygame.font.Font:
+    """
+    Общий шрифт процесса (загружается при первом обращении)
+
+    Args:
+        size: Размер шрифта
+        face: Путь к файлу шрифта (None - шрифт по умолчанию)
+
+    Returns:
+        Шрифт
+    """
+    return _fonts.get(size, face)
+
+
+def get_text_cache() -> TextCache:
+    """Общий кэш текста процесса"""
+    return _text_cache
+
+
+def render_text(
+    text: str,
+    size: int,
+    color: Tuple[int, ...],
+    antialias: bool = True,
+    face: Optional[str] = None
+) -> pygame.Surface:
+    """
+    Отрисовать текст через общий кэш
+
+    Args:
+        text: Строка
+        size: Размер шрифта
+        color: Цвет текста
+        antialias: Сглаживание
+        face: Путь к файлу шрифта (None - шрифт по умолчанию)
+
+    Returns:
+        Поверхность текста (общая, не изменять)
+    """
+    return _text_cache.render(text, size, color, antialias, face)
+
+
+if __name__ == "__main__":
+    # Тест: HUD из пяти строк, одна из которых меняется раз в 30 кадров
+    import time
+
+    pygame.init()
+    screen = pygame.display.set_mode((400, 200))
+
+    start = time.perf_counter()
+    for frame in range(600):
+        for line in range(4):
+            screen.blit(render_text(f"Строка {line}", 24, (255, 255, 255)), (10, 10 + line * 25))
+        screen.blit(render_text(f"Шагов: {frame // 30}", 24, (200, 200, 200)), (10, 110))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"600 кадров: {elapsed:.1f} мс")
+    get_text_cache().report()
+    pygame.quit()
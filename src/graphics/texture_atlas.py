@@ -0,0 +1,233 @@
+"""
+Атлас процедурных спрайтов с кэшем на диске
+
+Все процедурные спрайты (SpriteManager и кадры PlayerAnimation)
+рисуются один раз и упаковываются в одну текстуру. Атлас сохраняется
+в кэш как PNG плюс JSON с прямоугольниками спрайтов. Имя файла содержит
+хэш кода рисования: любое изменение методов рисования (цвета, размеры,
+фигуры) меняет хэш и атлас перерисовывается.
+
+На последующих запусках атлас загружается одним чтением PNG
+(с convert_alpha), а спрайты отдаются как subsurface атласа.
+"""
+import hashlib
+import json
+import os
+import types
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import pygame
+from ..core.cache import get_cache_root
+
+
+# Версия формата атласа (меняется при изменении упаковки/формата файлов)
+ATLAS_VERSION = 1
+
+ATLAS_WIDTH = 256
+PADDING = 1  # Пустой пиксель между спрайтами (против просачивания при масштабировании)
+
+
+class TextureAtlas:
+    """Текстурный атлас: одна поверхность и прямоугольники спрайтов"""
+
+    def __init__(self, surface: pygame.Surface, rects: Dict[str, Tuple[int, int, int, int]]):
+        """
+        Инициализация атласа
+
+        Args:
+            surface: Поверхность атласа
+            rects: Имя спрайта -> (x, y, ширина, высота)
+        """
+        self.surface = surface
+        self.rects = rects
+
+        # Subsurface разделяют пиксели с атласом, копий не создаётся
+        self.sprites: Dict[str, pygame.Surface] = {
+            name: surface.subsurface(pygame.Rect(rect)) for name, rect in rects.items()
+        }
+
+    def get_sprite(self, name: str) -> Optional[pygame.Surface]:
+        """
+        Получить спрайт (subsurface атласа)
+
+        Args:
+            name: Имя спрайта
+
+        Returns:
+            Поверхность спрайта или None
+        """
+        return self.sprites.get(name)
+
+
+def _code_fingerprint(code: types.CodeType, digest) -> None:
+    """
+    Добавить в хэш байткод функции и её константы (рекурсивно)
+
+    Номера строк и адреса объектов не учитываются, поэтому хэш
+    стабилен между запусками и не зависит от сдвига строк в файле.
+    """
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_fingerprint(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def _drawing_classes() -> list:
+    """Классы, чьи методы рисуют спрайты атласа"""
+    from .sprite_manager import SpriteManager
+    from .player_animation import PlayerAnimation
+    return [SpriteManager, PlayerAnimation]
+
+
+def atlas_key() -> str:
+    """
+    Ключ атласа: хэш кода всех методов рисования
+
+    Returns:
+        Шестнадцатеричный хэш
+    """
+    digest = hashlib.sha256(f"atlas-v{ATLAS_VERSION}-w{ATLAS_WIDTH}-p{PADDING}".encode())
+    for cls in _drawing_classes():
+        digest.update(cls.__name__.encode())
+        for name, member in sorted(vars(cls).items()):
+            func = getattr(member, "__func__", member)
+            if isinstance(func, types.FunctionType):
+                digest.update(name.encode())
+                _code_fingerprint(func.__code__, digest)
+    return digest.hexdigest()[:16]
+
+
+def draw_sprites() -> Dict[str, pygame.Surface]:
+    """
+    Нарисовать все процедурные спрайты напрямую (без атласа)
+
+    Returns:
+        Имя спрайта -> поверхность
+    """
+    from .sprite_manager import SpriteManager
+    from .player_animation import PlayerAnimation
+
+    sprites = dict(SpriteManager(use_atlas=False).sprites)
+    sprites.update(PlayerAnimation(use_atlas=False).get_named_frames())
+    return sprites
+
+
+def pack(sprites: Dict[str, pygame.Surface]) -> TextureAtlas:
+    """
+    Упаковать спрайты в атлас (полками по убыванию высоты)
+
+    Args:
+        sprites: Имя спрайта -> поверхность
+
+    Returns:
+        Атлас
+    """
+    order = sorted(sprites, key=lambda name: (-sprites[name].get_height(), name))
+
+    rects: Dict[str, Tuple[int, int, int, int]] = {}
+    x, y, shelf_height = 0, 0, 0
+    for name in order:
+        width, height = sprites[name].get_size()
+        if x + width > ATLAS_WIDTH:
+            x, y = 0, y + shelf_height + PADDING
+            shelf_height = 0
+        rects[name] = (x, y, width, height)
+        x += width + PADDING
+        shelf_height = max(shelf_height, height)
+
+    surface = pygame.Surface((ATLAS_WIDTH, y + shelf_height), pygame.SRCALPHA)
+    for name, rect in rects.items():
+        surface.blit(sprites[name], rect[:2])
+
+    return TextureAtlas(surface, rects)
+
+
+def _prepare(surface: pygame.Surface) -> pygame.Surface:
+    """Конвертировать атлас под формат экрана (если окно уже создано)"""
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+
+def load_or_build(cache_dir: Optional[Path] = None) -> TextureAtlas:
+    """
+    Загрузить атлас из кэша или нарисовать и сохранить
+
+    Args:
+        cache_dir: Папка кэша (по умолчанию <кэш игры>/atlas)
+
+    Returns:
+        Атлас
+    """
+    cache_dir = cache_dir or get_cache_root() / "atlas"
+    key = atlas_key()
+    image_file = cache_dir / f"atlas-{key}.png"
+    index_file = cache_dir / f"atlas-{key}.json"
+
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        surface = pygame.image.load(str(image_file))
+        rects = {name: tuple(rect) for name, rect in index["rects"].items()}
+        return TextureAtlas(_prepare(surface), rects)
+    except (OSError, ValueError, KeyError, pygame.error):
+        pass
+
+    atlas = pack(draw_sprites())
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # PNG пишем первым, JSON - последним: он служит признаком целого атласа
+        tmp_image = image_file.with_name(image_file.stem + ".tmp.png")
+        pygame.image.save(atlas.surface, str(tmp_image))
+        os.replace(tmp_image, image_file)
+
+        tmp_index = index_file.with_name(index_file.name + ".tmp")
+        with open(tmp_index, 'w', encoding='utf-8') as f:
+            json.dump({"version": ATLAS_VERSION, "key": key, "rects": atlas.rects}, f, indent=2)
+        os.replace(tmp_index, index_file)
+
+        print(f"🧩 Атлас спрайтов запечён: {len(atlas.rects)} спрайтов → {image_file}")
+    except (OSError, pygame.error) as e:
+        print(f"⚠️ Не удалось сохранить атлас спрайтов: {e}")
+
+    return TextureAtlas(_prepare(atlas.surface), atlas.rects)
+
+
+_shared_atlas: Optional[TextureAtlas] = None
+
+
+def get_atlas() -> TextureAtlas:
+    """
+    Общий атлас процесса (загружается при первом обращении)
+
+    Returns:
+        Атлас
+    """
+    global _shared_atlas
+    if _shared_atlas is None:
+        _shared_atlas = load_or_build()
+    return _shared_atlas
+
+
+if __name__ == "__main__":
+    # Запечь атлас и показать его
+    pygame.init()
+    screen = pygame.display.set_mode((ATLAS_WIDTH * 2, 400))
+    atlas = get_atlas()
+    print(f"Спрайтов в атласе: {len(atlas.rects)}, размер {atlas.surface.get_size()}, ключ {atlas_key()}")
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+        screen.fill((40, 40, 60))
+        screen.blit(pygame.transform.scale2x(atlas.surface), (0, 0))
+        pygame.display.flip()
+
+    pygame.quit()
@@ -0,0 +1,234 @@
+"""
+Слой тайлов уровня на 8-битной поверхности с палитрой
+
+Весь этаж хранится в одной 8-битной поверхности размером уровня в
+пикселях. Пиксель содержит не цвет, а индекс палитры:
+
+    индекс = состояние тумана * KINDS + вид тайла
+
+Палитра задаёт цвет каждой пары (вид тайла, состояние): неисследованные
+клетки чёрные, исследованные - затемнённые, видимые - полного цвета,
+плюс отдельный цвет линий сетки у видимых клеток. Поэтому смена цветов
+биома или степени затемнения - это только set_palette, без перерисовки
+пикселей.
+
+Индексы клеток пересчитываются из tiles и FogOfWar.visibility одной
+векторной операцией; в поверхность записываются только изменившиеся
+клетки (блоками через surfarray).
+
+На экран слой выводится через окно размером с экран в формате дисплея.
+При сдвиге камеры окно сдвигается Surface.scroll, и дорисовываются
+только открывшиеся полосы; клетки, сменившие состояние тумана,
+дорисовываются одним прямоугольником. Кадр - одно копирование окна без
+перевода палитры. Камера может двигаться на любое число пикселей,
+поэтому плавная (дробная) камера не требует перерисовки всего окна.
+"""
+from typing import Optional, Tuple
+import numpy as np
+import pygame
+from ..world.fog_of_war import FogOfWar
+
+
+Color = Tuple[int, int, int]
+
+KINDS = 2                     # Пол и стена (прочие типы рисуются как стена)
+STATES = 3                    # UNEXPLORED, EXPLORED, VISIBLE
+GRID_INDEX = STATES * KINDS   # Линии сетки видимых клеток
+
+GRID_COLOR = (30, 30, 30)
+EXPLORED_DIM = 0.5            # Яркость исследованных, но не видимых клеток
+
+
+class TileLayer:
+    """Палитровая поверхность тайлов одного уровня"""
+
+    def __init__(self, tiles: np.ndarray, tile_size: int, floor_color: Color, wall_color: Color):
+        """
+        Инициализация слоя
+
+        Args:
+            tiles: Массив тайлов (высота, ширина)
+            tile_size: Размер тайла в пикселях
+            floor_color: Цвет пола
+            wall_color: Цвет стен
+        """
+        self.tiles = tiles
+        self.tile_size = tile_size
+
+        height, width = tiles.shape
+        self.surface = pygame.Surface((width * tile_size, height * tile_size), depth=8)
+
+        # Индекс палитры каждой клетки, с которым синхронизирована поверхность
+        self.indices: Optional[np.ndarray] = None
+
+        # Окно камеры в формате экрана и камера, для которой оно нарисовано
+        self.view: Optional[pygame.Surface] = None
+        self.view_camera: Optional[Tuple[int, int]] = None
+        self.changed_rect: Optional[pygame.Rect] = None  # Клетки, изменённые с прошлого кадра (пиксели уровня)
+
+        self.stats = {"full": 0, "scrolled": 0, "patched_pixels": 0}
+
+        # Шаблоны блоков тайла для каждого индекса: (индексы, dx, dy)
+        self.blocks = np.empty((GRID_INDEX, tile_size, tile_size), dtype=np.uint8)
+        for index in range(GRID_INDEX):
+            self.blocks[index] = index
+            if index // KINDS == FogOfWar.VISIBLE:
+                block = self.blocks[index]
+                block[0, :] = block[-1, :] = block[:, 0] = block[:, -1] = GRID_INDEX
+
+        offsets = np.arange(tile_size)
+        self._dx = offsets[None, :, None]
+        self._dy = offsets[None, None, :]
+
+        self.set_colors(floor_color, wall_color)
+
+    def set_colors(self, floor_color: Color, wall_color: Color, explored_dim: float = EXPLORED_DIM) -> None:
+        """
+        Задать цвета тайлов (только замена палитры)
+
+        Args:
+            floor_color: Цвет пола
+            wall_color: Цвет стен
+            explored_dim: Яркость исследованных клеток
+        """
+        palette = [(0, 0, 0)] * 256
+        for kind, color in enumerate((floor_color, wall_color)):
+            palette[FogOfWar.EXPLORED * KINDS + kind] = tuple(int(c * explored_dim) for c in color)
+            palette[FogOfWar.VISIBLE * KINDS + kind] = tuple(color)
+        palette[GRID_INDEX] = GRID_COLOR
+        self.surface.set_palette(palette)
+        self.view_camera = None  # Окно перерисуется целиком
+
+    def _compute_indices(self, visibility: np.ndarray) -> np.ndarray:
+        """Индексы палитры клеток (ширина, высота) - порядок осей surfarray"""
+        kinds = np.minimum(self.tiles, KINDS - 1)
+        return (visibility * KINDS + kinds).T.astype(np.uint8)
+
+    def sync(self, visibility: np.ndarray) -> int:
+        """
+        Перерисовать клетки, у которых сменился вид или состояние тумана
+
+        Args:
+            visibility: Массив FogOfWar.visibility
+
+        Returns:
+            Число перерисованных клеток
+        """
+        indices = self._compute_indices(visibility)
+        size = self.tile_size
+
+        if self.indices is None:
+            # Первая сборка: все блоки одной операцией
+            width, height = indices.shape
+            pixels = self.blocks[indices].transpose(0, 2, 1, 3).reshape(width * size, height * size)
+            pygame.surfarray.blit_array(self.surface, pixels)
+            self.indices = indices
+            self.view_camera = None
+            return indices.size
+
+        xs, ys = np.nonzero(indices != self.indices)
+        if len(xs):
+            changed = indices[xs, ys]
+            px = xs[:, None, None] * size + self._dx
+            py = ys[:, None, None] * size + self._dy
+
+            pixels = pygame.surfarray.pixels2d(self.surface)
+            pixels[px, py] = self.blocks[changed]
+            del pixels  # Снимаем блокировку поверхности
+
+            self.indices = indices
+
+            # Окну камеры достаточно одного прямоугольника вокруг изменений (туман - вокруг игрока)
+            changed_rect = pygame.Rect(
+                int(xs.min()) * size, int(ys.min()) * size,
+                (int(xs.max()) - int(xs.min()) + 1) * size, (int(ys.max()) - int(ys.min()) + 1) * size
+            )
+            self.changed_rect = changed_rect if self.changed_rect is None else self.changed_rect.union(changed_rect)
+        return len(xs)
+
+    def _draw_view(self, rect: pygame.Rect, camera_x: int, camera_y: int) -> None:
+        """Перерисовать часть окна камеры из поверхности уровня"""
+        self.view.set_clip(rect)
+        self.view.fill((0, 0, 0))
+        self.view.blit(self.surface, (-camera_x, -camera_y))
+        self.view.set_clip(None)
+        self.stats["patched_pixels"] += rect.width * rect.height
+
+    def _update_view(self, size: Tuple[int, int], camera_x: int, camera_y: int) -> None:
+        """
+        Привести окно камеры к новой позиции: сдвиг и дорисовка полос
+
+        Args:
+            size: Размер экрана
+            camera_x: Смещение камеры по X
+            camera_y: Смещение камеры по Y
+        """
+        width, height = size
+        if self.view is None or self.view.get_size() != size:
+            self.view = pygame.Surface(size)
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                self.view = self.view.convert()
+            self.view_camera = None
+
+        view_rect = self.view.get_rect()
+        if self.view_camera is not None:
+            dx = self.view_camera[0] - camera_x
+            dy = self.view_camera[1] - camera_y
+            if abs(dx) >= width or abs(dy) >= height:
+                self.view_camera = None
+
+        if self.view_camera is None:
+            self._draw_view(view_rect, camera_x, camera_y)
+            self.stats["full"] += 1
+        else:
+            if dx or dy:
+                self.view.scroll(dx, dy)
+                self.stats["scrolled"] += 1
+                # Открывшиеся полосы: слева/справа и сверху/снизу
+                if dx:
+                    self._draw_view(pygame.Rect(0 if dx > 0 else width + dx, 0, abs(dx), height), camera_x, camera_y)
+                if dy:
+                    self._draw_view(pygame.Rect(0, 0 if dy > 0 else height + dy, width, abs(dy)), camera_x, camera_y)
+
+            if self.changed_rect is not None:
+                patch = self.changed_rect.move(-camera_x, -camera_y).clip(view_rect)
+                if patch.width and patch.height:
+                    self._draw_view(patch, camera_x, camera_y)
+
+        self.view_camera = (camera_x, camera_y)
+        self.changed_rect = None
+
+    def render(self, screen: pygame.Surface, camera_x: int, camera_y: int) -> None:
+        """
+        Нарисовать видимую часть уровня
+
+        Args:
+            screen: Поверхность для отрисовки
+            camera_x: Смещение камеры по X (целые пиксели)
+            camera_y: Смещение камеры по Y (целые пиксели)
+        """
+        self._update_view(screen.get_size(), camera_x, camera_y)
+        screen.blit(self.view, (0, 0))
+
+
+if __name__ == "__main__":
+    # Тест: синхронизация с туманом при движении игрока
+    import time
+    from ..world.level import Level
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    level = Level(60, 40)
+    level._generate_test_level()
+    layer = TileLayer(level.tiles, level.tile_size, level.COLOR_FLOOR, level.COLOR_WALL)
+
+    for step in range(1, 20):
+        level.update_fog_of_war(step * 2, 20)
+        start = time.perf_counter()
+        changed = layer.sync(level.fog_of_war.visibility)
+        layer.render(screen, 0, 0)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Шаг {step}: перерисовано клеток {changed}, {elapsed:.3f} мс")
+
+    pygame.quit()
@@ -48,7 +48,9 @@ class Rune:
             self.collected = True
             print(f"✨ Собрана руна: {self.rune_type.value}")
             
-    def render(self, screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0, fog_of_war=None) -> None:
+    def render(
+        self, screen: pygame.Surface, camera_x: int = 0, camera_y: int = 0, fog_of_war=None, pulse: float = None
+    ) -> None:
         """
         Отрисовка руны
         
@@ -57,6 +59,7 @@ class Rune:
             camera_x: Смещение камеры по X
             camera_y: Смещение камеры по Y
             fog_of_war: Туман войны для проверки видимости
+            pulse: Яркость свечения 0.7-1.0 (None - по текущему времени)
         """
         if self.collected:
             return  # Не рисуем собранную руну
@@ -85,9 +88,10 @@ class Rune:
         pygame.draw.polygon(screen, (255, 255, 255), points, 2)
         
         # Эффект свечения (пульсация)
-        import math
-        import time
-        pulse = abs(math.sin(time.time() * 3)) * 0.3 + 0.7
+        if pulse is None:
+            import math
+            import time
+            pulse = abs(math.sin(time.time() * 3)) * 0.3 + 0.7
         glow_color = tuple(int(c * pulse) for c in self.color)
         
         # Внешний контур свечения
@@ -28,6 +28,7 @@ class Riddle:
             fog_of_war: Туман войны
         """
         import pygame
+        from ..graphics.text_cache import render_text
         
         # Проверяем видимость
         if fog_of_war and not fog_of_war.is_visible(self.x, self.y):
@@ -40,8 +41,7 @@ class Riddle:
         
         if self.solved:
             # Решённая загадка - серая с галочкой
-            font = pygame.font.Font(None, 48)
-            text = font.render("✓", True, (150, 150, 150))  # Серый
+            text = render_text("✓", 48, (150, 150, 150))  # Серый
             text_rect = text.get_rect(center=(screen_x + tile_size // 2, screen_y + tile_size // 2))
             
             # Серый фон
@@ -56,8 +56,7 @@ class Riddle:
             screen.blit(text, text_rect)
         else:
             # Нерешённая загадка - жёлтый знак вопроса
-            font = pygame.font.Font(None, 48)
-            text = font.render("?", True, (255, 255, 0))  # Жёлтый
+            text = render_text("?", 48, (255, 255, 0))  # Жёлтый
             text_rect = text.get_rect(center=(screen_x + tile_size // 2, screen_y + tile_size // 2))
             
             # Фиолетовый фон
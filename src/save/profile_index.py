@@ -0,0 +1,180 @@
+"""
+Индекс профилей игроков
+
+Один файл saves/profiles_index.json с метаданными всех профилей.
+Главное меню читает его одним обращением к диску вместо обхода
+папок и разбора каждого profile.json. Индекс сверяется с mtime
+папки профилей, каждой папки профиля и её profile.json (несколько stat
+без чтения файлов) и перестраивается, если что-то менялось в обход игры.
+"""
+import json
+import os
+from typing import Optional, Dict, Any, List
+
+
+class ProfileIndex:
+    """Кэшированный индекс профилей"""
+
+    VERSION = 2
+
+    # Поля профиля, которые хранятся в индексе
+    FIELDS = ("name", "created_at", "last_played", "play_time", "current_floor", "health")
+
+    def __init__(self, profiles_dir: str = "saves/profiles", index_file: Optional[str] = None):
+        """
+        Инициализация индекса
+
+        Args:
+            profiles_dir: Папка с профилями (каждый профиль - подпапка)
+            index_file: Файл индекса (по умолчанию рядом с папкой профилей,
+                        чтобы запись индекса не меняла mtime самой папки)
+        """
+        self.profiles_dir = profiles_dir
+        self.index_file = index_file or os.path.join(
+            os.path.dirname(os.path.normpath(profiles_dir)) or ".",
+            "profiles_index.json"
+        )
+
+        # Имя профиля -> метаданные
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Загрузить индекс (или перестроить, если он устарел)
+
+        Returns:
+            Список метаданных профилей
+        """
+        os.makedirs(self.profiles_dir, exist_ok=True)
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get("version") == self.VERSION and data.get("mtimes") == self._mtimes():
+                self.entries = data["profiles"]
+                return list(self.entries.values())
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+        self.rebuild()
+        return list(self.entries.values())
+
+    def rebuild(self) -> None:
+        """Перестроить индекс обходом папок профилей"""
+        self.entries = {}
+
+        for profile_name in os.listdir(self.profiles_dir):
+            metadata_file = os.path.join(self.profiles_dir, profile_name, "profile.json")
+            if not os.path.isfile(metadata_file):
+                continue
+
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.entries[data["name"]] = self._pick_fields(data)
+            except Exception as e:
+                print(f"Ошибка загрузки профиля {profile_name}: {e}")
+
+        print(f"📇 Индекс профилей перестроен: {len(self.entries)} профилей")
+        self._commit()
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Получить метаданные профиля
+
+        Args:
+            name: Имя профиля
+
+        Returns:
+            Копия метаданных или None
+        """
+        entry = self.entries.get(name)
+        return dict(entry) if entry else None
+
+    def save_profile(self, data: Dict[str, Any]) -> None:
+        """
+        Сохранить профиль: profile.json и запись индекса
+
+        Args:
+            data: Метаданные профиля (обязательно поле "name")
+        """
+        profile_path = os.path.join(self.profiles_dir, data["name"])
+        os.makedirs(profile_path, exist_ok=True)
+
+        self._write_json(os.path.join(profile_path, "profile.json"), data)
+
+        self.entries[data["name"]] = self._pick_fields(data)
+        self._commit()
+
+    def remove(self, name: str) -> None:
+        """
+        Удалить профиль из индекса (папка удаляется вызывающим кодом)
+
+        Args:
+            name: Имя профиля
+        """
+        self.entries.pop(name, None)
+        self._commit()
+
+    def _mtimes(self) -> Dict[str, Any]:
+        """
+        Отметки времени изменения папки профилей, папок профилей и их profile.json
+
+        Запись файла на месте не меняет mtime родительской папки, поэтому
+        profile.json сверяется отдельно.
+
+        Returns:
+            {"": mtime папки профилей, имя папки: [mtime папки, mtime profile.json или None]}
+        """
+        mtimes: Dict[str, Any] = {"": os.stat(self.profiles_dir).st_mtime_ns}
+        with os.scandir(self.profiles_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                try:
+                    metadata_mtime = os.stat(os.path.join(entry.path, "profile.json")).st_mtime_ns
+                except OSError:
+                    metadata_mtime = None
+                mtimes[entry.name] = [entry.stat().st_mtime_ns, metadata_mtime]
+        return mtimes
+
+    def _pick_fields(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Оставить только поля, которые хранятся в индексе"""
+        return {key: data[key] for key in self.FIELDS if key in data}
+
+    def _commit(self) -> None:
+        """Записать индекс атомарно вместе с текущими отметками времени профилей"""
+        data = {
+            "version": self.VERSION,
+            "mtimes": self._mtimes(),
+            "profiles": self.entries
+        }
+
+        try:
+            self._write_json(self.index_file, data)
+        except OSError as e:
+            print(f"⚠️  Ошибка записи индекса профилей: {e}")
+
+    @staticmethod
+    def _write_json(path: str, data: Dict[str, Any]) -> None:
+        """
+        Записать JSON через временный файл и os.replace
+
+        Args:
+            path: Путь к файлу
+            data: Данные
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    # Тест индекса профилей
+    index = ProfileIndex()
+    for entry in index.load():
+        print(f"👤 {entry['name']}: этаж {entry.get('current_floor', 0)}, последняя игра {entry.get('last_played')}")
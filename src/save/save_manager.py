@@ -333,8 +333,14 @@ class GameStateSerializer:
                 "riddle_positions": floor_state.riddle_positions
             }
             
+            # Сетки в архиве профиля - в JSON только ссылка на них
+            if floor_state.is_archived():
+                floor_data["archived"] = True
+                floor_data["entrance_pos"] = floor_state.entrance_pos
+                floor_data["exit_pos"] = floor_state.exit_pos
+            
             # Сохраняем тайлы и позиции только для стабилизированных этажей
-            if floor_state.is_stabilized and floor_state.saved_tiles is not None:
+            elif floor_state.is_stabilized and floor_state.saved_tiles is not None:
                 floor_data["saved_tiles"] = floor_state.saved_tiles.tolist()
                 floor_data["entrance_pos"] = floor_state.entrance_pos
                 floor_data["exit_pos"] = floor_state.exit_pos
@@ -359,9 +365,7 @@ class GameStateSerializer:
         import numpy as np
         from ..world.floor_state import FloorState
         
-        for floor_num_str, floor_data in data.items():
-            floor_num = int(floor_num_str)
-            
+        for floor_data in data.values():
             floor_state = FloorState(
                 floor_number=floor_data["floor_number"],
                 seed=floor_data["seed"],
@@ -372,8 +376,13 @@ class GameStateSerializer:
             floor_state.riddle_spawned = floor_data["riddle_spawned"]
             floor_state.riddle_positions = floor_data.get("riddle_positions", [])
             
-            # Восстанавливаем тайлы и позиции для стабилизированных этажей
-            if floor_state.is_stabilized and "saved_tiles" in floor_data:
+            # Сетки в архиве профиля - восстанавливаем только позиции
+            if floor_state.is_stabilized and floor_data.get("archived"):
+                floor_state.entrance_pos = tuple(floor_data["entrance_pos"]) if floor_data.get("entrance_pos") else None
+                floor_state.exit_pos = tuple(floor_data["exit_pos"]) if floor_data.get("exit_pos") else None
+            
+            # Восстанавливаем тайлы и позиции для стабилизированных этажей (старый формат)
+            elif floor_state.is_stabilized and "saved_tiles" in floor_data:
                 floor_state.saved_tiles = np.array(floor_data["saved_tiles"], dtype=np.uint8)
                 floor_state.entrance_pos = tuple(floor_data["entrance_pos"]) if floor_data.get("entrance_pos") else None
                 floor_state.exit_pos = tuple(floor_data["exit_pos"]) if floor_data.get("exit_pos") else None
@@ -382,7 +391,13 @@ class GameStateSerializer:
                 if "saved_fog_of_war" in floor_data:
                     floor_state.saved_fog_of_war = np.array(floor_data["saved_fog_of_war"], dtype=np.uint8)
             
-            floor_state_manager.floors[floor_num] = floor_state
+            # Менеджер перенесёт сетки старого формата в архив профиля
+            floor_state_manager.add_floor_state(floor_state)
+            
+            # Архив потерян - этаж придётся стабилизировать заново
+            if floor_data.get("archived") and not floor_state.is_archived():
+                print(f"⚠️  Этаж {floor_state.floor_number} не найден в архиве, стабилизация сброшена")
+                floor_state.is_stabilized = False
 
 
 if __name__ == "__main__":
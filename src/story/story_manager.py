@@ -1,10 +1,39 @@
 """
 Менеджер сюжета
+
+Сюжетные диалоги запускаются триггерами из таблицы: место (локация и
+этаж), обязательные флаги и флаг "уже показан". Триггеры индексируются
+по месту и по обязательным флагам, поэтому вход на этаж или установка
+флага выбирают только относящиеся к ним триггеры, сколько бы диалогов
+ни было в игре. Между событиями таблица не проверяется.
 """
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 from .dialogue_system import Dialogue, DialogueNode, DialogueChoice
 
 
+Place = Tuple[Any, int]  # (номер этажа или "attic", этаж; 0 - чердак)
+
+
+@dataclass
+class StoryTrigger:
+    """Условие показа сюжетного диалога"""
+    dialogue_id: str
+    location: Any                      # Номер этажа или "attic"
+    floor: int                         # 0 - чердак
+    requires: Tuple[str, ...] = ()     # Флаги, которые должны быть установлены
+    shown_flag: str = ""               # Флаг "показан" (пусто - "<dialogue_id>_shown")
+
+    def __post_init__(self):
+        if not self.shown_flag:
+            self.shown_flag = f"{self.dialogue_id}_shown"
+
+    @property
+    def place(self) -> Place:
+        """Ключ места в индексе"""
+        return (self.location, self.floor)
+
+
 class StoryManager:
     """Менеджер сюжета игры"""
     
@@ -14,8 +43,18 @@ class StoryManager:
         self.story_flags: Dict[str, bool] = {}
         self.story_variables: Dict[str, int] = {}
         
+        # Таблица триггеров с индексами по месту и по обязательному флагу
+        self.triggers: List[StoryTrigger] = []
+        self.triggers_by_place: Dict[Place, List[StoryTrigger]] = {}
+        self.triggers_by_flag: Dict[str, List[StoryTrigger]] = {}
+        
+        # Текущее место и триггеры, ждущие проверки (после входа или смены флага)
+        self.place: Optional[Place] = None
+        self.pending: List[StoryTrigger] = []
+        
         # Создаём диалоги
         self._create_dialogues()
+        self._create_triggers()
         
     def _create_dialogues(self) -> None:
         """Создать все диалоги игры"""
@@ -29,6 +68,71 @@ class StoryManager:
         # Финальный диалог
         self._create_ending_dialogue()
         
+    def _create_triggers(self) -> None:
+        """Когда показывать сюжетные диалоги"""
+        # Вступление - на чердаке при первом запуске
+        self.add_trigger(StoryTrigger("intro", "attic", 0))
+        
+        # Середина - на 10 этаже
+        self.add_trigger(StoryTrigger("midpoint", 10, 10))
+        
+        # Финал - на стабилизированном 20 этаже
+        self.add_trigger(StoryTrigger("ending", 20, 20, requires=("floor_20_stabilized",)))
+        
+    def add_trigger(self, trigger: StoryTrigger) -> None:
+        """
+        Добавить триггер в таблицу
+        
+        Args:
+            trigger: Триггер диалога
+        """
+        self.triggers.append(trigger)
+        self.triggers_by_place.setdefault(trigger.place, []).append(trigger)
+        for flag in trigger.requires:
+            self.triggers_by_flag.setdefault(flag, []).append(trigger)
+        
+        # Триггер для текущего места - сразу в очередь проверки
+        if trigger.place == self.place:
+            self._queue(trigger)
+            
+    def _queue(self, trigger: StoryTrigger) -> None:
+        """Поставить триггер в очередь проверки (без повторов)"""
+        if trigger not in self.pending:
+            self.pending.append(trigger)
+            
+    def _is_ready(self, trigger: StoryTrigger) -> bool:
+        """Выполнены ли условия триггера"""
+        if self.get_flag(trigger.shown_flag):
+            return False
+        return all(self.get_flag(flag) for flag in trigger.requires)
+        
+    def enter_location(self, location: Any, floor: int) -> None:
+        """
+        Игрок оказался в локации: проверке подлежат триггеры этого места
+        
+        Args:
+            location: Номер этажа или "attic"
+            floor: Номер этажа (0 - чердак)
+        """
+        self.place = (location, floor)
+        self.pending = list(self.triggers_by_place.get(self.place, ()))
+        
+    def pop_ready_trigger(self) -> Optional[StoryTrigger]:
+        """
+        Взять из очереди первый триггер, условия которого выполнены
+        
+        Невыполненные триггеры из очереди убираются: они вернутся в неё при
+        установке нужного флага или при следующем входе в место.
+        
+        Returns:
+            Триггер или None
+        """
+        while self.pending:
+            trigger = self.pending.pop(0)
+            if self._is_ready(trigger):
+                return trigger
+        return None
+        
     def _create_intro_dialogue(self) -> None:
         """Вступительный диалог"""
         dialogue = Dialogue("intro", "start")
@@ -190,6 +294,12 @@ class StoryManager:
         """
         self.story_flags[flag] = value
         
+        # Флаг мог открыть триггеры текущего места
+        if value:
+            for trigger in self.triggers_by_flag.get(flag, ()):
+                if trigger.place == self.place:
+                    self._queue(trigger)
+        
     def get_flag(self, flag: str) -> bool:
         """
         Получить флаг сюжета
@@ -235,18 +345,9 @@ class StoryManager:
         Returns:
             True если нужно показать
         """
-        # Вступление - только один раз
-        if dialogue_id == "intro":
-            return not self.get_flag("intro_shown")
-            
-        # Середина - на 10 этаже
-        if dialogue_id == "midpoint":
-            return current_floor == 10 and not self.get_flag("midpoint_shown")
-            
-        # Финал - на 20 этаже
-        if dialogue_id == "ending":
-            return current_floor == 20 and not self.get_flag("ending_shown")
-            
+        for trigger in self.triggers:
+            if trigger.dialogue_id == dialogue_id and trigger.floor == current_floor and self._is_ready(trigger):
+                return True
         return False
 
 
@@ -265,3 +366,14 @@ if __name__ == "__main__":
     print("\nТест переменных:")
     manager.set_variable("score", 100)
     print(f"  score = {manager.get_variable('score')}")
+    
+    print("\nТест триггеров:")
+    for place in [("attic", 0), (10, 10), (20, 20)]:
+        manager.enter_location(*place)
+        trigger = manager.pop_ready_trigger()
+        print(f"  {place}: {trigger.dialogue_id if trigger else '-'}")
+        if trigger:
+            manager.set_flag(trigger.shown_flag, True)
+    manager.set_flag("floor_20_stabilized", True)
+    trigger = manager.pop_ready_trigger()
+    print(f"  (20, 20) после стабилизации: {trigger.dialogue_id if trigger else '-'}")
@@ -0,0 +1,172 @@
+"""
+HUD с кэшированием по привязанным данным
+
+Каждый элемент HUD объявляется привязкой: функция bind возвращает
+значение (дешёвое чтение состояния игры), функция format превращает его
+в текст и цвет. Слой HUD каждый кадр только собирает значения привязок;
+поверхность слоя перерисовывается, лишь когда изменилось хотя бы одно
+значение (или размер экрана), иначе выводится одним blit.
+
+Новый элемент, добавленный через Hud.add, кэшируется автоматически.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pygame
+from ..graphics.text_cache import render_text
+
+
+Color = Tuple[int, int, int]
+
+
+@dataclass
+class HudWidget:
+    """Текстовый элемент HUD, привязанный к данным"""
+    bind: Callable[[], Any]                                  # Значение из состояния игры
+    format: Callable[[Any], Optional[Tuple[str, Color]]]    # Значение -> (текст, цвет) или None
+    pos: Tuple[int, int]                                     # y < 0 - отсчёт от низа экрана
+    size: int = 24
+
+
+class HudLayer:
+    """Группа элементов HUD с общей кэшированной поверхностью"""
+
+    def __init__(self):
+        """Инициализация слоя"""
+        self.widgets: List[HudWidget] = []
+
+        self.surface: Optional[pygame.Surface] = None
+        self.origin = (0, 0)
+        self.values: Optional[tuple] = None
+
+        # Области экрана, изменившиеся в последнем кадре (старая и новая поверхность)
+        self.dirty: List[pygame.Rect] = []
+
+        self.rebuilds = 0
+
+    def render(self, screen: pygame.Surface) -> None:
+        """
+        Вывести слой (перерисовать, если изменились значения привязок)
+
+        Args:
+            screen: Поверхность для отрисовки
+        """
+        values = (screen.get_size(),) + tuple(widget.bind() for widget in self.widgets)
+        self.dirty = []
+        if values != self.values:
+            self.values = values
+            self.dirty.append(self.get_rect())
+            self._rebuild(screen.get_height(), values[1:])
+            self.dirty.append(self.get_rect())
+
+        if self.surface is not None:
+            screen.blit(self.surface, self.origin)
+
+    def get_rect(self) -> Optional[pygame.Rect]:
+        """Прямоугольник слоя на экране (None - слой пуст)"""
+        if self.surface is None:
+            return None
+        return self.surface.get_rect(topleft=self.origin)
+
+    def _rebuild(self, screen_height: int, values: tuple) -> None:
+        """
+        Собрать поверхность слоя
+
+        Args:
+            screen_height: Высота экрана (для элементов у нижнего края)
+            values: Значения привязок элементов
+        """
+        self.rebuilds += 1
+
+        parts = []
+        for widget, value in zip(self.widgets, values):
+            formatted = widget.format(value)
+            if formatted is None:
+                continue
+            text, color = formatted
+            x, y = widget.pos
+            if y < 0:
+                y += screen_height
+            parts.append((render_text(text, widget.size, color), x, y))
+
+        if not parts:
+            self.surface = None
+            return
+
+        # Поверхность размером с объединение надписей, а не со весь экран
+        rects = [text.get_rect(topleft=(x, y)) for text, x, y in parts]
+        bounds = rects[0].unionall(rects[1:])
+        self.origin = bounds.topleft
+        self.surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for text, x, y in parts:
+            self.surface.blit(text, (x - bounds.x, y - bounds.y))
+
+
+class Hud:
+    """HUD из нескольких кэшированных слоёв"""
+
+    def __init__(self):
+        """Инициализация HUD"""
+        self.layers: Dict[str, HudLayer] = {}
+
+    def add(
+        self,
+        layer: str,
+        bind: Callable[[], Any],
+        format: Callable[[Any], Optional[Tuple[str, Color]]],
+        pos: Tuple[int, int],
+        size: int = 24
+    ) -> HudWidget:
+        """
+        Объявить элемент HUD
+
+        Args:
+            layer: Имя слоя (элементы рядом на экране - в одном слое)
+            bind: Функция значения из состояния игры
+            format: Значение -> (текст, цвет) или None (скрыт)
+            pos: Позиция (y < 0 - отсчёт от низа экрана)
+            size: Размер шрифта
+
+        Returns:
+            Созданный элемент
+        """
+        widget = HudWidget(bind, format, pos, size)
+        self.layers.setdefault(layer, HudLayer()).widgets.append(widget)
+        return widget
+
+    def render(self, screen: pygame.Surface) -> None:
+        """
+        Вывести все слои
+
+        Args:
+            screen: Поверхность для отрисовки
+        """
+        for layer in self.layers.values():
+            layer.render(screen)
+
+    def get_dirty_rects(self) -> List[pygame.Rect]:
+        """Области, перерисованные слоями в последнем кадре"""
+        return [rect for layer in self.layers.values() for rect in layer.dirty if rect is not None]
+
+    def get_rebuilds(self) -> int:
+        """Сколько раз перерисовывались слои"""
+        return sum(layer.rebuilds for layer in self.layers.values())
+
+
+if __name__ == "__main__":
+    # Тест: счётчик меняется раз в 30 кадров - 20 перерисовок статуса и одна подсказок из 600 кадров
+    pygame.init()
+    screen = pygame.display.set_mode((400, 300))
+
+    state = {"frame": 0}
+    hud = Hud()
+    hud.add("status", lambda: state["frame"] // 30, lambda v: (f"Шагов: {v}", (200, 200, 200)), (10, 10))
+    hud.add("status", lambda: None, lambda v: ("HP: 100/100", (255, 0, 0)), (10, 35))
+    hud.add("hints", lambda: None, lambda v: ("Подсказка", (150, 150, 150)), (10, -30), size=20)
+
+    for frame in range(600):
+        state["frame"] = frame
+        screen.fill((0, 0, 0))
+        hud.render(screen)
+
+    print(f"Кадров: 600, перерисовок слоёв: {hud.get_rebuilds()}")
+    pygame.quit()
@@ -33,6 +33,9 @@ class InventoryUI:
         # Выбранный слот
         self.selected_slot: Optional[int] = None
         
+        # Шина игровых событий (будет установлена извне): выброшенные предметы
+        self.events = None
+        
         # Шрифты
         self.font = pygame.font.Font(None, 24)
         self.small_font = pygame.font.Font(None, 18)
@@ -213,11 +216,11 @@ class InventoryUI:
                         # Возвращаем информацию о выброшенном предмете
                         # Игра должна обработать это и разместить предмет на карте
                         dropped = inventory.drop_item(self.selected_slot, 1)
-                        if dropped and player is not None:
-                            # Сохраняем информацию для размещения на карте
-                            if not hasattr(player, '_dropped_items'):
-                                player._dropped_items = []
-                            player._dropped_items.append(dropped)
+                        if dropped and self.events:
+                            # Игра разместит предмет на карте по событию
+                            from ..core.events import ItemDropped
+                            item, quantity = dropped
+                            self.events.publish(ItemDropped(item, quantity))
                             
         return False
 
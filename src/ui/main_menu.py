@@ -3,10 +3,10 @@
 """
 import pygame
 import os
-import json
 from typing import Optional, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from ..save.profile_index import ProfileIndex
 
 
 @dataclass
@@ -71,6 +71,7 @@ class MainMenu:
         
         # Профили
         self.profiles_dir = "saves/profiles"
+        self.profile_index = ProfileIndex(self.profiles_dir)
         self.profiles: List[PlayerProfile] = []
         self._load_profiles()
         
@@ -86,30 +87,14 @@ class MainMenu:
         self.profile_color = (150, 200, 255)
         
     def _load_profiles(self) -> None:
-        """Загрузить список профилей"""
+        """Загрузить список профилей (из индекса, одним чтением)"""
         self.profiles = []
         
-        # Создаём директорию если не существует
-        os.makedirs(self.profiles_dir, exist_ok=True)
-        
-        # Загружаем все профили (каждый профиль - это папка)
-        for profile_name in os.listdir(self.profiles_dir):
-            profile_path = os.path.join(self.profiles_dir, profile_name)
-            
-            # Проверяем что это директория
-            if not os.path.isdir(profile_path):
-                continue
-            
-            # Ищем файл метаданных profile.json
-            metadata_file = os.path.join(profile_path, "profile.json")
-            if os.path.exists(metadata_file):
-                try:
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        profile = PlayerProfile.from_dict(data)
-                        self.profiles.append(profile)
-                except Exception as e:
-                    print(f"Ошибка загрузки профиля {profile_name}: {e}")
+        for data in self.profile_index.load():
+            try:
+                self.profiles.append(PlayerProfile.from_dict(data))
+            except Exception as e:
+                print(f"Ошибка загрузки профиля {data.get('name')}: {e}")
         
         # Сортируем по времени последней игры
         self.profiles.sort(key=lambda p: p.last_played, reverse=True)
@@ -121,16 +106,9 @@ class MainMenu:
         Args:
             profile: Профиль для сохранения
         """
-        # Создаём папку профиля
-        profile_path = os.path.join(self.profiles_dir, profile.name)
-        os.makedirs(profile_path, exist_ok=True)
-        
-        # Сохраняем метаданные в profile.json
-        metadata_file = os.path.join(profile_path, "profile.json")
-        
+        # Сохраняем profile.json и обновляем индекс
         try:
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(profile.to_dict(), f, ensure_ascii=False, indent=2)
+            self.profile_index.save_profile(profile.to_dict())
         except Exception as e:
             print(f"Ошибка сохранения профиля: {e}")
             
@@ -148,7 +126,8 @@ class MainMenu:
             if os.path.exists(profile_path):
                 import shutil
                 shutil.rmtree(profile_path)
-                
+            
+            self.profile_index.remove(profile_name)
             self._load_profiles()
         except Exception as e:
             print(f"Ошибка удаления профиля: {e}")
@@ -1,10 +1,25 @@
 """
 Лог игровых сообщений
+
+На экране показываются последние сообщения, которые гаснут к концу жизни.
+Все сообщения сессии остаются в кольцевом буфере истории (deque с
+ограничением длины), который можно листать и фильтровать по типу (L),
+и - если задан файл профиля - дописываются на диск (JSON Lines) пачкой
+раз в кадр, а не открытием файла на каждое сообщение.
+
+Строка сообщения (фон, тень, текст) рисуется один раз при первом показе
+и хранится в сообщении; затухание делается только через set_alpha,
+поэтому кадр лога - несколько blit.
 """
+import json
+import os
+import time
 import pygame
-from typing import List, Tuple
-from dataclasses import dataclass
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
+from ..graphics.text_cache import get_font, render_text
 
 
 class MessageType(Enum):
@@ -25,30 +40,48 @@ class Message:
     message_type: MessageType
     lifetime: float = 5.0  # Время жизни в секундах
     age: float = 0.0       # Возраст сообщения
+    timestamp: float = field(default_factory=time.time)  # Время появления (для истории)
+    line: Optional[pygame.Surface] = field(default=None, repr=False, compare=False)  # Кэш строки
 
 
 class MessageLog:
     """Лог игровых сообщений"""
     
-    def __init__(self, screen_width: int, screen_height: int, max_messages: int = 5):
+    HISTORY_SIZE = 500  # Сообщений в истории сессии (и в файле профиля)
+    
+    def __init__(self, screen_width: int, screen_height: int, max_messages: int = 5,
+                 history_size: int = HISTORY_SIZE):
         """
         Инициализация лога
         
         Args:
             screen_width: Ширина экрана
             screen_height: Высота экрана
-            max_messages: Максимальное количество сообщений
+            max_messages: Максимальное количество сообщений на экране
+            history_size: Размер истории (старые сообщения вытесняются)
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.max_messages = max_messages
-        self.messages: List[Message] = []
+        
+        # Сообщения на экране (новые слева) и вся история (новые справа)
+        self.messages: Deque[Message] = deque(maxlen=max_messages)
+        self.history: Deque[Message] = deque(maxlen=history_size)
+        
+        # Файл истории профиля (None - история только в памяти) и ещё не записанные строки
+        self.history_file: Optional[str] = None
+        self.pending_lines: List[str] = []
+        
+        # Просмотр истории
+        self.history_open = False
+        self.history_filter: Optional[MessageType] = None
+        self.history_scroll = 0  # Сколько строк пролистано от конца
         
         # Параметры отображения
         self.padding = 20
         self.y = 20  # Сверху справа
         self.line_height = 35
-        self.font = pygame.font.Font(None, 32)  # Увеличенный размер
+        self.font = get_font(32)  # Увеличенный размер
         
         # Цвета для разных типов сообщений
         self.colors = {
@@ -61,6 +94,17 @@ class MessageLog:
             MessageType.STORY: (200, 100, 255),     # Фиолетовый
         }
         
+    def resize(self, screen_width: int, screen_height: int) -> None:
+        """
+        Обновить размеры экрана (история и сообщения сохраняются)
+        
+        Args:
+            screen_width: Ширина экрана
+            screen_height: Высота экрана
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        
     def add_message(self, text: str, message_type: MessageType = MessageType.INFO) -> None:
         """
         Добавить сообщение
@@ -69,15 +113,16 @@ class MessageLog:
             text: Текст сообщения
             message_type: Тип сообщения
         """
-        # Создаём новое сообщение
         message = Message(text=text, message_type=message_type)
         
-        # Добавляем в начало списка
-        self.messages.insert(0, message)
+        # Вытесняемое с экрана сообщение остаётся в истории - освобождаем его строку
+        if len(self.messages) == self.messages.maxlen:
+            self.messages.pop().line = None
+        self.messages.appendleft(message)
+        self.history.append(message)
         
-        # Ограничиваем количество сообщений
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[:self.max_messages]
+        if self.history_file:
+            self.pending_lines.append(self._to_json(message) + "\n")
             
     def update(self, dt: float) -> None:
         """
@@ -90,8 +135,37 @@ class MessageLog:
         for message in self.messages:
             message.age += dt
             
-        # Удаляем старые сообщения
-        self.messages = [m for m in self.messages if m.age < m.lifetime]
+        # Убираем с экрана истёкшие (самые старые - справа); в истории они остаются,
+        # а кэш строки освобождается
+        while self.messages and self.messages[-1].age >= self.messages[-1].lifetime:
+            self.messages.pop().line = None
+            
+        # Сообщения кадра - в файл одной записью
+        if self.pending_lines:
+            self.flush_history()
+        
+    def _get_line(self, message: Message) -> pygame.Surface:
+        """
+        Строка сообщения: фон, тень и текст на одной поверхности (рисуется один раз)
+        
+        Args:
+            message: Сообщение
+            
+        Returns:
+            Поверхность строки с попиксельной прозрачностью
+        """
+        if message.line is None:
+            color = self.colors.get(message.message_type, (255, 255, 255))
+            text_surface = self.font.render(message.text, True, color)
+            shadow_surface = self.font.render(message.text, True, (0, 0, 0))
+            shadow_surface.set_alpha(128)
+            
+            line = pygame.Surface((text_surface.get_width() + 20, self.line_height - 5), pygame.SRCALPHA)
+            line.fill((0, 0, 0, 85))  # Полупрозрачный фон для читаемости
+            line.blit(shadow_surface, (12, 7))
+            line.blit(text_surface, (10, 5))
+            message.line = line
+        return message.line
         
     def render(self, screen: pygame.Surface) -> None:
         """
@@ -105,42 +179,209 @@ class MessageLog:
         
         y_offset = self.y
         
-        for i, message in enumerate(self.messages):
+        for message in self.messages:
             # Вычисляем прозрачность (исчезает к концу жизни)
             alpha_factor = 1.0 - (message.age / message.lifetime)
-            alpha = int(255 * alpha_factor)
             
-            # Получаем цвет для типа сообщения
-            base_color = self.colors.get(message.message_type, (255, 255, 255))
+            line = self._get_line(message)
+            line.set_alpha(int(255 * alpha_factor))
             
-            # Создаём поверхность с прозрачностью
-            text_surface = self.font.render(message.text, True, base_color)
-            text_surface.set_alpha(alpha)
+            # Выравнивание по правому краю
+            screen.blit(line, (actual_width - line.get_width() + 10 - self.padding, y_offset - 5))
             
-            # Вычисляем позицию справа (выравнивание по правому краю)
-            text_width = text_surface.get_width()
-            x_pos = actual_width - text_width - self.padding
+            y_offset += self.line_height
             
-            # Рисуем полупрозрачный фон для читаемости
-            bg_rect = pygame.Rect(x_pos - 10, y_offset - 5, text_width + 20, self.line_height - 5)
-            bg_surface = pygame.Surface((bg_rect.width, bg_rect.height))
-            bg_surface.set_alpha(alpha // 3)
-            bg_surface.fill((0, 0, 0))
-            screen.blit(bg_surface, bg_rect.topleft)
+    def get_bounds(self, screen_width: int) -> Optional[pygame.Rect]:
+        """
+        Область экрана, занятая сообщениями (для грязных областей)
+        
+        Args:
+            screen_width: Ширина экрана
             
-            # Рисуем тень для читаемости
-            shadow_surface = self.font.render(message.text, True, (0, 0, 0))
-            shadow_surface.set_alpha(alpha // 2)
-            screen.blit(shadow_surface, (x_pos + 2, y_offset + 2))
+        Returns:
+            Прямоугольник или None (сообщений нет)
+        """
+        if not self.messages:
+            return None
+        
+        width = max(self._get_line(message).get_width() for message in self.messages)
+        return pygame.Rect(
+            screen_width - width + 10 - self.padding, self.y - 5,
+            width, len(self.messages) * self.line_height
+        )
+        
+    def clear(self) -> None:
+        """Очистить сообщения на экране (история сохраняется)"""
+        for message in self.messages:
+            message.line = None
+        self.messages.clear()
+        
+    # История сообщений
+    
+    def attach_history_file(self, path: str) -> None:
+        """
+        Подключить файл истории профиля: загрузить его и дописывать новые сообщения
+        
+        Args:
+            path: Путь к файлу (JSON Lines)
+        """
+        self.flush_history()
+        self.clear()
+        self.history.clear()
+        self.history_file = path
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for row in f:
+                    try:
+                        data = json.loads(row)
+                        message = Message(
+                            text=data["text"],
+                            message_type=MessageType(data["type"]),
+                            timestamp=data["time"]
+                        )
+                    except (ValueError, KeyError):
+                        continue  # Повреждённая строка (например, оборванная запись)
+                    self.history.append(message)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Не удалось прочитать историю сообщений: {e}")
+        
+        # Переписываем файл: на диске остаётся не больше history_size строк
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                for message in self.history:
+                    f.write(self._to_json(message) + "\n")
+        except OSError as e:
+            print(f"⚠️ Не удалось сохранить историю сообщений: {e}")
+            self.history_file = None
+        
+    def detach_history_file(self) -> None:
+        """Отключить файл истории (выход в меню), дописав накопленное"""
+        self.flush_history()
+        self.history_file = None
+        
+    @staticmethod
+    def _to_json(message: Message) -> str:
+        """Строка JSON Lines для сообщения"""
+        return json.dumps(
+            {"time": message.timestamp, "type": message.message_type.value, "text": message.text},
+            ensure_ascii=False
+        )
+        
+    def flush_history(self) -> None:
+        """Дописать накопленные сообщения в файл истории (одно открытие файла)"""
+        lines, self.pending_lines = self.pending_lines, []
+        if not lines or not self.history_file:
+            return
+        try:
+            with open(self.history_file, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+        except OSError as e:
+            print(f"⚠️ Не удалось записать историю сообщений: {e}")
+            self.history_file = None
+        
+    def get_history(self, message_type: Optional[MessageType] = None) -> List[Message]:
+        """
+        Сообщения истории (от старых к новым)
+        
+        Args:
+            message_type: Фильтр по типу (None - все)
             
-            # Рисуем текст
-            screen.blit(text_surface, (x_pos, y_offset))
+        Returns:
+            Список сообщений
+        """
+        if message_type is None:
+            return list(self.history)
+        return [m for m in self.history if m.message_type == message_type]
+        
+    def toggle_history(self) -> None:
+        """Открыть/закрыть просмотр истории"""
+        self.history_open = not self.history_open
+        self.history_scroll = 0
+        
+    def cycle_history_filter(self) -> None:
+        """Следующий фильтр по типу: все -> INFO -> ... -> STORY -> все"""
+        types = [None] + list(MessageType)
+        self.history_filter = types[(types.index(self.history_filter) + 1) % len(types)]
+        self.history_scroll = 0
+        
+    def handle_history_input(self, event: pygame.event.Event) -> bool:
+        """
+        Обработка ввода в просмотре истории
+        
+        Args:
+            event: Событие pygame
             
-            y_offset += self.line_height
+        Returns:
+            True если просмотр нужно закрыть
+        """
+        page = max(1, self._history_rows() - 1)
+        
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_ESCAPE, pygame.K_l):
+                return True
+            elif event.key == pygame.K_TAB:
+                self.cycle_history_filter()
+            elif event.key in (pygame.K_UP, pygame.K_w):
+                self.history_scroll += 1
+            elif event.key in (pygame.K_DOWN, pygame.K_s):
+                self.history_scroll -= 1
+            elif event.key == pygame.K_PAGEUP:
+                self.history_scroll += page
+            elif event.key == pygame.K_PAGEDOWN:
+                self.history_scroll -= page
+            elif event.key == pygame.K_END:
+                self.history_scroll = 0
+        elif event.type == pygame.MOUSEWHEEL:
+            self.history_scroll += event.y * 3
+        
+        return False
+        
+    def _history_rows(self) -> int:
+        """Сколько строк истории помещается на экране"""
+        return max(1, (self.screen_height - 140) // self.line_height)
+        
+    def render_history(self, screen: pygame.Surface) -> None:
+        """
+        Отрисовка просмотра истории
+        
+        Args:
+            screen: Поверхность для отрисовки
+        """
+        width, height = screen.get_size()
+        
+        overlay = pygame.Surface((width, height))
+        overlay.set_alpha(220)
+        overlay.fill((0, 0, 0))
+        screen.blit(overlay, (0, 0))
+        
+        messages = self.get_history(self.history_filter)
+        rows = self._history_rows()
+        self.history_scroll = max(0, min(self.history_scroll, len(messages) - rows))
+        
+        end = len(messages) - self.history_scroll
+        visible = messages[max(0, end - rows):end]
+        
+        filter_name = self.history_filter.value if self.history_filter else "все"
+        title = render_text(f"Журнал сообщений ({len(messages)}, фильтр: {filter_name})", 36, (255, 255, 255))
+        screen.blit(title, (40, 30))
+        
+        # Новые внизу, как в чате
+        y = height - 80 - len(visible) * self.line_height
+        for message in visible:
+            stamp = render_text(time.strftime("%H:%M:%S", time.localtime(message.timestamp)), 24, (150, 150, 150))
+            screen.blit(stamp, (40, y + 5))
             
-    def clear(self) -> None:
-        """Очистить все сообщения"""
-        self.messages.clear()
+            # Строки истории берутся из общего LRU-кэша текста, а не хранятся в сообщениях
+            color = self.colors.get(message.message_type, (255, 255, 255))
+            screen.blit(render_text(message.text, 32, color), (140, y))
+            y += self.line_height
+        
+        hint = render_text("Вверх/Вниз, PgUp/PgDn, колесо = листать | TAB = фильтр по типу | L/ESC = закрыть", 20, (150, 150, 150))
+        screen.blit(hint, (40, height - 40))
         
     # Удобные методы для разных типов сообщений
     
@@ -218,15 +459,19 @@ if __name__ == "__main__":
                     message_log.item("Предмет")
                 elif event.key == pygame.K_7:
                     message_log.story("Сюжет")
+                elif event.key == pygame.K_l:
+                    message_log.toggle_history()
                     
         message_log.update(dt)
         
         screen.fill((0, 0, 0))
         message_log.render(screen)
+        if message_log.history_open:
+            message_log.render_history(screen)
         
         # Подсказка
         font = pygame.font.Font(None, 20)
-        hint = font.render("Press 1-7 to test different message types", True, (150, 150, 150))
+        hint = font.render("Press 1-7 to test different message types, L - history", True, (150, 150, 150))
         screen.blit(hint, (10, 10))
         
         pygame.display.flip()
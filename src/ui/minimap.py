@@ -0,0 +1,233 @@
+"""
+Миникарта этажа
+
+Для текущего уровня хранится маленькая поверхность, синхронизированная
+с Level.tiles и FogOfWar.visibility. Хранится только одна карта: уровень
+пересоздаётся при каждом входе на этаж, и карта прежнего уровня не
+должна удерживать его в памяти. Пиксели пишутся через pygame.surfarray
+из таблицы цветов NumPy:
+- при первом показе уровня (или смене массива тумана) карта строится
+  целиком одной векторной операцией;
+- дальше дорисовываются только клетки, впервые открытые туманом
+  (FogOfWar.take_newly_explored), поэтому стоимость кадра пропорциональна
+  числу новых клеток.
+
+Маркеры (вход, выход, руны, обнаруженные ловушки, игрок) - единицы
+прямоугольников, они рисуются поверх карты каждый кадр.
+"""
+from typing import Optional
+import numpy as np
+import pygame
+from ..world.fog_of_war import FogOfWar
+
+
+class FloorMap:
+    """Поверхность миникарты одного этажа"""
+
+    def __init__(self, level, cell_size: int):
+        """
+        Инициализация карты этажа
+
+        Args:
+            level: Уровень
+            cell_size: Размер клетки в пикселях
+        """
+        self.level = level
+        self.cell_size = cell_size
+        self.surface = pygame.Surface((level.width * cell_size, level.height * cell_size))
+
+        # Цвет по типу тайла (пол, стена), остальные типы - как стена
+        self.palette = np.zeros((256, 3), dtype=np.uint8)
+        self.palette[:] = level.COLOR_WALL
+        self.palette[level.TILE_FLOOR] = level.COLOR_FLOOR
+
+        # С каким состоянием тумана синхронизирована карта
+        self.visibility = None
+        self.generation = -1
+
+        # Смещения пикселей внутри клетки (для векторной записи блоков)
+        offsets = np.arange(cell_size)
+        self._dx = offsets[None, :, None]
+        self._dy = offsets[None, None, :]
+
+    def sync(self) -> None:
+        """Привести карту в соответствие с туманом войны"""
+        fog = self.level.fog_of_war
+
+        if fog.visibility is not self.visibility or fog.generation != self.generation:
+            self._rebuild()
+            return
+
+        cells = fog.take_newly_explored()
+        if cells:
+            self._update_cells(np.array(cells, dtype=np.intp))
+
+    def _rebuild(self) -> None:
+        """Построить карту целиком"""
+        fog = self.level.fog_of_war
+        fog.take_newly_explored()
+        self.visibility = fog.visibility
+        self.generation = fog.generation
+
+        colors = self.palette[self.level.tiles]
+        colors[fog.visibility == FogOfWar.UNEXPLORED] = 0
+
+        # surfarray ждёт (x, y, rgb); растягиваем клетки до cell_size
+        pixels = colors.transpose(1, 0, 2)
+        pixels = pixels.repeat(self.cell_size, axis=0).repeat(self.cell_size, axis=1)
+        pygame.surfarray.blit_array(self.surface, pixels)
+
+    def _update_cells(self, cells: np.ndarray) -> None:
+        """
+        Дорисовать открытые клетки
+
+        Args:
+            cells: Массив (n, 2) координат (x, y)
+        """
+        xs, ys = cells[:, 0], cells[:, 1]
+        colors = self.palette[self.level.tiles[ys, xs]]
+
+        px = xs[:, None, None] * self.cell_size + self._dx
+        py = ys[:, None, None] * self.cell_size + self._dy
+
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        pixels[px, py] = colors[:, None, None, :]
+        del pixels  # Снимаем блокировку поверхности
+
+
+class Minimap:
+    """Миникарта в правом нижнем углу экрана"""
+
+    CELL_SIZE = 3
+    MARGIN = 10
+    BORDER_COLOR = (120, 120, 140)
+
+    MARKER_COLORS = {
+        "entrance": (0, 255, 0),
+        "exit": (255, 60, 60),
+        "rune": (255, 215, 0),
+        "trap": (255, 120, 0),
+        "player": (255, 255, 255),
+    }
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        """
+        Инициализация миникарты
+
+        Args:
+            cell_size: Размер клетки в пикселях
+        """
+        self.cell_size = cell_size
+        self.visible = True
+
+        # Карта текущего уровня (карта прежнего уровня отпускается вместе с ним)
+        self.floor_map: Optional[FloorMap] = None
+
+    def toggle(self) -> None:
+        """Показать/скрыть миникарту"""
+        self.visible = not self.visible
+
+    def get_floor_map(self, level) -> FloorMap:
+        """
+        Карта этажа (создаётся заново, если уровень пересоздан)
+
+        Args:
+            level: Уровень
+
+        Returns:
+            Карта этажа
+        """
+        if self.floor_map is None or self.floor_map.level is not level:
+            self.floor_map = FloorMap(level, self.cell_size)
+        return self.floor_map
+
+    def get_bounds(self, screen: pygame.Surface, level) -> Optional[pygame.Rect]:
+        """
+        Область экрана, занятая миникартой (с рамкой и маркерами)
+
+        Args:
+            screen: Поверхность для отрисовки
+            level: Текущий уровень
+
+        Returns:
+            Прямоугольник или None (миникарта скрыта)
+        """
+        if not self.visible or level is None:
+            return None
+
+        width, height = level.width * self.cell_size, level.height * self.cell_size
+        rect = pygame.Rect(
+            screen.get_width() - width - self.MARGIN, screen.get_height() - height - self.MARGIN, width, height
+        )
+        return rect.inflate(4, 4)
+
+    def render(self, screen: pygame.Surface, level, player_x: int, player_y: int) -> None:
+        """
+        Отрисовка миникарты
+
+        Args:
+            screen: Поверхность для отрисовки
+            level: Текущий уровень
+            player_x: Позиция игрока X (в клетках)
+            player_y: Позиция игрока Y (в клетках)
+        """
+        if not self.visible or level is None:
+            return
+
+        floor_map = self.get_floor_map(level)
+        floor_map.sync()
+
+        width, height = floor_map.surface.get_size()
+        origin_x = screen.get_width() - width - self.MARGIN
+        origin_y = screen.get_height() - height - self.MARGIN
+
+        screen.blit(floor_map.surface, (origin_x, origin_y))
+        pygame.draw.rect(screen, self.BORDER_COLOR, (origin_x - 1, origin_y - 1, width + 2, height + 2), 1)
+
+        fog = level.fog_of_war
+
+        def marker(x: int, y: int, kind: str) -> None:
+            pygame.draw.rect(
+                screen,
+                self.MARKER_COLORS[kind],
+                (origin_x + x * self.cell_size - 1, origin_y + y * self.cell_size - 1,
+                 self.cell_size + 2, self.cell_size + 2)
+            )
+
+        if level.entrance_pos and fog.is_explored(*level.entrance_pos):
+            marker(*level.entrance_pos, "entrance")
+        if level.exit_pos and fog.is_explored(*level.exit_pos):
+            marker(*level.exit_pos, "exit")
+
+        for rune in level.rune_manager.runes:
+            if not rune.collected and fog.is_explored(rune.x, rune.y):
+                marker(rune.x, rune.y, "rune")
+
+        for trap in level.traps:
+            if trap.is_visible() and fog.is_explored(trap.x, trap.y):
+                marker(trap.x, trap.y, "trap")
+
+        marker(player_x, player_y, "player")
+
+
+if __name__ == "__main__":
+    # Тест: открываем карту по шагам и считаем обновлённые клетки
+    import time
+    from ..world.level import Level
+
+    pygame.init()
+    screen = pygame.display.set_mode((400, 300))
+
+    level = Level(60, 40)
+    level._generate_test_level()
+    minimap = Minimap()
+
+    for step in range(1, 30):
+        level.update_fog_of_war(step * 2, 20)
+        pending = len(level.fog_of_war.newly_explored)
+        start = time.perf_counter()
+        minimap.render(screen, level, step * 2, 20)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Шаг {step}: новых клеток {pending}, {elapsed:.3f} мс")
+
+    pygame.quit()
@@ -3,6 +3,7 @@
 """
 import pygame
 from pathlib import Path
+from ..graphics.text_cache import get_font
 
 
 class SplashScreen:
@@ -181,7 +182,7 @@ class SplashScreen:
         
         # Подсказка "Press any key" (только после задержки)
         if self.can_skip and self.state == "showing":
-            font = pygame.font.Font(None, 24)
+            font = get_font(24)
             
             # Мигающий текст
             pulse = abs(pygame.time.get_ticks() % 1000 - 500) / 500.0
@@ -239,7 +239,8 @@ class BiomeDecorator:
                 x = room.x + random.randint(1, room.width - 2)
                 y = room.y + random.randint(1, room.height - 2)
                 
-                # Кристаллы дают освещение (пока просто помечаем)
+                # Кристаллы дают освещение (см. graphics/lighting.py)
+                level.crystals.append((x, y))
     
     @staticmethod
     def _add_lava_pools(level, rooms: list) -> None:
@@ -280,7 +281,8 @@ class BiomeDecorator:
             x = room.x + random.randint(1, room.width - 2)
             y = room.y + random.randint(1, room.height - 2)
             
-            # Портал телепортирует в случайное место (пока просто помечаем)
+            # Портал телепортирует в случайное место (пока только светится)
+            level.portals.append((x, y))
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ from enum import Enum
 import pygame
 from typing import List, Optional
 from ..items.item import Item
+from ..graphics.text_cache import render_text
 
 
 class ContainerType(Enum):
@@ -252,7 +253,6 @@ class Container:
                 2
             )
             # Вопросительный знак
-            font = pygame.font.Font(None, 20)
-            text = font.render("?", True, (255, 255, 0))
+            text = render_text("?", 20, (255, 255, 0))
             text_rect = text.get_rect(center=(center_x, center_y))
             screen.blit(text, text_rect)
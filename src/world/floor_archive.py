@@ -0,0 +1,309 @@
+"""
+Архив стабилизированных этажей (memory-mapped)
+
+Формат файла floors.bin:
+    [заголовок][таблица индекса][данные]
+
+Заголовок фиксированного размера, таблица индекса на `capacity` записей,
+дальше сырые массивы uint8 (тайлы и туман войны) подряд, без сжатия.
+Массивы открываются через np.memmap, поэтому в памяти процесса
+живёт только активный этаж, а остальные лежат на диске.
+
+Файл никогда не переписывается целиком: открытые memmap активного
+этажа держат его (на Windows такой файл нельзя подменить). Расширенная
+таблица индекса дописывается в конец файла, и заголовок начинает
+указывать на неё; повторно сохранённый этаж того же размера пишется
+поверх своих старых данных.
+"""
+import os
+import struct
+from typing import Optional, Tuple
+import numpy as np
+
+
+class FloorArchive:
+    """Файловый архив сеток стабилизированных этажей"""
+
+    MAGIC = b"NIIFLOOR"
+    VERSION = 2
+
+    # magic, версия, зарезервировано, ёмкость индекса, смещение таблицы индекса
+    HEADER_FORMAT = "<8sHHIQ"
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+    # Версия 1: без смещения, таблица сразу за заголовком (читается, при расширении переводится на 2)
+    HEADER_FORMAT_V1 = "<8sHHI"
+    HEADER_SIZE_V1 = struct.calcsize(HEADER_FORMAT_V1)
+
+    # этаж, высота, ширина, смещение тайлов, смещение тумана (0 = нет)
+    ENTRY_FORMAT = "<iHHQQ"
+    ENTRY_SIZE = struct.calcsize(ENTRY_FORMAT)
+
+    DEFAULT_CAPACITY = 64
+    ALIGNMENT = 64  # Выравнивание массивов в файле
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        """
+        Инициализация архива
+
+        Args:
+            path: Путь к файлу архива (обычно saves/profiles/<имя>/floors.bin)
+            capacity: Ёмкость индекса для нового файла
+        """
+        self.path = path
+        self.capacity = capacity
+        self.table_offset = self.HEADER_SIZE
+
+        # Индекс в памяти: этаж -> (высота, ширина, смещение тайлов, смещение тумана)
+        self.index: dict[int, Tuple[int, int, int, int]] = {}
+        # Этаж -> номер слота в таблице индекса на диске
+        self.slots: dict[int, int] = {}
+
+        if os.path.exists(self.path):
+            try:
+                self._read_index()
+            except (OSError, ValueError, struct.error) as e:
+                # Битый архив не должен запирать профиль: откладываем его и начинаем новый
+                print(f"⚠️  Архив этажей не открылся: {e}")
+                os.replace(self.path, self.path + ".bad")
+                print(f"   Повреждённый файл сохранён как {self.path}.bad")
+                self.capacity = capacity
+                self.table_offset = self.HEADER_SIZE
+                self.index = {}
+                self.slots = {}
+                self._write_empty(self.path, self.capacity)
+        else:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._write_empty(self.path, self.capacity)
+
+        print(f"🗄️  Архив этажей: {self.path} ({len(self.index)} этажей)")
+
+    @property
+    def data_start(self) -> int:
+        """Начало свободной области (сразу после таблицы индекса, с выравниванием)"""
+        return self._align(self.table_offset + self.capacity * self.ENTRY_SIZE)
+
+    def _align(self, offset: int) -> int:
+        """Выровнять смещение вверх до ALIGNMENT"""
+        return (offset + self.ALIGNMENT - 1) // self.ALIGNMENT * self.ALIGNMENT
+
+    def _write_empty(self, path: str, capacity: int) -> None:
+        """
+        Создать пустой файл архива (через временный файл, чтобы сбой не оставил обрубок)
+
+        Args:
+            path: Путь к файлу
+            capacity: Ёмкость индекса
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(struct.pack(self.HEADER_FORMAT, self.MAGIC, self.VERSION, 0, capacity, self.HEADER_SIZE))
+            f.write(b"\x00" * (capacity * self.ENTRY_SIZE))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _read_index(self) -> None:
+        """Прочитать заголовок и таблицу индекса, проверив, что записи не выходят за файл"""
+        with open(self.path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            header = f.read(self.HEADER_SIZE)
+            if len(header) < self.HEADER_SIZE_V1:
+                raise ValueError(f"Повреждённый архив этажей: {self.path}")
+
+            magic, version, _, capacity = struct.unpack(self.HEADER_FORMAT_V1, header[:self.HEADER_SIZE_V1])
+            if magic != self.MAGIC or version not in (1, self.VERSION):
+                raise ValueError(f"Неизвестный формат архива этажей: {self.path}")
+
+            if version == 1:
+                table_offset = self.HEADER_SIZE_V1
+            elif len(header) < self.HEADER_SIZE:
+                raise ValueError(f"Повреждённый архив этажей: {self.path}")
+            else:
+                table_offset = struct.unpack(self.HEADER_FORMAT, header)[4]
+
+            f.seek(table_offset)
+            table = f.read(capacity * self.ENTRY_SIZE)
+            if len(table) < capacity * self.ENTRY_SIZE:
+                raise ValueError(f"Обрезанная таблица индекса архива этажей: {self.path}")
+
+        index = {}
+        slots = {}
+        for slot, (floor, height, width, tiles_offset, fog_offset) in enumerate(
+            struct.iter_unpack(self.ENTRY_FORMAT, table)
+        ):
+            if floor == 0:
+                continue
+            size = height * width
+            if tiles_offset + size > file_size or (fog_offset and fog_offset + size > file_size):
+                raise ValueError(f"Этаж {floor} выходит за конец архива: {self.path}")
+            index[floor] = (height, width, tiles_offset, fog_offset)
+            slots[floor] = slot
+
+        self.capacity = capacity
+        self.table_offset = table_offset
+        self.index = index
+        self.slots = slots
+
+    def _write_entry(self, f, slot: int, floor: int, entry: Tuple[int, int, int, int]) -> None:
+        """
+        Записать запись индекса в слот
+
+        Args:
+            f: Открытый файл архива (r+b)
+            slot: Номер слота в таблице
+            floor: Номер этажа
+            entry: (высота, ширина, смещение тайлов, смещение тумана)
+        """
+        f.seek(self.table_offset + slot * self.ENTRY_SIZE)
+        f.write(struct.pack(self.ENTRY_FORMAT, floor, *entry))
+
+    def has_floor(self, floor_number: int) -> bool:
+        """
+        Проверить, есть ли этаж в архиве
+
+        Args:
+            floor_number: Номер этажа
+
+        Returns:
+            True если сетки этажа сохранены
+        """
+        return floor_number in self.index
+
+    def store(self, floor_number: int, tiles: np.ndarray, fog_of_war: np.ndarray = None) -> None:
+        """
+        Записать сетки этажа в архив
+
+        Если этаж уже есть в архиве и новые сетки помещаются на место
+        старых (тот же размер, для тумана есть место), они пишутся поверх.
+        Иначе данные дописываются в конец файла, затем обновляется запись
+        индекса, а старый блок становится мёртвым грузом.
+
+        Args:
+            floor_number: Номер этажа (>= 1)
+            tiles: Тайлы уровня
+            fog_of_war: Карта видимости (может отсутствовать)
+        """
+        if floor_number not in self.index and len(self.index) >= self.capacity:
+            self._grow(self.capacity * 2)
+
+        # Байты копируются до записи: источник может быть memmap этого же блока
+        tiles = np.ascontiguousarray(tiles, dtype=np.uint8)
+        height, width = tiles.shape
+        tiles_bytes = tiles.tobytes()
+        fog_bytes = None if fog_of_war is None else np.ascontiguousarray(fog_of_war, dtype=np.uint8).tobytes()
+
+        old = self.index.get(floor_number)
+        reuse = old is not None and old[:2] == (height, width) and (fog_bytes is None or old[3])
+
+        with open(self.path, 'r+b') as f:
+            if reuse:
+                tiles_offset = old[2]
+                fog_offset = old[3] if fog_bytes is not None else 0
+            else:
+                f.seek(0, os.SEEK_END)
+                end = max(f.tell(), self.data_start)
+                tiles_offset = self._align(end)
+                fog_offset = self._align(tiles_offset + len(tiles_bytes)) if fog_bytes is not None else 0
+
+            f.seek(tiles_offset)
+            f.write(tiles_bytes)
+            if fog_bytes is not None:
+                f.seek(fog_offset)
+                f.write(fog_bytes)
+
+            # Индекс пишем последним, чтобы при сбое запись указывала на целые данные
+            f.flush()
+            entry = (height, width, tiles_offset, fog_offset)
+            slot = self.slots.get(floor_number, len(self.slots))
+            self._write_entry(f, slot, floor_number, entry)
+
+        self.index[floor_number] = entry
+        self.slots[floor_number] = slot
+
+    def load(self, floor_number: int) -> Optional[Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """
+        Открыть сетки этажа без копирования
+
+        Массивы открываются в режиме copy-on-write: чтение идёт прямо
+        из файла, а изменения (туман войны на активном этаже) остаются
+        в памяти процесса и не портят архив.
+
+        Args:
+            floor_number: Номер этажа
+
+        Returns:
+            (тайлы, туман войны или None) либо None если этажа нет
+        """
+        entry = self.index.get(floor_number)
+        if entry is None:
+            return None
+
+        height, width, tiles_offset, fog_offset = entry
+        tiles = np.memmap(self.path, dtype=np.uint8, mode='c', offset=tiles_offset, shape=(height, width))
+
+        fog = None
+        if fog_offset:
+            fog = np.memmap(self.path, dtype=np.uint8, mode='c', offset=fog_offset, shape=(height, width))
+
+        return tiles, fog
+
+    def _grow(self, new_capacity: int) -> None:
+        """
+        Расширить таблицу индекса
+
+        Новая таблица дописывается в конец файла, затем заголовок начинает
+        указывать на неё. Данные этажей не двигаются, а файл не подменяется,
+        поэтому открытые memmap (в том числе на Windows) остаются в силе.
+
+        Args:
+            new_capacity: Новая ёмкость индекса
+        """
+        with open(self.path, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            table_offset = self._align(f.tell())
+
+            table = bytearray(new_capacity * self.ENTRY_SIZE)
+            for floor, slot in self.slots.items():
+                struct.pack_into(self.ENTRY_FORMAT, table, slot * self.ENTRY_SIZE, floor, *self.index[floor])
+            f.seek(table_offset)
+            f.write(table)
+            f.flush()
+
+            # Заголовок - последним: до этого файл согласованно описывается старой таблицей
+            f.seek(0)
+            f.write(struct.pack(self.HEADER_FORMAT, self.MAGIC, self.VERSION, 0, new_capacity, table_offset))
+
+        self.capacity = new_capacity
+        self.table_offset = table_offset
+        print(f"🗄️  Индекс архива этажей расширен до {new_capacity}")
+
+
+if __name__ == "__main__":
+    # Тест FloorArchive
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = FloorArchive(os.path.join(tmp, "floors.bin"), capacity=2)
+
+        for floor in range(1, 6):
+            tiles = np.full((40, 60), floor, dtype=np.uint8)
+            fog = np.ones((40, 60), dtype=np.uint8)
+            archive.store(floor, tiles, fog)
+
+        # Повторное сохранение того же размера не растит файл
+        size = os.path.getsize(archive.path)
+        archive.store(3, np.full((40, 60), 33, dtype=np.uint8), np.ones((40, 60), dtype=np.uint8))
+        print(f"Повторное сохранение этажа 3: файл вырос на {os.path.getsize(archive.path) - size} байт")
+
+        reopened = FloorArchive(archive.path)
+        tiles, fog = reopened.load(3)
+        print(f"Этажей в архиве: {len(reopened.index)}, ёмкость: {reopened.capacity}")
+        print(f"Этаж 3: {tiles.shape}, значение {tiles[0, 0]}, туман {fog[0, 0]}")
+        del tiles, fog
+
+        # Обрезанный файл откладывается, профиль открывается с пустым архивом
+        with open(archive.path, 'r+b') as f:
+            f.truncate(10)
+        recovered = FloorArchive(archive.path)
+        print(f"После повреждения: этажей {len(recovered.index)}, отложен: {os.path.exists(archive.path + '.bad')}")
@@ -4,6 +4,7 @@
 from dataclasses import dataclass, field
 from typing import Optional
 import numpy as np
+from .floor_archive import FloorArchive
 
 
 @dataclass
@@ -27,6 +28,9 @@ class FloorState:
     riddle_spawned: bool = False  # Была ли создана загадка
     riddle_positions: list = field(default_factory=list)  # Позиции загадок (x, y)
     
+    # Архив профиля (если подключён, сетки хранятся на диске, а не в RAM)
+    archive: Optional[FloorArchive] = field(default=None, repr=False)
+    
     def stabilize(
         self, 
         level_tiles: np.ndarray, 
@@ -44,13 +48,20 @@ class FloorState:
             fog_of_war: Карта видимости для сохранения
         """
         self.is_stabilized = True
-        self.saved_tiles = level_tiles.copy()
         self.entrance_pos = entrance
         self.exit_pos = exit
         
-        # Сохраняем fog of war если передан
-        if fog_of_war is not None:
-            self.saved_fog_of_war = fog_of_war.copy()
+        if self.archive is not None:
+            # Сетки уходят в архив, в памяти остаётся только живой Level
+            self.archive.store(self.floor_number, level_tiles, fog_of_war)
+            self.saved_tiles = None
+            self.saved_fog_of_war = None
+        else:
+            self.saved_tiles = level_tiles.copy()
+            
+            # Сохраняем fog of war если передан
+            if fog_of_war is not None:
+                self.saved_fog_of_war = fog_of_war.copy()
         
         print(f"🔒 Этаж {self.floor_number} стабилизирован!")
         print(f"   Планировка и разведанные области сохранены")
@@ -64,14 +75,41 @@ class FloorState:
         """
         if not self.is_stabilized:
             return None
+        
+        tiles = self.saved_tiles
+        fog_of_war = self.saved_fog_of_war
+        
+        # Сетки из архива открываются через memmap без копирования
+        if tiles is None and self.archive is not None:
+            archived = self.archive.load(self.floor_number)
+            if archived is None:
+                return None
+            tiles, fog_of_war = archived
+        
+        if tiles is None:
+            return None
             
         return {
-            'tiles': self.saved_tiles,
+            'tiles': tiles,
             'entrance_pos': self.entrance_pos,
             'exit_pos': self.exit_pos,
-            'fog_of_war': self.saved_fog_of_war,
+            'fog_of_war': fog_of_war,
             'riddle_positions': self.riddle_positions
         }
+    
+    def is_archived(self) -> bool:
+        """
+        Проверить, лежат ли сетки этажа в архиве
+        
+        Returns:
+            True если этаж стабилизирован и его сетки в архиве
+        """
+        return (
+            self.is_stabilized
+            and self.saved_tiles is None
+            and self.archive is not None
+            and self.archive.has_floor(self.floor_number)
+        )
 
 
 class FloorStateManager:
@@ -80,7 +118,44 @@ class FloorStateManager:
     def __init__(self):
         """Инициализация менеджера"""
         self.floors: dict[int, FloorState] = {}
+        
+        # Архив сеток текущего профиля (None - держим сетки в памяти)
+        self.archive: Optional[FloorArchive] = None
+        
         print("📚 Менеджер состояний этажей создан")
+    
+    def attach_archive(self, archive: Optional[FloorArchive]) -> None:
+        """
+        Подключить архив этажей профиля
+        
+        Сетки уже стабилизированных этажей, которые ещё лежат в памяти,
+        переносятся в архив.
+        
+        Args:
+            archive: Архив профиля или None для хранения в памяти
+        """
+        self.archive = archive
+        
+        for floor_state in list(self.floors.values()):
+            self.add_floor_state(floor_state)
+    
+    def add_floor_state(self, floor_state: FloorState) -> None:
+        """
+        Добавить готовое состояние этажа (например, при загрузке сохранения)
+        
+        Args:
+            floor_state: Состояние этажа
+        """
+        floor_state.archive = self.archive
+        
+        # Переносим сетки из памяти в архив (уже перенесённые при прошлой загрузке не пишем заново)
+        if self.archive is not None and floor_state.saved_tiles is not None:
+            if not self.archive.has_floor(floor_state.floor_number):
+                self.archive.store(floor_state.floor_number, floor_state.saved_tiles, floor_state.saved_fog_of_war)
+            floor_state.saved_tiles = None
+            floor_state.saved_fog_of_war = None
+        
+        self.floors[floor_state.floor_number] = floor_state
         
     def get_or_create_floor_state(self, floor_number: int, seed: int) -> FloorState:
         """
@@ -96,7 +171,8 @@ class FloorStateManager:
         if floor_number not in self.floors:
             self.floors[floor_number] = FloorState(
                 floor_number=floor_number,
-                seed=seed
+                seed=seed,
+                archive=self.archive
             )
             print(f"📄 Создано состояние для этажа {floor_number}")
             
@@ -30,6 +30,13 @@ class FogOfWar:
         # Радиус обзора игрока
         self.vision_radius = 5
         
+        # Клетки, впервые открытые с последнего take_newly_explored() - (x, y).
+        # Каждая клетка попадает сюда один раз, поэтому список ограничен размером карты
+        self.newly_explored: list[Tuple[int, int]] = []
+        
+        # Меняется при массовом изменении карты (reveal_all, reset)
+        self.generation = 0
+        
         print(f"🌫️  Fog of War создан ({width}x{height})")
         
     def update_vision(self, player_x: int, player_y: int, level_tiles: np.ndarray) -> None:
@@ -61,6 +68,8 @@ class FogOfWar:
                     
                 # Проверяем line of sight (упрощенно - без ray casting пока)
                 if self._has_line_of_sight(player_x, player_y, x, y, level_tiles):
+                    if self.visibility[y, x] == self.UNEXPLORED:
+                        self.newly_explored.append((x, y))
                     self.visibility[y, x] = self.VISIBLE
                     
     def _has_line_of_sight(
@@ -131,13 +140,27 @@ class FogOfWar:
             return self.UNEXPLORED
         return self.visibility[y, x]
         
+    def take_newly_explored(self) -> list[Tuple[int, int]]:
+        """
+        Забрать клетки, открытые с прошлого вызова
+        
+        Returns:
+            Список (x, y) впервые исследованных клеток
+        """
+        cells, self.newly_explored = self.newly_explored, []
+        return cells
+        
     def reveal_all(self) -> None:
         """Открыть всю карту (для отладки)"""
         self.visibility.fill(self.VISIBLE)
+        self.newly_explored = []
+        self.generation += 1
         
     def reset(self) -> None:
         """Сбросить всю видимость"""
         self.visibility.fill(self.UNEXPLORED)
+        self.newly_explored = []
+        self.generation += 1
 
 
 if __name__ == "__main__":
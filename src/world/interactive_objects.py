@@ -82,7 +82,7 @@ class InteractiveObject:
         Получить спрайт объекта
         
         Args:
-            sprite_manager: Менеджер спрайтов
+            sprite_manager: Менеджер спрайтов или атлас (любой объект с get_sprite)
             
         Returns:
             Спрайт или None
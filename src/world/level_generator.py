@@ -271,14 +271,17 @@ class LevelGenerator:
             return self.generate(floor_state.floor_number, width, height)
             
         # Создаём уровень с номером этажа (для биома)
+        # Сетки из архива - memmap в режиме copy-on-write, их не копируем
         level = Level(width, height, floor_number=floor_state.floor_number)
-        level.tiles = saved_data['tiles'].copy()
+        tiles = saved_data['tiles']
+        level.tiles = tiles if isinstance(tiles, np.memmap) else tiles.copy()
         level.entrance_pos = saved_data['entrance_pos']
         level.exit_pos = saved_data['exit_pos']
         
         # Восстанавливаем fog of war
-        if saved_data['fog_of_war'] is not None:
-            level.fog_of_war.visibility = saved_data['fog_of_war'].copy()
+        fog = saved_data['fog_of_war']
+        if fog is not None:
+            level.fog_of_war.visibility = fog if isinstance(fog, np.memmap) else fog.copy()
             print(f"   🌫️  Разведанные области восстановлены")
         
         # Восстанавливаем загадки из сохранённых позиций